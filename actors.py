@@ -0,0 +1,142 @@
+"""
+Per-channel actors for Word Chain Game Discord Bot
+
+Everything that changes a channel's game (word submissions, turn timeouts, AI
+moves, roster commands) is posted to that channel's mailbox and run one at a
+time by a single consumer task. Handlers never interleave, so they need no
+locks, and a slow channel only delays itself. A consumer task exits after its
+mailbox has been idle for a while and is started again by the next message.
+"""
+
+import time
+import asyncio
+from typing import Any, Awaitable, Callable, Dict, Optional, Tuple
+
+Handler = Callable[..., Awaitable[Any]]
+
+
+class ChannelActor:
+    """Mailbox + single consumer for one channel"""
+
+    def __init__(self, key: int, idle_timeout: float = 300.0, tracer: Any = None):
+        self.key = key
+        self.idle_timeout = idle_timeout
+        self.tracer = tracer
+        self._mailbox: "asyncio.Queue[Tuple[Handler, tuple, dict, Optional[asyncio.Future], float]]" = asyncio.Queue()
+        self._task: Optional[asyncio.Task] = None
+        self._busy = False  # a handler is running right now
+        self.processed = 0
+        self.max_wait = 0.0
+        self.max_depth = 0
+
+    def in_actor(self) -> bool:
+        """True when called from this actor's own consumer task"""
+        return self._task is not None and asyncio.current_task() is self._task
+
+    def _post(self, item):
+        self._mailbox.put_nowait(item)
+        self.max_depth = max(self.max_depth, self._mailbox.qsize())
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._run(), name=f"channel-actor-{self.key}")
+
+    def tell(self, handler: Handler, *args, **kwargs):
+        """Queue ``handler(*args, **kwargs)`` without waiting for it"""
+        self._post((handler, args, kwargs, None, time.monotonic()))
+
+    async def ask(self, handler: Handler, *args, **kwargs) -> Any:
+        """Queue ``handler`` and wait for its result (runs inline if already inside this actor)"""
+        if self.in_actor():
+            return await handler(*args, **kwargs)
+        future = asyncio.get_running_loop().create_future()
+        self._post((handler, args, kwargs, future, time.monotonic()))
+        return await future
+
+    async def _run(self):
+        while True:
+            try:
+                handler, args, kwargs, future, queued = await asyncio.wait_for(self._mailbox.get(), self.idle_timeout)
+            except asyncio.TimeoutError:
+                if self._mailbox.empty():
+                    self._task = None
+                    return
+                continue
+            if future is not None and future.cancelled():  # caller gave up before its turn
+                continue
+            wait = time.monotonic() - queued
+            self.max_wait = max(self.max_wait, wait)
+            self.processed += 1
+            name = getattr(handler, "__name__", "handler")
+            self._busy = True
+            try:
+                if self.tracer is not None:
+                    with self.tracer.start_trace(f"actor.{name}", channel_id=self.key, mailbox_wait_ms=round(wait * 1000, 2)):
+                        result = await handler(*args, **kwargs)
+                else:
+                    result = await handler(*args, **kwargs)
+            except asyncio.CancelledError:
+                if future is not None and not future.done():
+                    future.cancel()
+                raise
+            except Exception as e:
+                if future is not None and not future.done():
+                    future.set_exception(e)
+                else:
+                    print(f"Channel {self.key} actor error in {name}: {e}")
+                continue
+            finally:
+                self._busy = False
+            if future is not None and not future.done():
+                future.set_result(result)
+
+    def idle(self) -> bool:
+        """No handler running and nothing queued (the consumer may still be waiting for mail)"""
+        return not self._busy and self._mailbox.empty()
+
+    def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            self._task = None
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "channel": self.key,
+            "running": self._task is not None and not self._task.done(),
+            "queued": self._mailbox.qsize(),
+            "processed": self.processed,
+            "max_queue": self.max_depth,
+            "max_wait_ms": self.max_wait * 1000,
+        }
+
+
+class ActorRegistry:
+    """One ``ChannelActor`` per channel, created on first use"""
+
+    def __init__(self, idle_timeout: float = 300.0, tracer: Any = None):
+        self.idle_timeout = idle_timeout
+        self.tracer = tracer
+        self._actors: Dict[int, ChannelActor] = {}
+
+    def get(self, key: int) -> ChannelActor:
+        actor = self._actors.get(key)
+        if actor is None:
+            actor = self._actors[key] = ChannelActor(key, self.idle_timeout, self.tracer)
+        return actor
+
+    def discard(self, key: int) -> bool:
+        """Stop and forget an idle channel's actor (no-op while a handler runs or mail is queued)"""
+        actor = self._actors.get(key)
+        if actor is None or not actor.idle():
+            return False
+        actor.stop()  # only ever waiting on an empty mailbox here
+        del self._actors[key]
+        return True
+
+    def stop(self):
+        for actor in self._actors.values():
+            actor.stop()
+
+    def stats(self):
+        return [actor.stats() for actor in self._actors.values()]
+
+
+__all__ = ['ChannelActor', 'ActorRegistry']
@@ -0,0 +1,149 @@
+"""
+Admission control for Word Chain Game Discord Bot
+
+Game channels are protected from message floods before any parsing happens.
+Every user and every channel has a token bucket. When a channel's bucket runs
+dry it switches to a degraded mode for a while, in which only the player whose
+turn it is (and commands) get through and everything else is dropped on
+arrival. Rejection replies ("Word already used!", ...) are rate limited per
+user and per channel so a spammer cannot make the bot spam back.
+"""
+
+import time
+from typing import Any, Dict, Optional, Tuple
+
+
+class TokenBucket:
+    """``rate`` tokens per second up to ``burst``; a rate of 0 never limits"""
+
+    __slots__ = ("rate", "burst", "tokens", "updated")
+
+    def __init__(self, rate: float, burst: float, now: float):
+        self.rate = rate
+        self.burst = burst
+        self.tokens = burst
+        self.updated = now
+
+    def take(self, now: float, cost: float = 1.0) -> bool:
+        if self.rate <= 0:
+            return True
+        self.tokens = min(self.burst, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+        if self.tokens >= cost:
+            self.tokens -= cost
+            return True
+        return False
+
+    def idle(self, now: float) -> bool:
+        """Refilled to the brim, so dropping it loses nothing"""
+        return self.rate <= 0 or self.tokens + (now - self.updated) * self.rate >= self.burst
+
+
+class ChannelAdmission:
+    """Buckets and degraded-mode state of one channel"""
+
+    __slots__ = ("bucket", "replies", "users", "degraded_until", "dropped", "floods")
+
+    def __init__(self, channel_rate: float, channel_burst: float, reply_rate: float, reply_burst: float, now: float):
+        self.bucket = TokenBucket(channel_rate, channel_burst, now)
+        self.replies = TokenBucket(reply_rate, reply_burst, now)
+        self.users: Dict[int, TokenBucket] = {}
+        self.degraded_until = 0.0
+        self.dropped = 0
+        self.floods = 0
+
+
+class AdmissionController:
+    """Per-channel admission decisions (runs on the event loop, no locks needed)"""
+
+    def __init__(self, user_rate: float = 1.0, user_burst: float = 5.0,
+                 channel_rate: float = 10.0, channel_burst: float = 30.0,
+                 degraded_seconds: float = 30.0, reply_cooldown: float = 3.0,
+                 reply_rate: float = 0.5, reply_burst: float = 5.0):
+        self.user_rate = user_rate
+        self.user_burst = user_burst
+        self.channel_rate = channel_rate
+        self.channel_burst = channel_burst
+        self.degraded_seconds = degraded_seconds
+        self.reply_cooldown = reply_cooldown
+        self.reply_rate = reply_rate
+        self.reply_burst = reply_burst
+        self._channels: Dict[int, ChannelAdmission] = {}
+        self._last_reply: Dict[Tuple[int, int], float] = {}  # (channel, user) -> monotonic time of last rejection reply
+
+    def _channel(self, channel_id: int, now: float) -> ChannelAdmission:
+        entry = self._channels.get(channel_id)
+        if entry is None:
+            entry = ChannelAdmission(self.channel_rate, self.channel_burst, self.reply_rate, self.reply_burst, now)
+            self._channels[channel_id] = entry
+        return entry
+
+    def _user(self, entry: ChannelAdmission, user_id: int, now: float) -> TokenBucket:
+        bucket = entry.users.get(user_id)
+        if bucket is None:
+            bucket = entry.users[user_id] = TokenBucket(self.user_rate, self.user_burst, now)
+        return bucket
+
+    def degraded(self, channel_id: int, now: Optional[float] = None) -> bool:
+        entry = self._channels.get(channel_id)
+        return entry is not None and (time.monotonic() if now is None else now) < entry.degraded_until
+
+    def admit(self, channel_id: int, user_id: int, is_turn: bool, is_command: bool, now: Optional[float] = None) -> bool:
+        """Whether a message from ``user_id`` should be processed at all
+
+        The current player is only limited by their own bucket, so a flood
+        never locks them out of their turn. In degraded mode everyone else is
+        dropped unless the message is a command.
+        """
+        now = time.monotonic() if now is None else now
+        entry = self._channel(channel_id, now)
+        if not entry.bucket.take(now):
+            if now >= entry.degraded_until:
+                entry.floods += 1
+                print(f"Channel {channel_id} is flooded, dropping non-turn messages for {self.degraded_seconds:.0f}s")
+            entry.degraded_until = now + self.degraded_seconds
+        allowed = self._user(entry, user_id, now).take(now)
+        if allowed and not is_turn and not is_command and now < entry.degraded_until:
+            allowed = False
+        if not allowed:
+            entry.dropped += 1
+        return allowed
+
+    def should_reply(self, channel_id: int, user_id: int, now: Optional[float] = None) -> bool:
+        """Whether a rejection reply may be sent (repeats are suppressed)"""
+        now = time.monotonic() if now is None else now
+        key = (channel_id, user_id)
+        if now - self._last_reply.get(key, float("-inf")) < self.reply_cooldown:
+            return False
+        if not self._channel(channel_id, now).replies.take(now):
+            return False
+        self._last_reply[key] = now
+        return True
+
+    def prune(self, now: Optional[float] = None) -> int:
+        """Forget idle buckets and expired reply cooldowns; returns entries removed"""
+        now = time.monotonic() if now is None else now
+        removed = 0
+        for channel_id, entry in list(self._channels.items()):
+            for user_id, bucket in list(entry.users.items()):
+                if bucket.idle(now):
+                    del entry.users[user_id]
+                    removed += 1
+            if (not entry.users and now >= entry.degraded_until
+                    and entry.bucket.idle(now) and entry.replies.idle(now)):
+                del self._channels[channel_id]
+                removed += 1
+        for key, last in list(self._last_reply.items()):
+            if now - last >= self.reply_cooldown:
+                del self._last_reply[key]
+                removed += 1
+        return removed
+
+    def stats(self, channel_id: int) -> Dict[str, Any]:
+        entry = self._channels.get(channel_id)
+        if entry is None:
+            return {"degraded": False, "dropped": 0, "floods": 0}
+        return {"degraded": self.degraded(channel_id), "dropped": entry.dropped, "floods": entry.floods}
+
+
+__all__ = ['TokenBucket', 'ChannelAdmission', 'AdmissionController']
@@ -0,0 +1,134 @@
+"""
+Chainability model for Word Chain Game Discord Bot
+
+The dictionary is indexed once by (first letter, last letter). From that we
+know, for every letter, how many words can follow a word ending in it. Each
+channel keeps a small counter of what its used words have consumed, so
+lookups stay O(1) as a game goes on.
+
+The sorted (first, last) buckets double as the dictionary itself: membership
+is a bisect inside one bucket, so no separate word set is kept in memory.
+"""
+
+import random
+from bisect import bisect_left
+from typing import Callable, Dict, Iterable, List, Optional, Set, Tuple
+
+Pair = Tuple[str, str]
+
+
+def _first(word: str) -> str:
+    return word[0]
+
+
+def _last(word: str) -> str:
+    return word[-1]
+
+
+class ChainGraph:
+    """Letter-transition index built from a word list (immutable once built)
+
+    ``first`` and ``last`` give the letter a word starts with and the letter
+    the next word must start with; they default to the first and last character.
+    """
+
+    def __init__(self, words: Iterable[str], accept: Optional[Callable[[str], bool]] = None,
+                 first: Callable[[str], str] = _first, last: Callable[[str], str] = _last):
+        self.first = first
+        self.last = last
+        self.pairs: Dict[Pair, List[str]] = {}  # (first, last) -> sorted words
+        for word in words:
+            if not word or (accept is not None and not accept(word)):
+                continue
+            self.pairs.setdefault((first(word), last(word)), []).append(word)
+        self.starts: Dict[str, int] = {}  # first letter -> number of words
+        self.longest: Dict[Pair, int] = {}  # (first, last) -> length of the longest word
+        for pair, bucket in self.pairs.items():
+            bucket.sort()
+            bucket[:] = [w for i, w in enumerate(bucket) if i == 0 or w != bucket[i - 1]]  # drop duplicates
+            self.starts[pair[0]] = self.starts.get(pair[0], 0) + len(bucket)
+            self.longest[pair] = max(len(w) for w in bucket)
+        self.ends_from: Dict[str, Dict[str, int]] = {}  # first letter -> {last letter: count}
+        for (first_letter, last_letter), bucket in self.pairs.items():
+            self.ends_from.setdefault(first_letter, {})[last_letter] = len(bucket)
+        self.size = sum(self.starts.values())
+
+    def __len__(self) -> int:
+        return self.size
+
+    def __contains__(self, word: str) -> bool:
+        if not word:
+            return False
+        bucket = self.pairs.get((self.first(word), self.last(word)))
+        if not bucket:
+            return False
+        i = bisect_left(bucket, word)
+        return i < len(bucket) and bucket[i] == word
+
+    def counts(self, used: Iterable[str] = ()) -> "ChainCounts":
+        """Per-channel remaining counts, starting from ``used``"""
+        counts = ChainCounts(self)
+        for word in used:
+            counts.use(word)
+        return counts
+
+
+class ChainCounts:
+    """What is left of a ``ChainGraph`` after a channel's used words"""
+
+    __slots__ = ("graph", "remaining", "used_pairs")
+
+    def __init__(self, graph: ChainGraph):
+        self.graph = graph
+        self.remaining: Dict[str, int] = dict(graph.starts)  # first letter -> unused words
+        self.used_pairs: Dict[Pair, int] = {}  # (first, last) -> used words (sparse)
+
+    def use(self, word: str):
+        """Account for a newly used word (ignored when it is not in the dictionary)"""
+        if word not in self.graph:
+            return
+        pair = (self.graph.first(word), self.graph.last(word))
+        self.remaining[pair[0]] = self.remaining.get(pair[0], 0) - 1
+        self.used_pairs[pair] = self.used_pairs.get(pair, 0) + 1
+
+    def followups(self, letter: str) -> int:
+        """Unused dictionary words starting with ``letter``"""
+        return self.remaining.get(letter, 0)
+
+    def pick(self, letter: Optional[str], used: Set[str], trap: bool = True, limit: int = 1,
+             min_len: int = 0) -> List[str]:
+        """Unused words starting with ``letter`` (any letter if None)
+
+        ``trap=True`` prefers words whose last letter has the fewest follow-ups
+        left for the next player; ``trap=False`` prefers the most (for hints).
+        At most one word per last letter is returned so suggestions vary.
+        Buckets without a word of ``min_len`` characters are skipped outright.
+        """
+        firsts = [letter] if letter else list(self.graph.ends_from)
+        candidates = []
+        for first in firsts:
+            for last in self.graph.ends_from.get(first, ()):
+                pair = (first, last)
+                if len(self.graph.pairs[pair]) > self.used_pairs.get(pair, 0) and self.graph.longest[pair] >= min_len:
+                    candidates.append((self.followups(last), pair))
+        candidates.sort(key=lambda c: c[0], reverse=not trap)
+
+        picked = []
+        for _, pair in candidates:
+            word = self._unused_in(pair, used, min_len)
+            if word:
+                picked.append(word)
+                if len(picked) >= limit:
+                    break
+        return picked
+
+    def _unused_in(self, pair: Pair, used: Set[str], min_len: int = 0) -> Optional[str]:
+        bucket = self.graph.pairs[pair]
+        for _ in range(3):  # random probes first, so repeat games differ
+            word = random.choice(bucket)
+            if word not in used and len(word) >= min_len:
+                return word
+        return next((w for w in bucket if w not in used and len(w) >= min_len), None)
+
+
+__all__ = ['ChainGraph', 'ChainCounts']
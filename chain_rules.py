@@ -0,0 +1,251 @@
+"""
+Chain rule variants for Word Chain Game Discord Bot
+
+A rule decides which key a word starts with and which key the next word must
+start with (a letter, the last two letters, a syllable, ...), which words are
+allowed at all (themed categories) and how long words must be as a game goes
+on. Every rule that changes the keys or the allowed words gets its own
+``ChainGraph`` derived from the shared language dictionary, so checking a
+word is one key comparison and hints / AI picks are bucket lookups whatever
+the rule. The classic rule reuses the language dictionary's graph as is.
+"""
+
+import os
+import threading
+from functools import partial
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+from chain_graph import ChainGraph
+from languages import Language, ThaiLanguage
+
+VOWELS = "aeiouy"
+
+
+class ChainRule:
+    """Classic rule: start with the letter the previous word ends with"""
+
+    key = "classic"
+    name = "Classic"
+    description = "Start with the last letter of the previous word"
+    derived = False  # True when the rule needs its own graph
+
+    def supports(self, language: Language) -> bool:
+        return True
+
+    def first(self, language: Language, word: str) -> str:
+        return language.first_letter(word)
+
+    def last(self, language: Language, word: str) -> str:
+        return language.last_letter(word)
+
+    def accept(self, language: Language, word: str) -> bool:
+        """Whether the word may be played under this rule at all"""
+        return True
+
+    def min_length(self, language: Language, turn: int) -> int:
+        """Shortest word allowed on ``turn`` (0-based chain length)"""
+        return language.min_len
+
+    def requirement(self, key: str) -> str:
+        """What the next word must do, for prompts and rejections"""
+        return f"start with '{key}'"
+
+
+class SuffixRule(ChainRule):
+    """Start with the last ``size`` letters of the previous word"""
+
+    derived = True
+
+    def __init__(self, size: int = 2):
+        self.size = size
+        self.key = f"last{size}"
+        self.name = f"Last {size} letters"
+        self.description = f"Start with the last {size} letters of the previous word"
+
+    def supports(self, language: Language) -> bool:
+        return not isinstance(language, ThaiLanguage)  # Thai chains on consonants, not raw characters
+
+    def first(self, language: Language, word: str) -> str:
+        return word[:self.size]
+
+    def last(self, language: Language, word: str) -> str:
+        return word[-self.size:]
+
+    def accept(self, language: Language, word: str) -> bool:
+        return len(word) >= self.size
+
+
+class SyllableRule(ChainRule):
+    """Chain on syllables: the consonant + vowel sound a word ends on starts the next one
+
+    A word ends on its last vowel group plus the consonant before it, and
+    starts with its opening syllable: every consonant before the first vowel
+    group plus the group. So ``banana`` ends on ``na`` and ``nation`` /
+    ``napkin`` start with it, but ``snake`` starts with ``sna`` and does not.
+    A silent final ``e`` (``snake``) is ignored.
+    """
+
+    key = "syllable"
+    name = "Syllables"
+    description = "Start with the final syllable sound of the previous word (banana -> nation)"
+    derived = True
+
+    def supports(self, language: Language) -> bool:
+        return language.code == "en"
+
+    @staticmethod
+    def _syllable(word: str, start: int) -> str:
+        """Consonant + vowel group beginning at the vowel ``start``"""
+        end = start
+        while end < len(word) and word[end] in VOWELS:
+            end += 1
+        onset = word[start - 1] if start > 0 else ""
+        return onset + word[start:end]
+
+    def first(self, language: Language, word: str) -> str:
+        start = next((i for i, ch in enumerate(word) if ch in VOWELS), None)
+        if start is None:
+            return word[0]
+        end = start
+        while end < len(word) and word[end] in VOWELS:
+            end += 1
+        return word[:end]  # the word's own opening, never a syllable from its middle
+
+    def last(self, language: Language, word: str) -> str:
+        stem = word
+        if len(stem) > 2 and stem[-1] == "e" and stem[-2] not in VOWELS and any(ch in VOWELS for ch in stem[:-1]):
+            stem = stem[:-1]  # silent e
+        end = len(stem)
+        while end > 0 and stem[end - 1] not in VOWELS:
+            end -= 1
+        if end == 0:
+            return word[-1]
+        start = end
+        while start > 0 and stem[start - 1] in VOWELS:
+            start -= 1
+        return self._syllable(stem, start)
+
+    def requirement(self, key: str) -> str:
+        return f"start with the syllable '{key}'"
+
+
+class EscalatingRule(ChainRule):
+    """Classic chaining, but the minimum length grows every ``step`` words"""
+
+    key = "escalate"
+    name = "Escalating length"
+    derived = False  # same keys and words as classic; picks filter by length per bucket
+
+    def __init__(self, step: int = 5, max_length: int = 10):
+        self.step = step
+        self.max_length = max_length
+        self.description = f"Classic, but words must get one letter longer every {step} words (up to {max_length})"
+
+    def min_length(self, language: Language, turn: int) -> int:
+        grown = language.min_len + (turn // self.step if self.step > 0 else 0)
+        return min(grown, max(self.max_length, language.min_len))
+
+
+class ThemeRule(ChainRule):
+    """Classic chaining restricted to a category word list"""
+
+    derived = True
+
+    def __init__(self, language_code: str, name: str, words: Set[str]):
+        self.language_code = language_code
+        self.theme = name
+        self.words = words
+        self.key = f"theme:{name}"
+        self.name = f"Theme: {name}"
+        self.description = f"Classic chaining, {name} words only ({len(words)} words)"
+
+    def supports(self, language: Language) -> bool:
+        return language.code == self.language_code
+
+    def accept(self, language: Language, word: str) -> bool:
+        return word in self.words
+
+
+def load_theme_words(path: str, language: Language) -> Set[str]:
+    """Read a one-word-per-line theme file (blocking, run off-loop)"""
+    words = set()
+    with open(path, "r", encoding="utf-8") as f:
+        for line in f:
+            word = language.normalize(line)
+            if word and language.is_valid_basic(word):
+                words.add(word)
+    return words
+
+
+class RuleBook:
+    """Available rules plus the derived graph of every (language, rule) in use"""
+
+    def __init__(self, escalation_step: int = 5, escalation_max: int = 10):
+        self._builtin: Dict[str, ChainRule] = {}
+        self.themes: Dict[Tuple[str, str], ThemeRule] = {}  # (language, theme) -> rule
+        self._graphs: Dict[Tuple[str, str], Tuple[ChainGraph, ChainGraph]] = {}  # (language, rule) -> (base, derived)
+        self._lock = threading.Lock()
+        self.configure(escalation_step, escalation_max)
+
+    def configure(self, escalation_step: int, escalation_max: int):
+        rules = [ChainRule(), SuffixRule(2), SyllableRule(), EscalatingRule(escalation_step, escalation_max)]
+        self._builtin = {rule.key: rule for rule in rules}
+
+    def get(self, key: str, language: Language) -> Optional[ChainRule]:
+        """The rule called ``key`` if it can be played in ``language``"""
+        if key.startswith("theme:"):
+            rule = self.themes.get((language.code, key[len("theme:"):]))
+        else:
+            rule = self._builtin.get(key)
+        return rule if rule is not None and rule.supports(language) else None
+
+    def available(self, language: Language) -> List[ChainRule]:
+        rules = [rule for rule in self._builtin.values() if rule.supports(language)]
+        rules += [rule for (code, _), rule in sorted(self.themes.items()) if code == language.code]
+        return rules
+
+    def load_themes(self, directory: str, languages: Iterable[Language]) -> int:
+        """Read ``<directory>/<language>/<theme>.txt`` files (blocking); returns themes loaded"""
+        themes: Dict[Tuple[str, str], ThemeRule] = {}
+        for language in languages:
+            folder = os.path.join(directory, language.code)
+            if not os.path.isdir(folder):
+                continue
+            for filename in sorted(os.listdir(folder)):
+                if not filename.endswith(".txt"):
+                    continue
+                name = filename[:-4].lower()
+                words = load_theme_words(os.path.join(folder, filename), language)
+                if words:
+                    themes[(language.code, name)] = ThemeRule(language.code, name, words)
+        self.themes = themes
+        with self._lock:
+            self._graphs = {key: entry for key, entry in self._graphs.items() if not key[1].startswith("theme:")}
+        return len(themes)
+
+    def peek_graph(self, language: Language, rule: ChainRule, base: ChainGraph) -> Optional[ChainGraph]:
+        """The rule's graph over ``base``, or None if it still has to be built"""
+        if not rule.derived:
+            return base
+        entry = self._graphs.get((language.code, rule.key))
+        if entry is not None and entry[0] is base:
+            return entry[1]
+        return None
+
+    def build_graph(self, language: Language, rule: ChainRule, base: ChainGraph) -> ChainGraph:
+        """Derive (once per base graph) the rule's index from ``base`` (blocking, run off-loop)"""
+        graph = self.peek_graph(language, rule, base)
+        if graph is not None:
+            return graph
+        words = (word for bucket in base.pairs.values() for word in bucket)
+        graph = ChainGraph(words, accept=partial(rule.accept, language),
+                           first=partial(rule.first, language), last=partial(rule.last, language))
+        with self._lock:
+            self._graphs[(language.code, rule.key)] = (base, graph)
+        return graph
+
+
+__all__ = [
+    'ChainRule', 'SuffixRule', 'SyllableRule', 'EscalatingRule', 'ThemeRule',
+    'load_theme_words', 'RuleBook',
+]
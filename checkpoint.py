@@ -0,0 +1,80 @@
+"""
+Game state checkpointing for Word Chain Game Discord Bot
+
+Active games are written to SQLite as one compressed row per channel, and
+only channels whose state changed since the last checkpoint are rewritten.
+Rows are decoded lazily when a channel is first touched after a restart.
+"""
+
+import os
+import json
+import zlib
+import sqlite3
+import threading
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+Row = Tuple[int, bool, float, bytes]
+
+
+class CheckpointStore:
+    """SQLite table of ``channel_id -> compressed game snapshot``"""
+
+    def __init__(self, path: str):
+        self.path = path
+        self._lock = threading.Lock()
+        self._conn: Optional[sqlite3.Connection] = None
+
+    def _connect(self) -> sqlite3.Connection:
+        if self._conn is None:
+            os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+            conn = sqlite3.connect(self.path, check_same_thread=False)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS games ("
+                " channel_id INTEGER PRIMARY KEY,"
+                " active INTEGER NOT NULL,"
+                " saved_at REAL NOT NULL,"
+                " data BLOB NOT NULL)"
+            )
+            self._conn = conn
+        return self._conn
+
+    def write(self, rows: Iterable[Row], deleted: Iterable[int] = ()):
+        """Upsert changed channels and drop removed ones in one transaction"""
+        with self._lock:
+            conn = self._connect()
+            with conn:
+                conn.executemany(
+                    "INSERT OR REPLACE INTO games (channel_id, active, saved_at, data) VALUES (?, ?, ?, ?)",
+                    [(cid, int(active), saved_at, data) for cid, active, saved_at, data in rows],
+                )
+                conn.executemany("DELETE FROM games WHERE channel_id = ?", [(cid,) for cid in deleted])
+
+    def load_all(self) -> Tuple[Dict[int, bytes], List[int]]:
+        """All stored snapshots (still compressed) and the ids of active games"""
+        with self._lock:
+            conn = self._connect()
+            rows = conn.execute("SELECT channel_id, active, data FROM games").fetchall()
+        blobs = {cid: data for cid, _, data in rows}
+        active = [cid for cid, is_active, _ in rows if is_active]
+        return blobs, active
+
+    def close(self):
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+
+
+def encode_snapshot(snapshot: Dict[str, Any]) -> bytes:
+    """Compact JSON + zlib encoding of a snapshot dict"""
+    return zlib.compress(json.dumps(snapshot, separators=(",", ":"), ensure_ascii=False).encode("utf-8"), 6)
+
+
+def decode_snapshot(blob: bytes) -> Dict[str, Any]:
+    """Inverse of ``encode_snapshot``"""
+    return json.loads(zlib.decompress(blob).decode("utf-8"))
+
+
+__all__ = ['CheckpointStore', 'encode_snapshot', 'decode_snapshot']
@@ -4,13 +4,19 @@ Configuration settings for Word Chain Game Discord Bot
 
 import os
 import json
+import threading
 from typing import Dict, Any
 
+CONFIG_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "config.json")
+
 # Game Configuration
 class GameConfig:
     """Configuration class for game settings"""
 
     def __init__(self):
+        self._frozen = False
+        self.version = 0
+
         # Set default values first
         self._set_defaults()
         
@@ -30,24 +36,88 @@ class GameConfig:
         self.streak_bonus = 1
         self.combo_step = 5
         self.combo_bonus = 1
+        self.difficulty_bonus = 0
+        self.difficulty_max_followups = 25
         self.ai_model = "meta-llama/llama-3.1-405b-instruct:free"
         self.ai_max_tokens = 20
         self.ai_temperature = 0.7
+        self.ai_local_fallback = True
+        self.ai_candidate_count = 12
+        self.fuzzy_suggestions = True
+        self.fuzzy_prefix_length = 7
+        self.fuzzy_max_entries = 5000000
         self.max_ai_players = 3
+        self.roster_batch_threshold = 25
+        self.roster_announce_interval = 10.0
         self.max_turn_time = 120
         self.min_turn_time = 5
         self.scores_file = "data/scores.json"
+        self.names_file = "data/names.sqlite3"
+        self.names_cache_size = 5000
+        self.names_negative_ttl = 3600.0
+        self.spectator_enabled = False
+        self.spectator_host = "127.0.0.1"
+        self.spectator_port = 8765
+        self.spectator_queue_size = 100
+        self.spectator_max_subscribers = 5000
+        self.traffic_capture_file = ""
+        self.traffic_capture_max_bytes = 67108864
         self.words_file = "words.txt"
+        self.default_language = "en"
+        self.words_dir = "data/dictionaries"
+        self.default_chain_rule = "classic"
+        self.rule_escalation_step = 5
+        self.rule_escalation_max = 10
+        self.validation_sources = "local,guild"
+        self.spellcheck_fallback = True
+        self.guild_wordlists_dir = "data/wordlists"
+        self.validation_cache_size = 10000
         self.command_prefix = "!"
+        self.runtime_profile = "default"
+        self.event_loop = "auto"
+        self.loop_lag_threshold_ms = 100
+        self.loop_lag_interval = 0.25
+        self.profile_dir = "data/profiles"
+        self.memory_sample_size = 50
+        self.memory_trace_frames = 1
+        self.memory_metrics_interval = 0.0
+        self.memory_metrics_file = "data/memory.jsonl"
+        self.trace_sample_rate = 0.0
+        self.trace_file = "data/traces.jsonl"
+        self.trace_otlp_endpoint = ""
+        self.config_watch = False
+        self.config_watch_interval = 2.0
+        self.config_watch_debounce = 1.0
+        self.checkpoint_file = "data/checkpoint.sqlite3"
+        self.checkpoint_interval = 5.0
+        self.partitions_file = "data/score_partitions.sqlite3"
+        self.season = ""
+        self.history_dir = "data/history"
+        self.history_flush_interval = 5.0
+        self.tournament_file = "data/tournaments.sqlite3"
+        self.tournament_turn_seconds = 15
+        self.tournament_match_words = 20
+        self.tournament_threads = True
+        self.app_commands_sync = True
+        self.admission_user_rate = 1.0
+        self.admission_user_burst = 5
+        self.admission_channel_rate = 10.0
+        self.admission_channel_burst = 30
+        self.admission_degraded_seconds = 30.0
+        self.admission_reply_rate = 0.5
+        self.admission_reply_burst = 5
+        self.rejection_reply_cooldown = 3.0
+        self.scores_flush_interval = 2.0
+        self.actor_idle_timeout = 300.0
 
     def _load_from_file(self):
         """Load configuration from config.json file"""
-        config_file = os.path.join(os.path.dirname(__file__), "config.json")
+        config_file = CONFIG_FILE
         if os.path.exists(config_file):
             try:
                 with open(config_file, 'r', encoding='utf-8') as f:
                     data = json.load(f)
-                    self.from_dict(data)
+                    self._apply_dict(data)
             except (json.JSONDecodeError, IOError) as e:
                 print(f"Warning: Could not load config.json: {e}")
 
@@ -72,6 +142,10 @@ class GameConfig:
             self.combo_step = int(os.getenv("COMBO_STEP"))
         if "COMBO_BONUS" in os.environ:
             self.combo_bonus = int(os.getenv("COMBO_BONUS"))
+        if "DIFFICULTY_BONUS" in os.environ:
+            self.difficulty_bonus = int(os.getenv("DIFFICULTY_BONUS"))
+        if "DIFFICULTY_MAX_FOLLOWUPS" in os.environ:
+            self.difficulty_max_followups = int(os.getenv("DIFFICULTY_MAX_FOLLOWUPS"))
 
         # AI settings
         if "AI_MODEL" in os.environ:
@@ -80,10 +154,24 @@ class GameConfig:
             self.ai_max_tokens = int(os.getenv("AI_MAX_TOKENS"))
         if "AI_TEMPERATURE" in os.environ:
             self.ai_temperature = float(os.getenv("AI_TEMPERATURE"))
+        if "AI_LOCAL_FALLBACK" in os.environ:
+            self.ai_local_fallback = os.getenv("AI_LOCAL_FALLBACK").lower() in ("1", "true", "yes")
+        if "AI_CANDIDATE_COUNT" in os.environ:
+            self.ai_candidate_count = int(os.getenv("AI_CANDIDATE_COUNT"))
+        if "FUZZY_SUGGESTIONS" in os.environ:
+            self.fuzzy_suggestions = os.getenv("FUZZY_SUGGESTIONS").lower() in ("1", "true", "yes")
+        if "FUZZY_PREFIX_LENGTH" in os.environ:
+            self.fuzzy_prefix_length = int(os.getenv("FUZZY_PREFIX_LENGTH"))
+        if "FUZZY_MAX_ENTRIES" in os.environ:
+            self.fuzzy_max_entries = int(os.getenv("FUZZY_MAX_ENTRIES"))
 
         # Game limits
         if "MAX_AI_PLAYERS" in os.environ:
             self.max_ai_players = int(os.getenv("MAX_AI_PLAYERS"))
+        if "ROSTER_BATCH_THRESHOLD" in os.environ:
+            self.roster_batch_threshold = int(os.getenv("ROSTER_BATCH_THRESHOLD"))
+        if "ROSTER_ANNOUNCE_INTERVAL" in os.environ:
+            self.roster_announce_interval = float(os.getenv("ROSTER_ANNOUNCE_INTERVAL"))
         if "MAX_TURN_TIME" in os.environ:
             self.max_turn_time = int(os.getenv("MAX_TURN_TIME"))
         if "MIN_TURN_TIME" in os.environ:
@@ -92,12 +180,148 @@ class GameConfig:
         # File paths
         if "SCORES_FILE" in os.environ:
             self.scores_file = os.getenv("SCORES_FILE")
+        if "NAMES_FILE" in os.environ:
+            self.names_file = os.getenv("NAMES_FILE")
+        if "NAMES_CACHE_SIZE" in os.environ:
+            self.names_cache_size = int(os.getenv("NAMES_CACHE_SIZE"))
+        if "NAMES_NEGATIVE_TTL" in os.environ:
+            self.names_negative_ttl = float(os.getenv("NAMES_NEGATIVE_TTL"))
+        # Spectator feed
+        if "SPECTATOR_ENABLED" in os.environ:
+            self.spectator_enabled = os.getenv("SPECTATOR_ENABLED").lower() in ("1", "true", "yes")
+        if "SPECTATOR_HOST" in os.environ:
+            self.spectator_host = os.getenv("SPECTATOR_HOST")
+        if "SPECTATOR_PORT" in os.environ:
+            self.spectator_port = int(os.getenv("SPECTATOR_PORT"))
+        if "SPECTATOR_QUEUE_SIZE" in os.environ:
+            self.spectator_queue_size = int(os.getenv("SPECTATOR_QUEUE_SIZE"))
+        if "SPECTATOR_MAX_SUBSCRIBERS" in os.environ:
+            self.spectator_max_subscribers = int(os.getenv("SPECTATOR_MAX_SUBSCRIBERS"))
+        # Traffic capture
+        if "TRAFFIC_CAPTURE_FILE" in os.environ:
+            self.traffic_capture_file = os.getenv("TRAFFIC_CAPTURE_FILE")
+        if "TRAFFIC_CAPTURE_MAX_BYTES" in os.environ:
+            self.traffic_capture_max_bytes = int(os.getenv("TRAFFIC_CAPTURE_MAX_BYTES"))
         if "WORDS_FILE" in os.environ:
             self.words_file = os.getenv("WORDS_FILE")
+        if "WORDS_DIR" in os.environ:
+            self.words_dir = os.getenv("WORDS_DIR")
+
+        # Languages
+        if "DEFAULT_LANGUAGE" in os.environ:
+            self.default_language = os.getenv("DEFAULT_LANGUAGE")
+
+        # Chain rules
+        if "DEFAULT_CHAIN_RULE" in os.environ:
+            self.default_chain_rule = os.getenv("DEFAULT_CHAIN_RULE")
+        if "RULE_ESCALATION_STEP" in os.environ:
+            self.rule_escalation_step = int(os.getenv("RULE_ESCALATION_STEP"))
+        if "RULE_ESCALATION_MAX" in os.environ:
+            self.rule_escalation_max = int(os.getenv("RULE_ESCALATION_MAX"))
+
+        # Word validation
+        if "VALIDATION_SOURCES" in os.environ:
+            self.validation_sources = os.getenv("VALIDATION_SOURCES")
+        if "SPELLCHECK_FALLBACK" in os.environ:
+            self.spellcheck_fallback = os.getenv("SPELLCHECK_FALLBACK").lower() in ("1", "true", "yes")
+        if "GUILD_WORDLISTS_DIR" in os.environ:
+            self.guild_wordlists_dir = os.getenv("GUILD_WORDLISTS_DIR")
+        if "VALIDATION_CACHE_SIZE" in os.environ:
+            self.validation_cache_size = int(os.getenv("VALIDATION_CACHE_SIZE"))
 
         # Bot settings
         if "COMMAND_PREFIX" in os.environ:
             self.command_prefix = os.getenv("COMMAND_PREFIX")
+        if "RUNTIME_PROFILE" in os.environ:
+            self.runtime_profile = os.getenv("RUNTIME_PROFILE").lower()
+        if "EVENT_LOOP" in os.environ:
+            self.event_loop = os.getenv("EVENT_LOOP").lower()
+
+        # Diagnostics
+        if "LOOP_LAG_THRESHOLD_MS" in os.environ:
+            self.loop_lag_threshold_ms = float(os.getenv("LOOP_LAG_THRESHOLD_MS"))
+        if "LOOP_LAG_INTERVAL" in os.environ:
+            self.loop_lag_interval = float(os.getenv("LOOP_LAG_INTERVAL"))
+        if "PROFILE_DIR" in os.environ:
+            self.profile_dir = os.getenv("PROFILE_DIR")
+        if "MEMORY_SAMPLE_SIZE" in os.environ:
+            self.memory_sample_size = int(os.getenv("MEMORY_SAMPLE_SIZE"))
+        if "MEMORY_TRACE_FRAMES" in os.environ:
+            self.memory_trace_frames = int(os.getenv("MEMORY_TRACE_FRAMES"))
+        if "MEMORY_METRICS_INTERVAL" in os.environ:
+            self.memory_metrics_interval = float(os.getenv("MEMORY_METRICS_INTERVAL"))
+        if "MEMORY_METRICS_FILE" in os.environ:
+            self.memory_metrics_file = os.getenv("MEMORY_METRICS_FILE")
+        if "TRACE_SAMPLE_RATE" in os.environ:
+            self.trace_sample_rate = float(os.getenv("TRACE_SAMPLE_RATE"))
+        if "TRACE_FILE" in os.environ:
+            self.trace_file = os.getenv("TRACE_FILE")
+        if "TRACE_OTLP_ENDPOINT" in os.environ:
+            self.trace_otlp_endpoint = os.getenv("TRACE_OTLP_ENDPOINT")
+
+        # Hot reload
+        if "CONFIG_WATCH" in os.environ:
+            self.config_watch = os.getenv("CONFIG_WATCH").lower() in ("1", "true", "yes")
+        if "CONFIG_WATCH_INTERVAL" in os.environ:
+            self.config_watch_interval = float(os.getenv("CONFIG_WATCH_INTERVAL"))
+        if "CONFIG_WATCH_DEBOUNCE" in os.environ:
+            self.config_watch_debounce = float(os.getenv("CONFIG_WATCH_DEBOUNCE"))
+
+        # Checkpointing
+        if "CHECKPOINT_FILE" in os.environ:
+            self.checkpoint_file = os.getenv("CHECKPOINT_FILE")
+        if "CHECKPOINT_INTERVAL" in os.environ:
+            self.checkpoint_interval = float(os.getenv("CHECKPOINT_INTERVAL"))
+
+        # Leaderboards
+        if "PARTITIONS_FILE" in os.environ:
+            self.partitions_file = os.getenv("PARTITIONS_FILE")
+        if "SEASON" in os.environ:
+            self.season = os.getenv("SEASON")
+
+        # Game history
+        if "HISTORY_DIR" in os.environ:
+            self.history_dir = os.getenv("HISTORY_DIR")
+        if "HISTORY_FLUSH_INTERVAL" in os.environ:
+            self.history_flush_interval = float(os.getenv("HISTORY_FLUSH_INTERVAL"))
+
+        # Tournaments
+        if "TOURNAMENT_FILE" in os.environ:
+            self.tournament_file = os.getenv("TOURNAMENT_FILE")
+        if "TOURNAMENT_TURN_SECONDS" in os.environ:
+            self.tournament_turn_seconds = int(os.getenv("TOURNAMENT_TURN_SECONDS"))
+        if "TOURNAMENT_MATCH_WORDS" in os.environ:
+            self.tournament_match_words = int(os.getenv("TOURNAMENT_MATCH_WORDS"))
+        if "TOURNAMENT_THREADS" in os.environ:
+            self.tournament_threads = os.getenv("TOURNAMENT_THREADS").lower() in ("1", "true", "yes")
+
+        # Slash commands
+        if "APP_COMMANDS_SYNC" in os.environ:
+            self.app_commands_sync = os.getenv("APP_COMMANDS_SYNC").lower() in ("1", "true", "yes")
+
+        # Admission control
+        if "ADMISSION_USER_RATE" in os.environ:
+            self.admission_user_rate = float(os.getenv("ADMISSION_USER_RATE"))
+        if "ADMISSION_USER_BURST" in os.environ:
+            self.admission_user_burst = int(os.getenv("ADMISSION_USER_BURST"))
+        if "ADMISSION_CHANNEL_RATE" in os.environ:
+            self.admission_channel_rate = float(os.getenv("ADMISSION_CHANNEL_RATE"))
+        if "ADMISSION_CHANNEL_BURST" in os.environ:
+            self.admission_channel_burst = int(os.getenv("ADMISSION_CHANNEL_BURST"))
+        if "ADMISSION_DEGRADED_SECONDS" in os.environ:
+            self.admission_degraded_seconds = float(os.getenv("ADMISSION_DEGRADED_SECONDS"))
+        if "ADMISSION_REPLY_RATE" in os.environ:
+            self.admission_reply_rate = float(os.getenv("ADMISSION_REPLY_RATE"))
+        if "ADMISSION_REPLY_BURST" in os.environ:
+            self.admission_reply_burst = int(os.getenv("ADMISSION_REPLY_BURST"))
+        if "REJECTION_REPLY_COOLDOWN" in os.environ:
+            self.rejection_reply_cooldown = float(os.getenv("REJECTION_REPLY_COOLDOWN"))
+
+        # Channel actors / score sink
+        if "SCORES_FLUSH_INTERVAL" in os.environ:
+            self.scores_flush_interval = float(os.getenv("SCORES_FLUSH_INTERVAL"))
+        if "ACTOR_IDLE_TIMEOUT" in os.environ:
+            self.actor_idle_timeout = float(os.getenv("ACTOR_IDLE_TIMEOUT"))
 
     def to_dict(self) -> Dict[str, Any]:
         """Convert config to dictionary for JSON serialization"""
@@ -110,39 +334,160 @@ class GameConfig:
             "streak_bonus": self.streak_bonus,
             "combo_step": self.combo_step,
             "combo_bonus": self.combo_bonus,
+            "difficulty_bonus": self.difficulty_bonus,
+            "difficulty_max_followups": self.difficulty_max_followups,
             "ai_model": self.ai_model,
             "ai_max_tokens": self.ai_max_tokens,
             "ai_temperature": self.ai_temperature,
+            "ai_local_fallback": self.ai_local_fallback,
+            "ai_candidate_count": self.ai_candidate_count,
+            "fuzzy_suggestions": self.fuzzy_suggestions,
+            "fuzzy_prefix_length": self.fuzzy_prefix_length,
+            "fuzzy_max_entries": self.fuzzy_max_entries,
             "max_ai_players": self.max_ai_players,
+            "roster_batch_threshold": self.roster_batch_threshold,
+            "roster_announce_interval": self.roster_announce_interval,
             "max_turn_time": self.max_turn_time,
             "min_turn_time": self.min_turn_time,
             "scores_file": self.scores_file,
+            "names_file": self.names_file,
+            "names_cache_size": self.names_cache_size,
+            "names_negative_ttl": self.names_negative_ttl,
+            "spectator_enabled": self.spectator_enabled,
+            "spectator_host": self.spectator_host,
+            "spectator_port": self.spectator_port,
+            "spectator_queue_size": self.spectator_queue_size,
+            "spectator_max_subscribers": self.spectator_max_subscribers,
+            "traffic_capture_file": self.traffic_capture_file,
+            "traffic_capture_max_bytes": self.traffic_capture_max_bytes,
             "words_file": self.words_file,
-            "command_prefix": self.command_prefix
+            "default_language": self.default_language,
+            "words_dir": self.words_dir,
+            "default_chain_rule": self.default_chain_rule,
+            "rule_escalation_step": self.rule_escalation_step,
+            "rule_escalation_max": self.rule_escalation_max,
+            "validation_sources": self.validation_sources,
+            "spellcheck_fallback": self.spellcheck_fallback,
+            "guild_wordlists_dir": self.guild_wordlists_dir,
+            "validation_cache_size": self.validation_cache_size,
+            "command_prefix": self.command_prefix,
+            "runtime_profile": self.runtime_profile,
+            "event_loop": self.event_loop,
+            "loop_lag_threshold_ms": self.loop_lag_threshold_ms,
+            "loop_lag_interval": self.loop_lag_interval,
+            "profile_dir": self.profile_dir,
+            "memory_sample_size": self.memory_sample_size,
+            "memory_trace_frames": self.memory_trace_frames,
+            "memory_metrics_interval": self.memory_metrics_interval,
+            "memory_metrics_file": self.memory_metrics_file,
+            "trace_sample_rate": self.trace_sample_rate,
+            "trace_file": self.trace_file,
+            "trace_otlp_endpoint": self.trace_otlp_endpoint,
+            "config_watch": self.config_watch,
+            "config_watch_interval": self.config_watch_interval,
+            "config_watch_debounce": self.config_watch_debounce,
+            "checkpoint_file": self.checkpoint_file,
+            "checkpoint_interval": self.checkpoint_interval,
+            "partitions_file": self.partitions_file,
+            "season": self.season,
+            "history_dir": self.history_dir,
+            "history_flush_interval": self.history_flush_interval,
+            "tournament_file": self.tournament_file,
+            "tournament_turn_seconds": self.tournament_turn_seconds,
+            "tournament_match_words": self.tournament_match_words,
+            "tournament_threads": self.tournament_threads,
+            "app_commands_sync": self.app_commands_sync,
+            "admission_user_rate": self.admission_user_rate,
+            "admission_user_burst": self.admission_user_burst,
+            "admission_channel_rate": self.admission_channel_rate,
+            "admission_channel_burst": self.admission_channel_burst,
+            "admission_degraded_seconds": self.admission_degraded_seconds,
+            "admission_reply_rate": self.admission_reply_rate,
+            "admission_reply_burst": self.admission_reply_burst,
+            "rejection_reply_cooldown": self.rejection_reply_cooldown,
+            "scores_flush_interval": self.scores_flush_interval,
+            "actor_idle_timeout": self.actor_idle_timeout
         }
 
+    def _apply_dict(self, data: Dict[str, Any]):
+        """Override known settings with values from a dictionary"""
+        for key, value in data.items():
+            if hasattr(self, key) and not key.startswith("_") and key != "version":
+                setattr(self, key, value)
+
     @classmethod
     def from_dict(cls, data: Dict[str, Any]) -> 'GameConfig':
         """Create config from dictionary"""
         config = cls.__new__(cls)  # Create instance without calling __init__
+        config._frozen = False
+        config.version = 0
         # Set default values first
         config._set_defaults()
         
         # Override with loaded values
-        for key, value in data.items():
-            if hasattr(config, key):
-                setattr(config, key, value)
+        config._apply_dict(data)
         return config
 
+    def __setattr__(self, key: str, value: Any):
+        if getattr(self, "_frozen", False):
+            raise AttributeError(f"Config snapshot v{self.version} is read-only; build a new GameConfig instead")
+        super().__setattr__(key, value)
+
+    def freeze(self, version: int = 0) -> 'GameConfig':
+        """Stamp a version and make this instance an immutable snapshot"""
+        self.version = version
+        self._frozen = True
+        return self
+
     def validate(self) -> bool:
         """Validate configuration values"""
         try:
             assert self.min_turn_time <= self.turn_seconds <= self.max_turn_time
             assert self.cooldown_seconds >= 0
             assert self.long_word_len > 0
+            assert self.difficulty_bonus >= 0
+            assert self.difficulty_max_followups >= 0
+            assert self.validation_cache_size > 0
+            assert self.default_language
+            assert self.default_chain_rule
+            assert self.runtime_profile in ("default", "lean")
+            assert self.event_loop in ("auto", "asyncio", "uvloop")
+            assert self.rule_escalation_step > 0
+            assert self.rule_escalation_max > 0
             assert self.max_ai_players >= 0
+            assert self.names_cache_size > 0
+            assert self.names_negative_ttl >= 0
+            assert self.spectator_host
+            assert 0 < self.spectator_port < 65536
+            assert self.spectator_queue_size > 0
+            assert self.spectator_max_subscribers > 0
+            assert self.traffic_capture_max_bytes > 0
+            assert self.roster_batch_threshold >= 0
+            assert self.roster_announce_interval > 0
             assert self.ai_max_tokens > 0
+            assert self.ai_candidate_count >= 0
+            assert self.fuzzy_prefix_length > 0
+            assert self.fuzzy_max_entries > 0
             assert 0 <= self.ai_temperature <= 2.0
+            assert self.loop_lag_threshold_ms >= 0
+            assert self.loop_lag_interval > 0
+            assert self.memory_sample_size > 0
+            assert self.memory_trace_frames > 0
+            assert self.memory_metrics_interval >= 0
+            assert 0 <= self.trace_sample_rate <= 1.0
+            assert self.config_watch_interval > 0
+            assert self.config_watch_debounce >= 0
+            assert self.checkpoint_interval >= 0
+            assert self.history_flush_interval > 0
+            assert self.tournament_turn_seconds > 0
+            assert self.tournament_match_words > 0
+            assert self.admission_user_rate >= 0 and self.admission_user_burst >= 1
+            assert self.admission_channel_rate >= 0 and self.admission_channel_burst >= 1
+            assert self.admission_degraded_seconds >= 0
+            assert self.admission_reply_rate >= 0 and self.admission_reply_burst >= 1
+            assert self.rejection_reply_cooldown >= 0
+            assert self.scores_flush_interval > 0
+            assert self.actor_idle_timeout > 0
             return True
         except AssertionError:
             return False
@@ -150,7 +495,7 @@ class GameConfig:
     def save_to_file(self, filepath: str = None):
         """Save current configuration to JSON file"""
         if filepath is None:
-            filepath = os.path.join(os.path.dirname(__file__), "config.json")
+            filepath = CONFIG_FILE
 
         try:
             with open(filepath, 'w', encoding='utf-8') as f:
@@ -159,8 +504,46 @@ class GameConfig:
         except IOError as e:
             print(f"Error saving configuration: {e}")
 
+class ConfigStore:
+    """Holds the current immutable config snapshot and swaps it atomically
+
+    Modules keep ``from config import config`` bindings to the store, so
+    attribute reads always see the latest snapshot. Code that reads several
+    settings together should take ``config.snapshot()`` once so a reload
+    cannot land between two reads.
+    """
+
+    def __init__(self, initial: GameConfig):
+        self._swap_lock = threading.Lock()
+        self._current = initial.freeze(1)
+
+    def snapshot(self) -> GameConfig:
+        """Current config snapshot"""
+        return self._current
+
+    @property
+    def version(self) -> int:
+        return self._current.version
+
+    def swap(self, new_config: GameConfig) -> GameConfig:
+        """Freeze ``new_config`` as the next version and publish it"""
+        with self._swap_lock:
+            new_config.freeze(self._current.version + 1)
+            self._current = new_config
+        return new_config
+
+    def __getattr__(self, key: str) -> Any:
+        return getattr(self._current, key)
+
+    def __setattr__(self, key: str, value: Any):
+        if key.startswith("_"):
+            super().__setattr__(key, value)
+            return
+        raise AttributeError("Config is read-only; use config.swap() with a new GameConfig")
+
+
 # Global config instance
-config = GameConfig()
+config = ConfigStore(GameConfig())
 
 # Export for easy importing
-__all__ = ['config', 'GameConfig']
\ No newline at end of file
+__all__ = ['config', 'GameConfig', 'ConfigStore', 'CONFIG_FILE']
\ No newline at end of file
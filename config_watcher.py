@@ -0,0 +1,74 @@
+"""
+Debounced file watcher for Word Chain Game Discord Bot hot reloads
+"""
+
+import os
+import asyncio
+from typing import Awaitable, Callable, Dict, Iterable, Optional, Set, Tuple
+
+
+def _stat_files(paths: Iterable[str]) -> Dict[str, Optional[Tuple[float, int]]]:
+    """(mtime, size) per path, or None when the file is missing"""
+    result: Dict[str, Optional[Tuple[float, int]]] = {}
+    for path in paths:
+        try:
+            st = os.stat(path)
+            result[path] = (st.st_mtime, st.st_size)
+        except OSError:
+            result[path] = None
+    return result
+
+
+class FileWatcher:
+    """Poll a few files and report changes once they have settled
+
+    Editors often write a file in several steps, so a change is only reported
+    after the files have stayed unchanged for ``debounce`` seconds. All stat
+    calls run in a worker thread to keep the event loop free.
+    """
+
+    def __init__(self, paths_fn: Callable[[], Iterable[str]],
+                 on_change: Callable[[Set[str]], Awaitable[None]],
+                 interval: float = 2.0, debounce: float = 1.0):
+        self.paths_fn = paths_fn
+        self.on_change = on_change
+        self.interval = interval
+        self.debounce = debounce
+        self._task: Optional[asyncio.Task] = None
+
+    def start(self):
+        """Start polling (call from the event loop)"""
+        if self._task is None:
+            self._task = asyncio.create_task(self._run(), name="config-watcher")
+
+    def stop(self):
+        """Stop polling"""
+        if self._task is not None:
+            self._task.cancel()
+            self._task = None
+
+    async def _run(self):
+        seen = await asyncio.to_thread(_stat_files, list(self.paths_fn()))
+        pending: Set[str] = set()
+        settle_at = 0.0
+        loop = asyncio.get_running_loop()
+        while True:
+            await asyncio.sleep(self.interval if not pending else min(self.interval, self.debounce))
+            try:
+                current = await asyncio.to_thread(_stat_files, list(self.paths_fn()))
+                changed = {p for p, sig in current.items() if seen.get(p) != sig}
+                seen = current
+                if changed:
+                    pending |= changed
+                    settle_at = loop.time() + self.debounce
+                    continue
+                if pending and loop.time() >= settle_at:
+                    batch, pending = pending, set()
+                    await self.on_change(batch)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                print(f"Config watcher error: {e}")
+
+
+__all__ = ['FileWatcher']
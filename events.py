@@ -0,0 +1,204 @@
+"""
+Live spectator feed for Word Chain Game Discord Bot
+
+Game code publishes turn, word, timeout and game events to an in-process
+``EventBus``. Publishing never awaits: each event is encoded to JSON once and
+the same bytes are appended to every matching subscriber's bounded deque.
+When a viewer falls behind, its oldest events are dropped, so a slow overlay
+can never hold up word processing. ``SpectatorServer`` is a small aiohttp
+app that streams a subscription over Server-Sent Events (``/events``) or a
+WebSocket (``/ws``). Each connection is one coroutine waiting on its own
+queue, so thousands of viewers cost little more than their buffers.
+"""
+
+import json
+import time
+import asyncio
+from collections import deque
+from typing import Any, Deque, Dict, Optional, Set
+
+from aiohttp import web, WSMsgType
+
+
+class Subscription:
+    """Bounded queue of encoded events for one viewer (drop-oldest when full)"""
+
+    __slots__ = ("channel_id", "queue", "dropped", "delivered", "_wake")
+
+    def __init__(self, channel_id: Optional[int], size: int):
+        self.channel_id = channel_id  # None = every channel
+        self.queue: Deque[bytes] = deque(maxlen=size)
+        self.dropped = 0
+        self.delivered = 0
+        self._wake = asyncio.Event()
+
+    def push(self, data: bytes):
+        if len(self.queue) == self.queue.maxlen:
+            self.dropped += 1  # deque discards the oldest on append
+        self.queue.append(data)
+        self._wake.set()
+
+    async def get(self, timeout: Optional[float] = None) -> Optional[bytes]:
+        """Next event, or None if ``timeout`` passed first"""
+        while not self.queue:
+            self._wake.clear()
+            try:
+                await asyncio.wait_for(self._wake.wait(), timeout)
+            except asyncio.TimeoutError:
+                return None
+        self.delivered += 1
+        return self.queue.popleft()
+
+
+class EventBus:
+    """Publish/subscribe keyed by Discord channel id"""
+
+    def __init__(self, queue_size: int = 100):
+        self.queue_size = queue_size
+        self._subs: Dict[Optional[int], Set[Subscription]] = {}
+        self._seq = 0
+        self.published = 0
+
+    def subscribers(self) -> int:
+        return sum(len(subs) for subs in self._subs.values())
+
+    def subscribe(self, channel_id: Optional[int] = None) -> Subscription:
+        sub = Subscription(channel_id, self.queue_size)
+        self._subs.setdefault(channel_id, set()).add(sub)
+        return sub
+
+    def unsubscribe(self, sub: Subscription):
+        subs = self._subs.get(sub.channel_id)
+        if subs is not None:
+            subs.discard(sub)
+            if not subs:
+                del self._subs[sub.channel_id]
+
+    def publish(self, kind: str, channel_id: Optional[int], **data: Any):
+        """Queue an event for every viewer of ``channel_id`` (no-op without viewers)"""
+        if not self._subs:
+            return
+        targets = self._subs.get(channel_id, ()), self._subs.get(None, ())
+        if not targets[0] and not targets[1]:
+            return
+        self._seq += 1
+        self.published += 1
+        event = {"id": self._seq, "type": kind, "channel": channel_id, "ts": time.time(), **data}
+        payload = json.dumps(event, ensure_ascii=False, separators=(",", ":")).encode("utf-8")  # encoded once for everyone
+        for subs in targets:
+            for sub in subs:
+                sub.push(payload)
+
+    def stats(self) -> Dict[str, Any]:
+        subs = [sub for group in self._subs.values() for sub in group]
+        return {
+            "subscribers": len(subs),
+            "published": self.published,
+            "queued": sum(len(sub.queue) for sub in subs),
+            "dropped": sum(sub.dropped for sub in subs),
+        }
+
+
+class SpectatorServer:
+    """aiohttp app serving an ``EventBus`` over SSE and WebSocket"""
+
+    def __init__(self, bus: EventBus, host: str = "127.0.0.1", port: int = 8765,
+                 max_subscribers: int = 5000, heartbeat: float = 15.0):
+        self.bus = bus
+        self.host = host
+        self.port = port
+        self.max_subscribers = max_subscribers
+        self.heartbeat = heartbeat
+        self._runner: Optional[web.AppRunner] = None
+
+    @staticmethod
+    def _channel(request: web.Request) -> Optional[int]:
+        value = request.query.get("channel")
+        if value is None:
+            return None
+        try:
+            return int(value)
+        except ValueError:
+            raise web.HTTPBadRequest(text="channel must be a channel id")
+
+    def _admit(self):
+        if self.bus.subscribers() >= self.max_subscribers:
+            raise web.HTTPServiceUnavailable(text="too many viewers")
+
+    async def handle_sse(self, request: web.Request) -> web.StreamResponse:
+        channel_id = self._channel(request)
+        self._admit()
+        response = web.StreamResponse(headers={
+            "Content-Type": "text/event-stream",
+            "Cache-Control": "no-cache",
+            "X-Accel-Buffering": "no",
+        })
+        await response.prepare(request)
+        sub = self.bus.subscribe(channel_id)
+        try:
+            while True:
+                data = await sub.get(self.heartbeat)
+                await response.write(b": keep-alive\n\n" if data is None else b"data: " + data + b"\n\n")
+        except (ConnectionResetError, asyncio.CancelledError):
+            pass
+        finally:
+            self.bus.unsubscribe(sub)
+        return response
+
+    async def handle_ws(self, request: web.Request) -> web.WebSocketResponse:
+        channel_id = self._channel(request)
+        self._admit()
+        ws = web.WebSocketResponse(heartbeat=self.heartbeat)
+        await ws.prepare(request)
+        sub = self.bus.subscribe(channel_id)
+        binary = request.query.get("binary") == "1"  # raw JSON bytes instead of text frames
+
+        async def drain_incoming():  # viewers only listen; reading keeps close frames and pings flowing
+            async for msg in ws:
+                if msg.type in (WSMsgType.CLOSE, WSMsgType.ERROR):
+                    break
+
+        reader = asyncio.create_task(drain_incoming())
+        try:
+            while not ws.closed and not reader.done():
+                data = await sub.get(self.heartbeat)
+                if data is None:
+                    continue
+                if binary:
+                    await ws.send_bytes(data)
+                else:
+                    await ws.send_str(data.decode("utf-8"))
+        except (ConnectionResetError, asyncio.CancelledError):
+            pass
+        finally:
+            reader.cancel()
+            self.bus.unsubscribe(sub)
+            await ws.close()
+        return ws
+
+    async def handle_stats(self, request: web.Request) -> web.Response:
+        return web.json_response(self.bus.stats())
+
+    def app(self) -> web.Application:
+        app = web.Application()
+        app.router.add_get("/events", self.handle_sse)
+        app.router.add_get("/ws", self.handle_ws)
+        app.router.add_get("/stats", self.handle_stats)
+        return app
+
+    async def start(self):
+        if self._runner is not None:
+            return
+        runner = web.AppRunner(self.app(), handle_signals=False)
+        await runner.setup()
+        await web.TCPSite(runner, self.host, self.port).start()
+        self._runner = runner
+        print(f"Spectator feed on http://{self.host}:{self.port}/events (SSE) and /ws (WebSocket)")
+
+    async def stop(self):
+        if self._runner is not None:
+            await self._runner.cleanup()
+            self._runner = None
+
+
+__all__ = ['Subscription', 'EventBus', 'SpectatorServer']
@@ -0,0 +1,111 @@
+"""
+"Did you mean" suggestions for Word Chain Game Discord Bot
+
+A SymSpell-style index: every dictionary word is stored under the hashes of
+its prefix with up to one character deleted. A rejected word is looked up the
+same way, and the few words that share a key are verified with a real edit
+distance. Keys and word ids live in two sorted NumPy arrays (8 bytes per
+entry), and only the first ``prefix_length`` characters are indexed, so memory
+stays bounded regardless of word length. The index is only consulted after a
+word has been rejected.
+"""
+
+import time
+from typing import Callable, Iterable, List, Optional, Set
+
+try:
+    import numpy as np
+except ImportError:  # optional: suggestions are disabled without numpy
+    np = None
+
+
+def _key(text: str) -> int:
+    return hash(text) & 0xFFFFFFFF
+
+
+def _deletes(text: str) -> Set[str]:
+    """``text`` and every string with one character removed"""
+    return {text} | {text[:i] + text[i + 1:] for i in range(len(text))}
+
+
+def edit_distance(a: str, b: str, limit: int) -> int:
+    """Optimal string alignment distance, or ``limit + 1`` once it is exceeded"""
+    if abs(len(a) - len(b)) > limit:
+        return limit + 1
+    previous2: List[int] = []
+    previous = list(range(len(b) + 1))
+    for i in range(1, len(a) + 1):
+        current = [i] + [0] * len(b)
+        best = current[0]
+        for j in range(1, len(b) + 1):
+            cost = 0 if a[i - 1] == b[j - 1] else 1
+            value = min(previous[j] + 1, current[j - 1] + 1, previous[j - 1] + cost)
+            if i > 1 and j > 1 and a[i - 1] == b[j - 2] and a[i - 2] == b[j - 1]:
+                value = min(value, previous2[j - 2] + 1)  # transposition
+            current[j] = value
+            best = min(best, value)
+        if best > limit:
+            return limit + 1
+        previous2, previous = previous, current
+    return previous[-1]
+
+
+class FuzzyIndex:
+    """Immutable delete index over a word list"""
+
+    def __init__(self, words: Iterable[str], prefix_length: int = 7, max_entries: int = 5_000_000):
+        if np is None:
+            raise ImportError("numpy is required for word suggestions")
+        start = time.perf_counter()
+        self.prefix_length = prefix_length
+        self.words: List[str] = []
+        keys: List[int] = []
+        ids: List[int] = []
+        for word in words:
+            deletes = _deletes(word[:prefix_length])
+            if len(keys) + len(deletes) > max_entries:
+                print(f"Warning: suggestion index capped at {max_entries} entries ({len(self.words)} words indexed)")
+                break
+            word_id = len(self.words)
+            self.words.append(word)
+            for text in deletes:
+                keys.append(_key(text))
+                ids.append(word_id)
+        key_array = np.array(keys, dtype=np.uint32)
+        order = np.argsort(key_array, kind="stable")
+        self.keys = key_array[order]
+        self.ids = np.array(ids, dtype=np.uint32)[order]
+        self.lengths = np.fromiter((len(w) for w in self.words), dtype=np.int32, count=len(self.words))
+        self.build_seconds = time.perf_counter() - start
+
+    def __len__(self) -> int:
+        return len(self.words)
+
+    def nbytes(self) -> int:
+        return int(self.keys.nbytes + self.ids.nbytes + self.lengths.nbytes)
+
+    def suggest(self, word: str, accept: Optional[Callable[[str], bool]] = None,
+                max_distance: int = 2, limit: int = 3) -> List[str]:
+        """Closest indexed words to ``word`` that pass ``accept``, nearest first"""
+        query = _deletes(word[:self.prefix_length])
+        keys = np.fromiter((_key(text) for text in query), dtype=np.uint32, count=len(query))
+        lo = np.searchsorted(self.keys, keys, side="left")
+        hi = np.searchsorted(self.keys, keys, side="right")
+        spans = [self.ids[a:b] for a, b in zip(lo.tolist(), hi.tolist()) if b > a]
+        if not spans:
+            return []
+        ids = np.unique(np.concatenate(spans))
+        ids = ids[np.abs(self.lengths[ids] - len(word)) <= max_distance]  # cheap filter before edit distance
+        scored = []
+        for word_id in ids.tolist():
+            candidate = self.words[word_id]
+            if candidate == word or (accept is not None and not accept(candidate)):
+                continue
+            distance = edit_distance(word, candidate, max_distance)
+            if distance <= max_distance:
+                scored.append((distance, abs(len(candidate) - len(word)), candidate))
+        scored.sort()
+        return [candidate for _, _, candidate in scored[:limit]]
+
+
+__all__ = ['FuzzyIndex', 'edit_distance']
@@ -0,0 +1,50 @@
+#!/usr/bin/env python3
+"""
+Word Chain Game History Export
+Streams stored games as JSONL (one game per line) or CSV (one turn per row)
+"""
+
+import sys
+import argparse
+from datetime import datetime, timezone
+
+from config import GameConfig
+from history import HistoryStore, export_csv, export_jsonl
+
+
+def parse_date(value: str) -> float:
+    """YYYY-MM-DD (UTC) -> unix timestamp"""
+    return datetime.strptime(value, "%Y-%m-%d").replace(tzinfo=timezone.utc).timestamp()
+
+
+def main():
+    config = GameConfig()
+
+    parser = argparse.ArgumentParser(description="Export Word Chain game history")
+    parser.add_argument("--dir", default=config.history_dir, help="history directory (default: %(default)s)")
+    parser.add_argument("--format", choices=["jsonl", "csv"], default="jsonl", help="output format")
+    parser.add_argument("--since", type=parse_date, help="only games ended on/after this UTC date (YYYY-MM-DD)")
+    parser.add_argument("--until", type=parse_date, help="only games ended before this UTC date (YYYY-MM-DD)")
+    parser.add_argument("--guild", type=int, help="only games from this server id")
+    parser.add_argument("--channel", type=int, help="only games from this channel id")
+    parser.add_argument("--output", "-o", help="output file (default: stdout)")
+    args = parser.parse_args()
+
+    store = HistoryStore(args.dir)
+    games = store.iter_games(since=args.since, until=args.until, guild_id=args.guild, channel_id=args.channel)
+
+    out = open(args.output, "w", encoding="utf-8", newline="") if args.output else sys.stdout
+    try:
+        if args.format == "csv":
+            count = export_csv(games, out)
+            print(f"Exported {count} turns", file=sys.stderr)
+        else:
+            count = export_jsonl(games, out)
+            print(f"Exported {count} games", file=sys.stderr)
+    finally:
+        if args.output:
+            out.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,138 @@
+"""
+Append-only game history store for Word Chain Game Discord Bot
+
+Finished games are appended as JSON lines to gzip segment files. Each flush
+appends one gzip member, and segments roll over at a size limit, so writes
+never rewrite existing data. Readers stream segments line by line and never
+hold more than one game in memory.
+"""
+
+import os
+import csv
+import gzip
+import json
+import time
+import asyncio
+from typing import Any, Dict, Iterable, Iterator, List, Optional, TextIO
+
+# Turn entry layout: [timestamp, player_key, word or None (skip), points, long_bonus, streak_bonus, combo_bonus,
+# difficulty_bonus]. Games recorded before difficulty_bonus existed have 7 entries per turn.
+TURN_FIELDS = ("ts", "player", "word", "points", "long_bonus", "streak_bonus", "combo_bonus", "difficulty_bonus")
+
+
+class HistoryStore:
+    """Gzip JSONL segments under ``directory`` with batched, off-loop appends"""
+
+    def __init__(self, directory: str, segment_max_bytes: int = 64 * 1024 * 1024,
+                 batch_size: int = 200, flush_interval: float = 5.0):
+        self.directory = directory
+        self.segment_max_bytes = segment_max_bytes
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self._pending: List[Dict[str, Any]] = []
+        self._segment: Optional[str] = None
+        self._flush_lock = asyncio.Lock()
+        self._task: Optional[asyncio.Task] = None
+
+    # --- writing -------------------------------------------------------
+
+    def append(self, record: Dict[str, Any]):
+        """Queue a finished game (call on the loop; never blocks)"""
+        self._pending.append(record)
+        if len(self._pending) >= self.batch_size:
+            asyncio.get_running_loop().create_task(self.flush())
+
+    async def flush(self):
+        """Write queued games in one batch from a worker thread"""
+        async with self._flush_lock:
+            if not self._pending:
+                return
+            batch, self._pending = self._pending, []
+            await asyncio.to_thread(self.write_batch, batch)
+
+    def start(self):
+        """Start the periodic flush task"""
+        if self._task is None:
+            self._task = asyncio.create_task(self._run(), name="history-flush")
+
+    async def _run(self):
+        while True:
+            await asyncio.sleep(self.flush_interval)
+            try:
+                await self.flush()
+            except Exception as e:
+                print(f"History flush error: {e}")
+
+    def _current_segment(self) -> str:
+        if self._segment is None or not os.path.exists(self._segment) \
+                or os.path.getsize(self._segment) >= self.segment_max_bytes:
+            os.makedirs(self.directory, exist_ok=True)
+            self._segment = os.path.join(self.directory, f"games-{time.time_ns()}.jsonl.gz")
+        return self._segment
+
+    def write_batch(self, records: Iterable[Dict[str, Any]]):
+        """Append records as one gzip member (blocking, run off-loop)"""
+        payload = "".join(json.dumps(r, separators=(",", ":"), ensure_ascii=False) + "\n" for r in records)
+        with open(self._current_segment(), "ab") as f:
+            f.write(gzip.compress(payload.encode("utf-8"), compresslevel=6))
+
+    # --- reading -------------------------------------------------------
+
+    def segments(self) -> List[str]:
+        """Segment files, oldest first"""
+        if not os.path.isdir(self.directory):
+            return []
+        names = sorted(n for n in os.listdir(self.directory) if n.startswith("games-") and n.endswith(".jsonl.gz"))
+        return [os.path.join(self.directory, n) for n in names]
+
+    def iter_games(self, since: Optional[float] = None, until: Optional[float] = None,
+                   guild_id: Optional[int] = None, channel_id: Optional[int] = None) -> Iterator[Dict[str, Any]]:
+        """Stream stored games, optionally filtered by end time, guild or channel"""
+        for path in self.segments():
+            with gzip.open(path, "rt", encoding="utf-8") as f:
+                for line in f:
+                    if not line.strip():
+                        continue
+                    game = json.loads(line)
+                    ended = game.get("ended", 0)
+                    if since is not None and ended < since:
+                        continue
+                    if until is not None and ended >= until:
+                        continue
+                    if guild_id is not None and game.get("guild") != guild_id:
+                        continue
+                    if channel_id is not None and game.get("channel") != channel_id:
+                        continue
+                    yield game
+
+
+def iter_turn_rows(games: Iterable[Dict[str, Any]]) -> Iterator[Dict[str, Any]]:
+    """Flatten games into one row per turn"""
+    for game in games:
+        for index, turn in enumerate(game.get("turns", [])):
+            row = {"game_id": game.get("id"), "guild": game.get("guild"), "channel": game.get("channel"), "turn": index}
+            row.update(zip(TURN_FIELDS, turn))
+            yield row
+
+
+def export_jsonl(games: Iterable[Dict[str, Any]], out: TextIO) -> int:
+    """Write one game per line; returns the number of games"""
+    count = 0
+    for game in games:
+        out.write(json.dumps(game, ensure_ascii=False) + "\n")
+        count += 1
+    return count
+
+
+def export_csv(games: Iterable[Dict[str, Any]], out: TextIO) -> int:
+    """Write one turn per CSV row; returns the number of rows"""
+    writer = csv.DictWriter(out, fieldnames=["game_id", "guild", "channel", "turn", *TURN_FIELDS], restval=0)
+    writer.writeheader()
+    count = 0
+    for row in iter_turn_rows(games):
+        writer.writerow(row)
+        count += 1
+    return count
+
+
+__all__ = ['HistoryStore', 'TURN_FIELDS', 'iter_turn_rows', 'export_jsonl', 'export_csv']
@@ -0,0 +1,164 @@
+"""
+Language rules and dictionaries for Word Chain Game Discord Bot
+
+Each language defines how a submitted word is normalized, what counts as a
+well-formed word, and which letter a word starts and ends with for chaining.
+Dictionaries are loaded on first use and shared by every channel playing that
+language, so memory is only spent on languages that are actually played.
+"""
+
+import os
+import threading
+import unicodedata
+from typing import Callable, Dict, List, Optional
+
+from chain_graph import ChainGraph
+
+
+class Language:
+    """Generic rules: NFC + casefold, letters only, first/last character"""
+
+    def __init__(self, code: str, name: str, min_len: int = 3, max_len: int = 15):
+        self.code = code
+        self.name = name
+        self.min_len = min_len
+        self.max_len = max_len
+
+    def normalize(self, word: str) -> str:
+        return unicodedata.normalize("NFC", word.strip()).casefold()
+
+    def clean(self, text: str) -> str:
+        """Keep only the characters a word can contain (for model replies)"""
+        return "".join(ch for ch in self.normalize(text) if unicodedata.category(ch)[0] in "LM")
+
+    def is_valid_basic(self, word: str) -> bool:
+        return word.isalpha() and self.min_len <= len(word) <= self.max_len
+
+    def first_letter(self, word: str) -> str:
+        return word[0]
+
+    def last_letter(self, word: str) -> str:
+        return word[-1]
+
+
+class ThaiLanguage(Language):
+    """Thai: chain on consonants, skipping leading vowels, marks and silenced letters"""
+
+    THANTHAKHAT = "\u0e4c"  # ์ silences the consonant before it
+    SILENT_CLUSTER_HEADS = "\u0e17\u0e15"  # ท ต: silenced together with ร in ทร์ / ตร์
+
+    def __init__(self, code: str = "th", name: str = "Thai", min_len: int = 2, max_len: int = 30):
+        super().__init__(code, name, min_len, max_len)
+
+    @staticmethod
+    def is_consonant(ch: str) -> bool:
+        return "\u0e01" <= ch <= "\u0e2e"  # ก..ฮ
+
+    def is_valid_basic(self, word: str) -> bool:
+        return (self.min_len <= len(word) <= self.max_len
+                and all("\u0e01" <= ch <= "\u0e4e" for ch in word)  # Thai letters, vowels and marks
+                and any(self.is_consonant(ch) for ch in word))
+
+    def first_letter(self, word: str) -> str:
+        return next((ch for ch in word if self.is_consonant(ch)), word[0])  # skips leading vowels เ แ โ ใ ไ
+
+    def last_letter(self, word: str) -> str:
+        silent = set()
+        for i, ch in enumerate(word):
+            if ch != self.THANTHAKHAT:
+                continue
+            j = i - 1
+            while j >= 0 and not self.is_consonant(word[j]):
+                j -= 1
+            if j >= 0:
+                silent.add(j)
+                if word[j] == "\u0e23" and j > 0 and word[j - 1] in self.SILENT_CLUSTER_HEADS:
+                    silent.add(j - 1)
+        for i in range(len(word) - 1, -1, -1):
+            if self.is_consonant(word[i]) and i not in silent:
+                return word[i]
+        return word[-1]
+
+
+LANGUAGES: Dict[str, Language] = {
+    "en": Language("en", "English"),
+    "th": ThaiLanguage(),
+}
+
+
+def get_language(code: str) -> Language:
+    """Rules for ``code`` (generic rules for languages without special handling)"""
+    language = LANGUAGES.get(code)
+    if language is None:
+        language = LANGUAGES.setdefault(code, Language(code, code))
+    return language
+
+
+def load_language_graph(path: str, language: Language) -> ChainGraph:
+    """Read a one-word-per-line file into a ChainGraph (blocking, run off-loop)"""
+    def words():
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                for line in f:
+                    word = language.normalize(line)
+                    if word:
+                        yield word
+        except FileNotFoundError:
+            print(f"Warning: dictionary for '{language.code}' not found at {path}")
+
+    return ChainGraph(words(), accept=language.is_valid_basic,
+                      first=language.first_letter, last=language.last_letter)
+
+
+class DictionaryRegistry:
+    """Lazily loaded, shared dictionary per language"""
+
+    def __init__(self, path_for: Callable[[str], str]):
+        self.path_for = path_for
+        self._graphs: Dict[str, ChainGraph] = {}
+        self._locks: Dict[str, threading.Lock] = {}
+        self._guard = threading.Lock()
+
+    def peek(self, code: str) -> Optional[ChainGraph]:
+        """The loaded dictionary, or None if it has not been loaded yet"""
+        return self._graphs.get(code)
+
+    def available(self, code: str) -> bool:
+        return code in self._graphs or os.path.exists(self.path_for(code))
+
+    def load(self, code: str) -> ChainGraph:
+        """Load (once) and return the dictionary for ``code`` (blocking)"""
+        graph = self._graphs.get(code)
+        if graph is not None:
+            return graph
+        with self._guard:
+            lock = self._locks.setdefault(code, threading.Lock())
+        with lock:
+            graph = self._graphs.get(code)
+            if graph is None:
+                graph = load_language_graph(self.path_for(code), get_language(code))
+                self._graphs[code] = graph
+                print(f"Loaded {len(graph)} {get_language(code).name} words")
+        return graph
+
+    def replace(self, graphs: Dict[str, ChainGraph], path_for: Optional[Callable[[str], str]] = None):
+        """Swap in freshly loaded dictionaries; any others reload on next use"""
+        if path_for is not None:
+            self.path_for = path_for
+        self._graphs = dict(graphs)
+
+    def loaded(self) -> Dict[str, int]:
+        return {code: len(graph) for code, graph in self._graphs.items()}
+
+    def codes(self, directory: str) -> List[str]:
+        """Languages with a dictionary file in ``directory`` or already loaded"""
+        codes = set(self._graphs)
+        if os.path.isdir(directory):
+            codes.update(n[:-4] for n in os.listdir(directory) if n.endswith(".txt"))
+        return sorted(codes)
+
+
+__all__ = [
+    'Language', 'ThaiLanguage', 'LANGUAGES', 'get_language',
+    'load_language_graph', 'DictionaryRegistry',
+]
@@ -0,0 +1,357 @@
+"""
+Partitioned and time-windowed leaderboards for Word Chain Game Discord Bot
+
+Scores are kept per partition (global, guild, channel, season) and per time
+bucket (hour, day, week, month) in tables that maintain their ranking on every
+update, so top-N reads never scan or sort the whole table. Changed rows are
+persisted to SQLite in batches.
+"""
+
+import os
+import sqlite3
+import threading
+from bisect import bisect_left, insort
+from datetime import datetime, timezone
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+
+def current_season(now: Optional[datetime] = None) -> str:
+    """Default season id: calendar quarter, e.g. ``2026-Q4``"""
+    now = now or datetime.now(timezone.utc)
+    return f"{now.year}-Q{(now.month - 1) // 3 + 1}"
+
+
+class RankedCounter:
+    """Member -> score table with an always-sorted ranking
+
+    Updates cost a binary search plus a list insert/delete (O(n) memmove, cheap
+    at leaderboard sizes); ``top(n)`` is a slice.
+    """
+
+    __slots__ = ("scores", "_order")
+
+    def __init__(self, scores: Optional[Dict[str, int]] = None):
+        self.scores: Dict[str, int] = dict(scores or {})
+        self._order: List[Tuple[int, str]] = sorted((-score, member) for member, score in self.scores.items())
+
+    def __len__(self) -> int:
+        return len(self.scores)
+
+    def add(self, member: str, delta: int) -> int:
+        """Add ``delta`` to a member's score and return the new score"""
+        old = self.scores.get(member)
+        if old is not None:
+            idx = bisect_left(self._order, (-old, member))
+            del self._order[idx]
+        new = (old or 0) + delta
+        self.scores[member] = new
+        insort(self._order, (-new, member))
+        return new
+
+    def remove(self, member: str):
+        """Drop a member from the table"""
+        old = self.scores.pop(member, None)
+        if old is not None:
+            del self._order[bisect_left(self._order, (-old, member))]
+
+    def get(self, member: str, default: int = 0) -> int:
+        return self.scores.get(member, default)
+
+    def top(self, n: int = 10) -> List[Tuple[str, int]]:
+        """Best ``n`` members as ``(member, score)``"""
+        return [(member, -neg) for neg, member in self._order[:n]]
+
+    def rank(self, member: str) -> Optional[int]:
+        """1-based rank of a member, or None"""
+        score = self.scores.get(member)
+        if score is None:
+            return None
+        return bisect_left(self._order, (-score, member)) + 1
+
+
+def guild_partition(guild_id: int) -> str:
+    return f"guild:{guild_id}"
+
+
+def channel_partition(channel_id: int) -> str:
+    return f"channel:{channel_id}"
+
+
+def season_partition(season: str, guild_id: Optional[int]) -> str:
+    return f"season:{season}:guild:{guild_id if guild_id is not None else 'dm'}"
+
+
+def _open_db(path: str, ddl: str) -> sqlite3.Connection:
+    """Open a WAL-mode SQLite connection usable from worker threads"""
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    conn = sqlite3.connect(path, check_same_thread=False)
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute(ddl)
+    return conn
+
+
+class PartitionedLeaderboards:
+    """Ranked score tables keyed by partition, with dirty-row persistence
+
+    The ``global`` partition mirrors ``scores.json`` and is rebuilt from it at
+    startup; every other partition is stored in SQLite.
+    """
+
+    GLOBAL = "global"
+
+    def __init__(self, path: str):
+        self.path = path
+        self.partitions: Dict[str, RankedCounter] = {}
+        self._dirty: Set[Tuple[str, str]] = set()
+        self._db_lock = threading.Lock()
+        self._conn: Optional[sqlite3.Connection] = None
+
+    def _connect(self) -> sqlite3.Connection:
+        if self._conn is None:
+            self._conn = _open_db(
+                self.path,
+                "CREATE TABLE IF NOT EXISTS scores ("
+                " partition TEXT NOT NULL,"
+                " member TEXT NOT NULL,"
+                " score INTEGER NOT NULL,"
+                " PRIMARY KEY (partition, member))",
+            )
+        return self._conn
+
+    def load(self, global_scores: Dict[str, int]):
+        """Load stored partitions and rebuild the global one (blocking, run off-loop)"""
+        with self._db_lock:
+            rows = self._connect().execute("SELECT partition, member, score FROM scores").fetchall()
+        grouped: Dict[str, Dict[str, int]] = {}
+        for partition, member, score in rows:
+            grouped.setdefault(partition, {})[member] = score
+        partitions = {name: RankedCounter(scores) for name, scores in grouped.items()}
+        partitions[self.GLOBAL] = RankedCounter({k: v for k, v in global_scores.items() if isinstance(v, int)})
+        self.partitions = partitions
+
+    def get(self, partition: str) -> Optional[RankedCounter]:
+        return self.partitions.get(partition)
+
+    def record(self, member: str, points: int, guild_id: Optional[int], channel_id: Optional[int], season: str):
+        """Add points to the global, guild, channel and season partitions"""
+        keys = [self.GLOBAL]
+        if guild_id is not None:
+            keys.append(guild_partition(guild_id))
+        if channel_id is not None:
+            keys.append(channel_partition(channel_id))
+        if season:
+            keys.append(season_partition(season, guild_id))
+        for key in keys:
+            table = self.partitions.get(key)
+            if table is None:
+                table = self.partitions[key] = RankedCounter()
+            table.add(member, points)
+            if key != self.GLOBAL:
+                self._dirty.add((key, member))
+
+    def clear(self):
+        """Drop every partition in memory (call on the loop)"""
+        self.partitions = {self.GLOBAL: RankedCounter()}
+        self._dirty = set()
+
+    def delete_stored(self):
+        """Delete every stored row (blocking, run off-loop)"""
+        with self._db_lock:
+            conn = self._connect()
+            with conn:
+                conn.execute("DELETE FROM scores")
+
+    def take_dirty(self) -> List[Tuple[str, str, int]]:
+        """Current values of rows changed since the last call (call on the loop)"""
+        dirty, self._dirty = self._dirty, set()
+        return [(p, m, self.partitions[p].get(m)) for p, m in dirty if p in self.partitions]
+
+    def write_rows(self, rows: Iterable[Tuple[str, str, int]]):
+        """Persist changed rows (blocking, run off-loop)"""
+        rows = list(rows)
+        if not rows:
+            return
+        with self._db_lock:
+            conn = self._connect()
+            with conn:
+                conn.executemany("INSERT OR REPLACE INTO scores (partition, member, score) VALUES (?, ?, ?)", rows)
+
+
+def bucket_ids(ts: float) -> Dict[str, str]:
+    """Bucket id of every window containing timestamp ``ts`` (UTC)"""
+    dt = datetime.fromtimestamp(ts, timezone.utc)
+    iso_year, iso_week, _ = dt.isocalendar()
+    return {
+        "hour": str(int(ts // 3600)),
+        "day": dt.strftime("%Y-%m-%d"),
+        "week": f"{iso_year}-W{iso_week:02d}",
+        "month": dt.strftime("%Y-%m"),
+    }
+
+
+class WindowedLeaderboards:
+    """Daily/weekly/monthly and rolling-24h rankings from time buckets
+
+    Every score delta lands in the current hour bucket and, write-through, in
+    the current day, week and month rankings, so windowed top-N reads are
+    slices of precomputed tables. A rolling 24h ranking is kept by adding
+    deltas as they arrive and subtracting whole hour buckets as they age out.
+    Only the newest ``keep_buckets`` calendar buckets and ``keep_hours`` hour
+    buckets are retained per scope, so memory is bounded however long the bot
+    runs.
+    """
+
+    CALENDAR_WINDOWS = ("day", "week", "month")
+
+    def __init__(self, path: str, keep_hours: int = 24, keep_buckets: int = 2):
+        self.path = path
+        self.keep_hours = keep_hours
+        self.keep_buckets = keep_buckets
+        self.tables: Dict[Tuple[str, str, str], RankedCounter] = {}
+        self.hours: Dict[Tuple[str, int], Dict[str, int]] = {}
+        self.rolling: Dict[str, RankedCounter] = {}
+        self._dirty: Set[Tuple[str, str, str, str]] = set()
+        self._expired: List[Tuple[str, str, str]] = []
+        self._last_expire_hour = -1
+        self._db_lock = threading.Lock()
+        self._conn: Optional[sqlite3.Connection] = None
+
+    def _connect(self) -> sqlite3.Connection:
+        if self._conn is None:
+            self._conn = _open_db(
+                self.path,
+                "CREATE TABLE IF NOT EXISTS windowed_scores ("
+                " scope TEXT NOT NULL,"
+                " window TEXT NOT NULL,"
+                " bucket TEXT NOT NULL,"
+                " member TEXT NOT NULL,"
+                " score INTEGER NOT NULL,"
+                " PRIMARY KEY (scope, window, bucket, member))",
+            )
+        return self._conn
+
+    def load(self, now: float):
+        """Load stored buckets and rebuild the rolling window (blocking, run off-loop)"""
+        with self._db_lock:
+            rows = self._connect().execute(
+                "SELECT scope, window, bucket, member, score FROM windowed_scores").fetchall()
+        grouped: Dict[Tuple[str, str, str], Dict[str, int]] = {}
+        for scope, window, bucket, member, score in rows:
+            grouped.setdefault((scope, window, bucket), {})[member] = score
+        tables: Dict[Tuple[str, str, str], RankedCounter] = {}
+        hours: Dict[Tuple[str, int], Dict[str, int]] = {}
+        for (scope, window, bucket), scores in grouped.items():
+            if window == "hour":
+                hours[(scope, int(bucket))] = scores
+            else:
+                tables[(scope, window, bucket)] = RankedCounter(scores)
+        rolling: Dict[str, RankedCounter] = {}
+        for (scope, _), scores in hours.items():
+            table = rolling.setdefault(scope, RankedCounter())
+            for member, score in scores.items():
+                table.add(member, score)
+        self.tables, self.hours, self.rolling = tables, hours, rolling
+        self._last_expire_hour = -1
+        self.expire(now)
+
+    def record(self, member: str, points: int, scopes: Iterable[str], ts: float):
+        """Add a score delta at time ``ts`` to every window of each scope"""
+        ids = bucket_ids(ts)
+        hour = int(ids["hour"])
+        for scope in scopes:
+            bucket = self.hours.setdefault((scope, hour), {})
+            bucket[member] = bucket.get(member, 0) + points
+            self._dirty.add((scope, "hour", ids["hour"], member))
+            rolling = self.rolling.get(scope)
+            if rolling is None:
+                rolling = self.rolling[scope] = RankedCounter()
+            rolling.add(member, points)
+            for window in self.CALENDAR_WINDOWS:
+                key = (scope, window, ids[window])
+                table = self.tables.get(key)
+                if table is None:
+                    table = self.tables[key] = RankedCounter()
+                table.add(member, points)
+                self._dirty.add((scope, window, ids[window], member))
+
+    def expire(self, now: float):
+        """Drop hour buckets older than the rolling window and stale calendar buckets"""
+        current_hour = int(now // 3600)
+        if current_hour == self._last_expire_hour:
+            return
+        self._last_expire_hour = current_hour
+        oldest = current_hour - self.keep_hours + 1
+        for scope, hour in [k for k in self.hours if k[1] < oldest]:
+            scores = self.hours.pop((scope, hour))
+            rolling = self.rolling.get(scope)
+            if rolling is not None:
+                for member, score in scores.items():
+                    if rolling.add(member, -score) <= 0:
+                        rolling.remove(member)
+                if not rolling:
+                    del self.rolling[scope]
+            self._expired.append((scope, "hour", str(hour)))
+        by_series: Dict[Tuple[str, str], List[str]] = {}
+        for scope, window, bucket in self.tables:
+            by_series.setdefault((scope, window), []).append(bucket)
+        for (scope, window), buckets in by_series.items():
+            buckets.sort()
+            for bucket in buckets[:-self.keep_buckets]:
+                del self.tables[(scope, window, bucket)]
+                self._expired.append((scope, window, bucket))
+
+    def top(self, scope: str, window: str, now: float, n: int = 10) -> List[Tuple[str, int]]:
+        """Top ``n`` for the current bucket of ``window`` ("24h", "day", "week", "month")"""
+        if window == "24h":
+            table = self.rolling.get(scope)
+        else:
+            table = self.tables.get((scope, window, bucket_ids(now)[window]))
+        return table.top(n) if table else []
+
+    def clear(self):
+        """Drop every bucket in memory (call on the loop)"""
+        self.tables, self.hours, self.rolling = {}, {}, {}
+        self._dirty, self._expired = set(), []
+
+    def delete_stored(self):
+        """Delete every stored bucket (blocking, run off-loop)"""
+        with self._db_lock:
+            conn = self._connect()
+            with conn:
+                conn.execute("DELETE FROM windowed_scores")
+
+    def take_changes(self) -> Tuple[List[Tuple[str, str, str, str, int]], List[Tuple[str, str, str]]]:
+        """Changed rows and expired buckets since the last call (call on the loop)"""
+        dirty, self._dirty = self._dirty, set()
+        expired, self._expired = self._expired, []
+        rows = []
+        for scope, window, bucket, member in dirty:
+            if window == "hour":
+                scores = self.hours.get((scope, int(bucket)))
+                score = scores.get(member) if scores else None
+            else:
+                table = self.tables.get((scope, window, bucket))
+                score = table.scores.get(member) if table else None
+            if score is not None:
+                rows.append((scope, window, bucket, member, score))
+        return rows, expired
+
+    def write_changes(self, rows: List[Tuple[str, str, str, str, int]], expired: List[Tuple[str, str, str]]):
+        """Persist changed rows and delete expired buckets (blocking, run off-loop)"""
+        if not rows and not expired:
+            return
+        with self._db_lock:
+            conn = self._connect()
+            with conn:
+                conn.executemany(
+                    "INSERT OR REPLACE INTO windowed_scores (scope, window, bucket, member, score) VALUES (?, ?, ?, ?, ?)",
+                    rows,
+                )
+                conn.executemany(
+                    "DELETE FROM windowed_scores WHERE scope = ? AND window = ? AND bucket = ?", expired)
+
+
+__all__ = [
+    'RankedCounter', 'PartitionedLeaderboards', 'WindowedLeaderboards', 'current_season',
+    'guild_partition', 'channel_partition', 'season_partition', 'bucket_ids',
+]
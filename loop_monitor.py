@@ -0,0 +1,169 @@
+"""
+Event loop lag watchdog and sampling profiler for Word Chain Game Discord Bot
+"""
+
+import os
+import sys
+import time
+import asyncio
+import threading
+from collections import Counter
+from typing import Dict, List, Optional
+
+
+def _frame_label(frame) -> str:
+    """Short flamegraph label for a frame: function (file:line)"""
+    code = frame.f_code
+    return f"{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})"
+
+
+def _folded_stack(frame) -> str:
+    """Collapse a frame chain into a root-first 'a;b;c' stack"""
+    labels: List[str] = []
+    while frame is not None:
+        labels.append(_frame_label(frame))
+        frame = frame.f_back
+    labels.reverse()
+    return ";".join(labels)
+
+
+def _format_stack(frame, limit: int = 12) -> str:
+    """Format the innermost frames of a stack, newest last"""
+    lines: List[str] = []
+    while frame is not None and len(lines) < limit:
+        code = frame.f_code
+        lines.append(f"  {code.co_filename}:{frame.f_lineno} in {code.co_name}")
+        frame = frame.f_back
+    lines.reverse()
+    return "\n".join(lines)
+
+
+class LoopLagWatchdog:
+    """Measure event loop scheduling lag and sample the code that blocks it
+
+    An async heartbeat task sleeps for ``interval`` seconds and records how late
+    it wakes up. A daemon thread watches the heartbeat; once it is more than
+    ``threshold_ms`` overdue (older than ``interval + threshold``) the loop is
+    blocked, so the thread grabs the loop thread's stack and the running task
+    name while the blocking code is still on the stack.
+    """
+
+    def __init__(self, threshold_ms: float = 100.0, interval: float = 0.25):
+        self.threshold = threshold_ms / 1000.0
+        self.interval = interval
+        self.max_lag = 0.0
+        self.stalls = 0
+        self._heartbeat = time.monotonic()
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._loop_thread_id: Optional[int] = None
+        self._sample: Optional[str] = None
+        self._sample_handler: Optional[str] = None
+        self._stopped = threading.Event()
+        self._task: Optional[asyncio.Task] = None
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self):
+        """Start the heartbeat task and the watchdog thread (call from the loop)"""
+        if self._task is not None:
+            return
+        self._loop = asyncio.get_running_loop()
+        self._loop_thread_id = threading.get_ident()
+        self._heartbeat = time.monotonic()
+        self._stopped.clear()
+        self._task = asyncio.create_task(self._run(), name="loop-lag-watchdog")
+        self._thread = threading.Thread(target=self._watch, name="loop-lag-watchdog", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        """Stop the watchdog"""
+        self._stopped.set()
+        if self._task is not None:
+            self._task.cancel()
+            self._task = None
+
+    def _running_handler(self) -> str:
+        """Name of the task currently executing on the loop"""
+        try:
+            task = asyncio.current_task(self._loop)
+        except RuntimeError:
+            task = None
+        if task is None:
+            return "<loop callback>"
+        coro = task.get_coro()
+        qualname = getattr(coro, "__qualname__", None) or repr(coro)
+        return f"{task.get_name()} [{qualname}]"
+
+    def _watch(self):
+        """Watchdog thread body: sample the loop thread once per stall"""
+        poll = max(self.threshold / 2.0, 0.005)
+        while not self._stopped.wait(poll):
+            stale = time.monotonic() - self._heartbeat
+            if stale <= self.interval + self.threshold or self._sample is not None:  # an idle sleep is not a stall
+                continue
+            frame = sys._current_frames().get(self._loop_thread_id)
+            if frame is None:
+                continue
+            self._sample_handler = self._running_handler()
+            self._sample = _format_stack(frame)
+
+    async def _run(self):
+        """Heartbeat task body: measure how late each wake-up is"""
+        loop = asyncio.get_running_loop()
+        while True:
+            started = loop.time()
+            self._heartbeat = time.monotonic()
+            await asyncio.sleep(self.interval)
+            lag = loop.time() - started - self.interval
+            self._heartbeat = time.monotonic()
+            self.max_lag = max(self.max_lag, lag)
+            if lag >= self.threshold:
+                self.stalls += 1
+                handler = self._sample_handler or "<unknown>"
+                print(f"Event loop blocked for {lag * 1000:.0f}ms in {handler}")
+                if self._sample:
+                    print(self._sample)
+            self._sample = None
+            self._sample_handler = None
+
+    def stats(self) -> Dict[str, float]:
+        """Summary of lag observed so far"""
+        return {"stalls": self.stalls, "max_lag_ms": round(self.max_lag * 1000, 1)}
+
+
+class SamplingProfiler:
+    """Sample one thread's stacks and write folded (flamegraph) output
+
+    Output is one ``frame;frame;frame count`` line per unique stack, which
+    flamegraph.pl, speedscope and inferno read directly.
+    """
+
+    def __init__(self, thread_id: int, interval: float = 0.005):
+        self.thread_id = thread_id
+        self.interval = interval
+
+    def collect(self, seconds: float) -> Counter:
+        """Sample the target thread for ``seconds`` (blocking, run off-loop)"""
+        stacks: Counter = Counter()
+        deadline = time.monotonic() + seconds
+        while time.monotonic() < deadline:
+            frame = sys._current_frames().get(self.thread_id)
+            if frame is not None:
+                stacks[_folded_stack(frame)] += 1
+            time.sleep(self.interval)
+        return stacks
+
+    def write(self, stacks: Counter, path: str) -> str:
+        """Write folded stacks to ``path``"""
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        with open(path, "w", encoding="utf-8") as f:
+            for stack, count in stacks.most_common():
+                f.write(f"{stack} {count}\n")
+        return path
+
+    async def profile(self, seconds: float, path: str) -> str:
+        """Sample for a time window without blocking the loop, then write ``path``"""
+        stacks = await asyncio.to_thread(self.collect, seconds)
+        return await asyncio.to_thread(self.write, stacks, path)
+
+
+__all__ = ['LoopLagWatchdog', 'SamplingProfiler']
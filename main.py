@@ -1,18 +1,47 @@
 import os  # ใช้อ่าน env และไฟล์
-import json  # เก็บ/อ่านคะแนน
 import asyncio  # ใช้ task / lock / to_thread
 import time  # ใช้ cooldown timing
+import threading  # ใช้ระบุ thread ของ event loop ให้ profiler
+import functools  # wraps ของ decorator คำสั่ง
 from dataclasses import dataclass, field  # โครงสร้าง state
-from typing import Dict, List, Set, Optional, Tuple  # type hints
+from typing import Any, Awaitable, Callable, Dict, List, Set, Optional, Tuple  # type hints
+
+PROCESS_START = time.perf_counter()  # เวลาเริ่ม process (ใช้รายงาน startup)
 
 import discord  # discord api
 from discord.ext import commands  # command framework
+from discord import app_commands  # slash command
 from dotenv import load_dotenv  # โหลด .env
 import aiohttp  # http client แบบ async
-from openai import OpenAI  # ใช้ OpenRouter (ผ่าน OpenAI SDK)
 import discord.utils  # สำหรับ escape markdown
-
-from config import config  # โหลดการตั้งค่า (ต้องมีในโปรเจกต์ของน้อง)
+import discord.state  # ConnectionState (ไม่เดินเข้า cache ของ client ตอนวัด memory)
+
+from config import config, GameConfig, CONFIG_FILE  # โหลดการตั้งค่า (config = store ที่สลับ snapshot ได้)
+from config_watcher import FileWatcher  # เฝ้าไฟล์ config/words เพื่อ hot reload
+from loop_monitor import LoopLagWatchdog, SamplingProfiler  # ตรวจ event loop ค้าง + profiler
+from memory import MemoryInspector, format_bytes  # ขนาดโดยประมาณต่อโครงสร้าง + tracemalloc diff
+from tracing import create_tracer  # tracing ต่อ stage (opt-in)
+from startup import StartupPipeline  # startup แบบขนาน + ทำครั้งเดียวต่อ process
+from checkpoint import CheckpointStore, encode_snapshot, decode_snapshot  # checkpoint state เกมลง SQLite
+from history import HistoryStore  # เก็บ history เกมแบบ append-only
+from admission import AdmissionController  # กัน flood ต่อห้อง (token bucket + degraded mode)
+from actors import ActorRegistry  # mailbox ต่อห้อง (ทำทีละงาน ไม่ต้องใช้ lock)
+from score_sink import ScoreSink  # คะแนนรวมใน memory + เขียนไฟล์เบื้องหลัง
+from names import NameDirectory, DiscordNameResolver  # ชื่อสำหรับ leaderboard (LRU + SQLite + resolve เป็น batch)
+from roster import Roster  # ลำดับเทิร์นแบบวงแหวน (join/leave/เลื่อนตา O(1))
+from scheduler import DeadlineScheduler  # timer รวม (heap เดียว task เดียว)
+from tournament import Match, Tournament, BracketStore  # ทัวร์นาเมนต์
+from fuzzy import FuzzyIndex  # index สำหรับ "did you mean" ตอนคำผิด
+from events import EventBus, SpectatorServer  # feed สดสำหรับผู้ชม (pub/sub + SSE/WebSocket)
+from traffic import TrafficRecorder  # อัดข้อความขาเข้าไว้ replay วัด performance (opt-in)
+from chain_graph import ChainGraph, ChainCounts  # กราฟตัวอักษรต้น->ท้าย (ต่อคำได้ยากแค่ไหน)
+from chain_rules import ChainRule, RuleBook  # กติกาต่อคำแบบต่าง ๆ (index แยกต่อกติกา)
+from validation import ValidationPipeline, DictionarySource, GuildWordlistSource, SpellcheckerSource  # ตรวจคำหลายแหล่ง + LRU
+from languages import DictionaryRegistry, Language, get_language, load_language_graph  # กติกา + dictionary ต่อภาษา
+from leaderboards import (  # leaderboard แยก partition + ตามช่วงเวลา
+    PartitionedLeaderboards, WindowedLeaderboards, current_season,
+    guild_partition, channel_partition, season_partition,
+)
 
 
 # ---------------------------
@@ -20,13 +49,11 @@ from config import config  # โหลดการตั้งค่า (ต้
 # ---------------------------
 
 load_dotenv()  # โหลดค่าใน .env
-TOKEN = os.getenv("DISCORD_TOKEN")  # token ของบอท
-if not TOKEN:
-    raise ValueError("DISCORD_TOKEN is not set in .env file. Please provide a valid Discord bot token.")
+TOKEN = os.getenv("DISCORD_TOKEN")  # token ของบอท (ตรวจตอนรันจริงด้านล่าง)
 
 OPENROUTER_API_KEY = os.getenv("OPENROUTER_API_KEY")  # key สำหรับ OpenRouter
 if not OPENROUTER_API_KEY:
-    raise ValueError("OPENROUTER_API_KEY is not set in .env file. Please provide a valid OpenRouter API key.")
+    print("Warning: OPENROUTER_API_KEY is not set, AI players are disabled")  # ไม่มี key ก็เล่นได้ แค่ไม่มี AI
 
 OPENROUTER_API_BASE = "https://openrouter.ai/api/v1"  # base url ของ OpenRouter
 
@@ -41,35 +68,82 @@ def dynamic_prefix(bot: commands.Bot, message: discord.Message):  # ฟังก
     return config.command_prefix  # ใช้ prefix ปัจจุบันจาก config
 
 
-bot = commands.Bot(command_prefix=dynamic_prefix, intents=intents)  # สร้างบอทแบบ prefix เปลี่ยนได้
+def client_options(profile: str) -> Dict[str, Any]:  # ตัวเลือก cache ของ discord.py ตาม runtime profile
+    if profile != "lean":  # default: cache ตามปกติของ discord.py
+        return {"intents": intents}
+    lean = discord.Intents.none()  # เกมใช้แค่ข้อความ: ไม่รับ event (และไม่ cache) อย่างอื่น
+    lean.guilds = True  # guild/channel (ต้องมีเพื่อ get_channel และสิทธิ์)
+    lean.guild_messages = True  # ข้อความในห้อง
+    lean.dm_messages = True  # คำสั่งใน DM
+    lean.message_content = True  # อ่านคำที่พิมพ์
+    return {
+        "intents": lean,
+        "max_messages": None,  # ไม่ cache ข้อความ (แก้ข้อความเทิร์นผ่าน partial message)
+        "member_cache_flags": discord.MemberCacheFlags.none(),  # ไม่เก็บ member (author มากับข้อความอยู่แล้ว)
+        "chunk_guilds_at_startup": False,  # ไม่โหลดรายชื่อสมาชิกตอนเริ่ม
+    }
+
+
+bot = commands.Bot(command_prefix=dynamic_prefix, **client_options(config.runtime_profile))  # สร้างบอทแบบ prefix เปลี่ยนได้ (profile อ่านครั้งเดียวตอนเริ่ม)
+
+
+def build_openai_client(api_key: str) -> Any:  # สร้าง client OpenRouter ผ่าน OpenAI SDK
+    from openai import OpenAI  # import ตอนใช้จริง (SDK ใหญ่ ไม่ต้องโหลดถ้าไม่มี AI)
+    return OpenAI(
+        api_key=api_key,  # ใส่ key
+        base_url=OPENROUTER_API_BASE,  # ใส่ base url
+        default_headers={  # header แนะนำของ OpenRouter
+            "HTTP-Referer": "https://github.com/JonusNattapong/Word-Chain-Game",  # referer
+            "X-Title": "Word Chain Discord Bot",  # ชื่อแอป
+        },
+    )
 
 
-openai_client = OpenAI(  # สร้าง client OpenRouter ผ่าน OpenAI SDK
-    api_key=OPENROUTER_API_KEY,  # ใส่ key
-    base_url=OPENROUTER_API_BASE,  # ใส่ base url
-    default_headers={  # header แนะนำของ OpenRouter
-        "HTTP-Referer": "https://github.com/JonusNattapong/Word-Chain-Game",  # referer
-        "X-Title": "Word Chain Discord Bot",  # ชื่อแอป
-    },
-)
+openai_client: Optional[Any] = None  # client ปัจจุบัน (สร้างตอน AI เล่นครั้งแรก, สลับได้ตอน reload)
+openai_client_lock = threading.Lock()  # กันสร้าง client ซ้อน (ถูกเรียกจาก worker thread)
+
+
+def get_openai_client() -> Any:  # ดึง client (สร้างครั้งแรกแบบ lazy)
+    global openai_client  # ใช้ global
+    client = openai_client  # อ่านครั้งเดียว
+    if client is not None:  # มีแล้ว
+        return client  # คืน
+    with openai_client_lock:  # กันสร้างซ้อน
+        if openai_client is None:  # ยังไม่มีจริง ๆ
+            openai_client = build_openai_client(OPENROUTER_API_KEY)  # สร้าง
+        return openai_client  # คืน
 
-SCORES_FILE: str  # ไฟล์คะแนนรวม (จะกำหนดใน on_ready และ reload_config)
-scores_data: Dict[str, int] = {}  # {"user_id": score} และ {"ai_name": score}
-scores_lock = asyncio.Lock()  # กันการเขียนไฟล์ชนกัน
+score_sink = ScoreSink(config.scores_file, flush_interval=config.scores_flush_interval)  # {"user_id": score} และ {"ai_name": score} (ไม่ block ตอนให้คะแนน)
+leaderboards = PartitionedLeaderboards(config.partitions_file)  # คะแนนแยก global/guild/channel/season (เรียงไว้แล้ว)
+windowed_leaderboards = WindowedLeaderboards(config.partitions_file)  # คะแนนรายวัน/สัปดาห์/เดือน/24 ชม. (bucket)
+leaderboard_lock = asyncio.Lock()  # flush กับ reset ไม่ซ้อนกัน
 
-ai_display_names: Dict[str, str] = {}  # {"ai_key": "display_name"} สำหรับ leaderboard
+names = NameDirectory(config.names_file, cache_size=config.names_cache_size, negative_ttl=config.names_negative_ttl)  # {score key: display name} (จำกัดขนาดใน memory, เก็บถาวรใน SQLite)
+name_resolver = DiscordNameResolver(bot)  # หาชื่อที่ไม่รู้จักจาก cache ของ discord แล้วค่อย REST
+event_bus = EventBus(queue_size=config.spectator_queue_size)  # event ของเกม -> คิวของผู้ชมแต่ละคน (publish ไม่เคย await)
+spectator_server = SpectatorServer(  # เสิร์ฟ event_bus ผ่าน SSE/WebSocket (เปิดเมื่อ spectator_enabled)
+    event_bus, config.spectator_host, config.spectator_port, max_subscribers=config.spectator_max_subscribers,
+)
+traffic_recorder = (  # อัดข้อความขาเข้า (id เป็น alias) ไว้ replay ด้วย traffic-replay.py
+    TrafficRecorder(config.traffic_capture_file, config.traffic_capture_max_bytes) if config.traffic_capture_file else None
+)
 not_your_turn_cooldowns: Dict[int, float] = {}  # quiet cooldown สำหรับ "not your turn" messages
-user_display_names: Dict[int, str] = {}  # {user_id: display_name} สำหรับ leaderboard
 
-VALID_WORDS: Set[str] = set()  # ชุดคำอังกฤษที่ถูกต้อง (โหลดจากไฟล์)
+EMPTY_GRAPH = ChainGraph(())  # ใช้ตอน dictionary ของภาษายังไม่โหลด
 valid_words_lock = asyncio.Lock()  # กัน reload words พร้อมกัน
+reload_lock = asyncio.Lock()  # กัน reload config พร้อมกัน
+config_watcher: Optional[FileWatcher] = None  # watcher ของ config.json / words file
 
 http_session: Optional[aiohttp.ClientSession] = None  # session รวมทั้งบอท
 
 # Additional locks for thread safety
 games_lock = asyncio.Lock()  # กันการเข้าถึง games dict ชนกัน
 cooldowns_lock = asyncio.Lock()  # กันการเข้าถึง cooldowns dict ชนกัน
-display_names_lock = asyncio.Lock()  # กันการเข้าถึง display names dict ชนกัน
+
+loop_watchdog: Optional[LoopLagWatchdog] = None  # watchdog วัด lag ของ event loop
+tracer = create_tracer(config.trace_sample_rate, config.trace_file, config.trace_otlp_endpoint)  # tracer (ปิดถ้า sample rate = 0)
+deadline_scheduler = DeadlineScheduler()  # timer ที่แค่เรียกฟังก์ชันทีหลัง (แมตช์ทัวร์นาเมนต์, สรุป join/leave) อยู่ใน heap เดียว
+actors = ActorRegistry(idle_timeout=config.actor_idle_timeout, tracer=tracer)  # actor ต่อห้อง: คำ / timeout / AI / roster เข้าคิวเดียวกัน
 
 
 # ---------------------------
@@ -80,17 +154,20 @@ display_names_lock = asyncio.Lock()  # กันการเข้าถึง d
 class GameState:  # state ของเกมใน 1 ห้อง
     active: bool = False  # เกมกำลังเล่นอยู่ไหม
 
-    players: List[int] = field(default_factory=list)  # ลิสต์ user_id (human)
-    ai_players: List[str] = field(default_factory=list)  # ลิสต์ชื่อ AI
+    roster: Roster = field(default_factory=Roster)  # ผู้เล่นทั้งหมด (user_id = human, ชื่อ = AI) + คนที่ถึงตา
     player_names: Dict[int, str] = field(default_factory=dict)  # {user_id: display_name}
+    roster_joined: List[str] = field(default_factory=list)  # ชื่อที่ join ตั้งแต่สรุปครั้งก่อน (ห้องคนเยอะ)
+    roster_left: List[str] = field(default_factory=list)  # ชื่อที่ออกตั้งแต่สรุปครั้งก่อน
+    roster_flush: Optional[list] = None  # entry ใน scheduler ของการสรุปรอบถัดไป
 
-    current_idx: int = 0  # index ของคนที่ถึงตา (รวม human + AI)
     word_chain: List[str] = field(default_factory=list)  # ลำดับคำ
     used_words: Set[str] = field(default_factory=set)  # กันคำซ้ำ
 
     turn_seconds: int = field(default_factory=lambda: config.turn_seconds)  # เวลาต่อเทิร์น (ต่อห้อง)
+    language: str = field(default_factory=lambda: config.default_language)  # ภาษาของห้อง (ตั้งด้วย !language)
+    rule: str = field(default_factory=lambda: config.default_chain_rule)  # กติกาต่อคำของห้อง (ตั้งด้วย !rule)
     turn_task: Optional[asyncio.Task] = None  # task นับถอยหลังต่อเทิร์น
-    turn_message: Optional[discord.Message] = None  # message เทิร์น (แก้ progress bar)
+    turn_message_id: Optional[int] = None  # id ของ message เทิร์น (แก้ progress bar ผ่าน partial message ไม่ต้องถือทั้ง object)
 
     player_streaks: Dict[int, int] = field(default_factory=dict)  # streak ต่อคน
     combo_count: int = 0  # combo ต่อห้อง
@@ -100,12 +177,20 @@ class GameState:  # state ของเกมใน 1 ห้อง
     adding_ais: Set[str] = field(default_factory=set)  # กัน add_ai ซ้อน
 
     turn_token: int = 0  # token เพิ่มทุกเทิร์น กัน AI/Timer ยิงซ้อน (race condition)
+    turn_deadline: float = 0.0  # เวลา (epoch) ที่เทิร์นปัจจุบันหมด (ใช้ตอน checkpoint/resume)
 
-    # Lock for thread-safe state modifications
-    _lock: asyncio.Lock = field(default_factory=asyncio.Lock)
+    started_at: float = 0.0  # เวลาเริ่มเกมรอบนี้ (history)
+    turn_log: List[list] = field(default_factory=list)  # [ts, player_key, word|None, pts, long, streak, combo, difficulty] ต่อเทิร์น
+    chain_counts: Optional[ChainCounts] = None  # คำที่ยังต่อได้ต่อตัวอักษร (สร้างจาก used_words แบบ lazy, ไม่เก็บลง checkpoint)
 
 
 games: Dict[int, GameState] = {}  # {channel_id: GameState}
+history_store = HistoryStore(config.history_dir, flush_interval=config.history_flush_interval)  # history เกมที่จบแล้ว
+
+checkpoint_store = CheckpointStore(config.checkpoint_file)  # ที่เก็บ checkpoint
+pending_restore: Dict[int, bytes] = {}  # {channel_id: snapshot ที่ยังไม่ decode} (restore แบบ lazy)
+resume_channels: List[int] = []  # ห้องที่เกม active ตอนปิดบอท (ต้องเดิน timer ต่อ)
+checkpoint_fingerprints: Dict[int, tuple] = {}  # fingerprint ล่าสุดที่เซฟแล้ว ต่อห้อง
 
 
 # --------------------------- Helper functions for safe state access ---------------------------
@@ -115,60 +200,118 @@ async def update_state_activity(state: GameState):
     state._last_activity = time.time()
 
 
-async def with_state_lock(state: GameState, func):
-    """Execute a function with state lock held"""
-    async with state._lock:
-        await update_state_activity(state)
-        return await func()
+# ---------------------------
+# Persistence (scores)
+# ---------------------------
+
+def load_scores_and_leaderboards():  # โหลดคะแนนรวม แล้วสร้าง partition (sync, รันใน thread)
+    score_sink.load()  # scores.json
+    leaderboards.load(score_sink.scores)  # partition จาก SQLite + global จาก scores.json
+    windowed_leaderboards.load(time.time())  # bucket ตามเวลา (ตัดของเก่าทิ้งตอนโหลด)
+
 
+def active_season() -> str:  # season ปัจจุบัน (config หรือไตรมาสปัจจุบัน)
+    return config.season or current_season()  # เช่น 2026-Q4
 
-def with_state_lock_sync(state: GameState, func):
-    """Execute a synchronous function with state lock held (use with caution)"""
-    # Note: This is not truly thread-safe for sync functions, but provides basic protection
-    # For full thread safety, all state modifications should be async
-    state._last_activity = time.time()
-    return func()
 
+async def flush_leaderboards():  # เขียนแถวที่เปลี่ยนลง SQLite + หมดอายุ bucket เก่า
+    async with leaderboard_lock:  # ไม่เขียนแถวที่หยิบไว้ก่อน reset ทับหลัง DELETE
+        rows = leaderboards.take_dirty()  # ค่าล่าสุดของแถวที่เปลี่ยน (บน loop)
+        if rows:  # มีของต้องเขียน
+            await asyncio.to_thread(leaderboards.write_rows, rows)  # เขียนใน thread
+        windowed_leaderboards.expire(time.time())  # ตัด bucket ที่หลุดช่วง (ทำจริงเมื่อขึ้นชั่วโมงใหม่)
+        window_rows, expired = windowed_leaderboards.take_changes()  # แถวที่เปลี่ยน + bucket ที่หมดอายุ
+        if window_rows or expired:  # มีของต้องเขียน
+            await asyncio.to_thread(windowed_leaderboards.write_changes, window_rows, expired)  # เขียนใน thread
 
-# ---------------------------
-# Persistence (scores)
-# ---------------------------
 
-def load_scores_sync():  # โหลดคะแนนแบบ sync ตอนเริ่ม
-    global scores_data  # ใช้ dict กลาง
-    try:  # กันไฟล์ไม่มี/พัง
-        with open(SCORES_FILE, "r", encoding="utf-8") as f:  # เปิดไฟล์
-            data = json.load(f)  # อ่าน json
-            scores_data = data if isinstance(data, dict) else {}  # กัน format แปลก
-    except FileNotFoundError:  # ครั้งแรกยังไม่มี
-        scores_data = {}  # เริ่มใหม่
-    except json.JSONDecodeError:  # ไฟล์เสีย
-        scores_data = {}  # รีเซ็ต
+async def reset_leaderboards():  # ล้างทุก partition + bucket (memory บน loop, SQLite ใน thread)
+    async with leaderboard_lock:  # รอ flush ที่กำลังเขียนอยู่ให้จบก่อน
+        leaderboards.clear()  # ล้างใน memory บน loop (record() แก้ของชุดเดียวกันบน loop)
+        windowed_leaderboards.clear()
+        await asyncio.to_thread(leaderboards.delete_stored)  # ลบใน SQLite
+        await asyncio.to_thread(windowed_leaderboards.delete_stored)
 
 
-async def save_scores_async():  # เซฟคะแนนแบบ async + lock + atomic
-    async with scores_lock:  # กันชนกัน
-        tmp_file = SCORES_FILE + ".tmp"  # เขียนไปไฟล์ชั่วคราวก่อน
-        with open(tmp_file, "w", encoding="utf-8") as f:  # เขียน tmp
-            json.dump(scores_data, f, indent=4, ensure_ascii=False)  # เซฟ json
-        os.replace(tmp_file, SCORES_FILE)  # atomic replace
+async def leaderboard_flush_loop():  # flush partition เป็นระยะ
+    while True:
+        await asyncio.sleep(5)  # ทุก 5 วินาที
+        try:
+            await flush_leaderboards()  # เขียน
+            await names.flush()  # ชื่อใหม่ลง SQLite (batch)
+        except Exception as e:
+            print(f"Leaderboard flush error: {e}")  # log
 
 
 # ---------------------------
 # Word list
 # ---------------------------
 
-async def load_valid_words_async():  # โหลดคำอังกฤษจากไฟล์แบบ async-safe
-    global VALID_WORDS  # ใช้ global
+def dictionary_path(code: str, cfg: Any = config) -> str:  # ไฟล์ dictionary ของภาษา (ภาษา default ใช้ words_file)
+    if code == cfg.default_language:  # ภาษาหลัก
+        return cfg.words_file  # words.txt เดิม
+    return os.path.join(cfg.words_dir, f"{code}.txt")  # ภาษาอื่น: <words_dir>/<code>.txt
+
+
+dictionaries = DictionaryRegistry(dictionary_path)  # dictionary ต่อภาษา (โหลดเมื่อมีห้องใช้, แชร์ทุกห้อง)
+rulebook = RuleBook(config.rule_escalation_step, config.rule_escalation_max)  # กติกาต่อคำ + index ที่สร้างจาก dictionary
+
+
+def themes_dir(cfg: Any = config) -> str:  # ไฟล์หมวดคำ: <words_dir>/themes/<ภาษา>/<หมวด>.txt
+    return os.path.join(cfg.words_dir, "themes")
+
+
+def load_themes_sync():  # โหลดหมวดคำทุกภาษา (ไฟล์เล็ก, รันใน thread ตอน startup/reload)
+    count = rulebook.load_themes(themes_dir(), [get_language(code) for code in dictionaries.codes(config.words_dir) + [config.default_language]])  # ทุกภาษาที่มี dictionary
+    if count:
+        print(f"Loaded {count} word themes")  # log
+
+
+def dictionary_missing(language: str) -> bool:  # ไม่มี dictionary ของภาษานี้ (ใช้ตัดสินว่าจะ fallback ไป spellchecker)
+    graph = dictionaries.peek(language)  # โหลดแล้วหรือยัง
+    return not dictionaries.available(language) or (graph is not None and len(graph) == 0)  # ไม่มีไฟล์ หรือไฟล์ว่าง
+
+
+def build_validation_pipeline(cfg: GameConfig) -> ValidationPipeline:  # สร้าง pipeline ตามลำดับใน validation_sources
+    sources = []  # แหล่งตรวจคำตามลำดับ
+    for name in (n.strip() for n in cfg.validation_sources.split(",")):
+        if name == "local":
+            sources.append(DictionarySource(dictionaries))  # dictionary ของภาษาห้องนั้น
+        elif name == "guild":
+            sources.append(GuildWordlistSource(cfg.guild_wordlists_dir))  # คำเพิ่มต่อ server
+        elif name == "spellchecker":
+            sources.append(SpellcheckerSource())  # pyspellchecker ทุกครั้ง
+        elif name:
+            print(f"Warning: unknown validation source '{name}' ignored")  # ชื่อผิด
+    if cfg.spellcheck_fallback and not any(isinstance(s, SpellcheckerSource) for s in sources):
+        sources.append(SpellcheckerSource(when=dictionary_missing))  # ใช้เฉพาะตอนไม่มี dictionary ของภาษานั้น
+    return ValidationPipeline(sources, cache_size=cfg.validation_cache_size)  # LRU ผลลัพธ์ทั้งถูกและผิด
+
+
+word_validator = build_validation_pipeline(config.snapshot())  # pipeline ตรวจคำปัจจุบัน (สร้างใหม่ตอน reload)
+
+
+def build_admission(cfg: GameConfig) -> AdmissionController:  # สร้างตัวกัน flood ตาม config
+    return AdmissionController(
+        user_rate=cfg.admission_user_rate,
+        user_burst=cfg.admission_user_burst,
+        channel_rate=cfg.admission_channel_rate,
+        channel_burst=cfg.admission_channel_burst,
+        degraded_seconds=cfg.admission_degraded_seconds,
+        reply_cooldown=cfg.rejection_reply_cooldown,
+        reply_rate=cfg.admission_reply_rate,
+        reply_burst=cfg.admission_reply_burst,
+    )
+
+
+admission = build_admission(config.snapshot())  # bucket ต่อ user/ห้อง (สร้างใหม่ตอน reload)
+
+
+async def load_valid_words_async():  # โหลด dictionary ของภาษาหลักแบบไม่ block loop (ภาษาอื่นโหลดเมื่อใช้)
     async with valid_words_lock:  # กันโหลดซ้อน
-        try:  # กันไฟล์ไม่มี
-            with open(config.words_file, "r", encoding="utf-8") as f:  # อ่านไฟล์
-                words = [line.strip().lower() for line in f if line.strip()]  # normalize
-            VALID_WORDS = set(words)  # set lookup เร็ว
-            print(f"Loaded {len(VALID_WORDS)} valid words")  # log
-        except FileNotFoundError:  # ถ้าไม่มีไฟล์
-            VALID_WORDS = set()  # ว่างไว้ แล้ว fallback ไป spellchecker
-            print("Warning: words file not found, using spellchecker fallback")  # แจ้งเตือน
+        await asyncio.to_thread(dictionaries.load, config.default_language)  # อ่าน + สร้าง index ใน thread
+        word_validator.clear_cache()  # ผลเก่าอิง dictionary เดิม
+    fuzzy_index_for(config.default_language)  # เริ่มสร้าง index คำแนะนำเบื้องหลัง
 
 
 # ---------------------------
@@ -180,10 +323,23 @@ def get_game(channel_id: int) -> GameState:  # ดึง state ตามห้
     # Note: This is a synchronous function, so we can't use async lock here
     # We'll rely on the fact that dict access is atomic in CPython for simple operations
     if channel_id not in games:  # ถ้ายังไม่มีให้สร้าง
-        games[channel_id] = GameState()  # init
+        blob = pending_restore.pop(channel_id, None)  # มี checkpoint ค้างไหม
+        games[channel_id] = restore_state(decode_snapshot(blob)) if blob else GameState()  # restore หรือ init
     return games[channel_id]  # คืน state
 
 
+def is_stale_game(state: GameState, now: float) -> bool:  # เกมไม่ active และไม่ได้ใช้งานมานาน (>24 ชั่วโมง)
+    return not state.active and hasattr(state, '_last_activity') and now - state._last_activity > 86400
+
+
+async def remove_stale_game(channel_id: int, now: float) -> bool:  # ลบ state ใน actor ของห้อง (ไม่มี handler ที่คิวไว้ถือ state นี้อยู่)
+    state = games.get(channel_id)
+    if state is None or not is_stale_game(state, now):  # มีคนเล่นต่อระหว่างรอคิว
+        return False
+    del games[channel_id]
+    return True
+
+
 async def cleanup_inactive_games():  # เคลียร์เกมที่ไม่ได้ใช้มานาน
     """Periodically clean up inactive games to prevent memory leaks"""
     while True:
@@ -192,35 +348,31 @@ async def cleanup_inactive_games():  # เคลียร์เกมที่
             current_time = time.time()
 
             async with games_lock:
-                channels_to_remove = []
-                for channel_id, state in games.items():
-                    # ถ้าเกมไม่ active และไม่ได้ใช้งานมานาน (>24 ชั่วโมง)
-                    if not state.active and hasattr(state, '_last_activity'):
-                        if current_time - state._last_activity > 86400:  # 24 ชั่วโมง
-                            channels_to_remove.append(channel_id)
-
-                for channel_id in channels_to_remove:
-                    del games[channel_id]
+                channels_to_remove = [channel_id for channel_id, state in games.items() if is_stale_game(state, current_time)]
+
+            for channel_id in channels_to_remove:
+                if await actors.get(channel_id).ask(remove_stale_game, channel_id, current_time):  # ต่อคิวหลัง handler ที่ค้างอยู่
+                    actors.discard(channel_id)  # ทิ้ง actor + mailbox ของห้อง (ถ้าไม่มีงานใหม่เข้ามา)
                     print(f"Cleaned up inactive game for channel {channel_id}")
 
+            admission.prune()  # ลืม bucket ที่เต็มแล้ว (ผู้ใช้ที่เงียบไป)
+
         except Exception as e:
             print(f"Error in cleanup task: {e}")
             await asyncio.sleep(60)  # รอแล้วลองใหม่
 
 
 def total_players(state: GameState) -> int:  # จำนวนผู้เล่นทั้งหมด
-    return len(state.players) + len(state.ai_players)  # human + AI
+    return len(state.roster)  # human + AI
 
 
 def current_player_info(state: GameState) -> Tuple[Optional[int], Optional[str]]:  # (user_id, ai_name)
-    tp = total_players(state)  # จำนวนทั้งหมด
-    if tp == 0:  # ไม่มีผู้เล่น
+    member = state.roster.current  # คนที่ถึงตา
+    if member is None:  # ไม่มีผู้เล่น
         return None, None  # ไม่มีใคร
-    idx = state.current_idx % tp  # normalize index
-    if idx < len(state.players):  # อยู่ในช่วง human
-        return state.players[idx], None  # คืน user_id
-    ai_idx = idx - len(state.players)  # index ในลิสต์ AI
-    return None, state.ai_players[ai_idx]  # คืนชื่อ AI
+    if isinstance(member, str):  # AI เก็บเป็นชื่อ
+        return None, member  # คืนชื่อ AI
+    return member, None  # คืน user_id
 
 
 def peek_current_name(state: GameState) -> str:  # ชื่อคนที่ถึงตาตอนนี้
@@ -231,25 +383,134 @@ def peek_current_name(state: GameState) -> str:  # ชื่อคนที่
 
 
 def advance_turn(state: GameState):  # เลื่อนเทิร์นไปคนถัดไป
-    tp = total_players(state)  # จำนวนทั้งหมด
-    if tp <= 0:  # กันหารศูนย์
-        state.current_idx = 0  # รีเซ็ต
-        return  # จบ
-    state.current_idx = (state.current_idx + 1) % tp  # เลื่อน index
+    state.roster.advance()  # O(1) (ไม่มีผู้เล่นก็ไม่ทำอะไร)
+
 
+def state_language(state: GameState) -> Language:  # กติกาภาษาของห้อง
+    return get_language(state.language)  # en / th / ...
 
-def normalize_word(word: str) -> str:  # normalize คำ
-    return word.strip().lower()  # strip + lower
 
+def normalize_word(word: str, language: Language) -> str:  # normalize คำ
+    return language.normalize(word)  # NFC + casefold
 
-def is_valid_word_basic(word: str) -> bool:  # ตรวจรูปแบบคำ
-    return word.isalpha() and 3 <= len(word) <= 15  # ตัวอักษรล้วน และยาว 3-15 ตรงกับ AI
 
+def is_valid_word_basic(word: str, language: Language) -> bool:  # ตรวจรูปแบบคำ
+    return language.is_valid_basic(word)  # อังกฤษ: ตัวอักษรล้วน ยาว 3-15 ตรงกับ AI
 
-async def is_valid_english_word(word: str) -> bool:  # ตรวจคำอังกฤษ
-    if VALID_WORDS and word in VALID_WORDS:  # ถ้ามี wordlist และพบ
-        return True  # ผ่าน
-    return False  # ไม่ใช้ spell fallback เพื่อความเข้ม
+
+def state_rule(state: GameState) -> ChainRule:  # กติกาต่อคำของห้อง (ใช้ไม่ได้กับภาษานี้ -> classic)
+    language = state_language(state)  # ภาษาของห้อง
+    return rulebook.get(state.rule, language) or rulebook.get("classic", language)  # classic ใช้ได้ทุกภาษา
+
+
+def required_letter(state: GameState) -> Optional[str]:  # key ที่คำถัดไปต้องขึ้นต้น (None = คำแรก)
+    return state_rule(state).last(state_language(state), state.word_chain[-1]) if state.word_chain else None  # ตามกติกาของห้อง
+
+
+def required_length(state: GameState) -> int:  # ความยาวขั้นต่ำของเทิร์นนี้ (กติกา escalate เพิ่มขึ้นเรื่อย ๆ)
+    return state_rule(state).min_length(state_language(state), len(state.word_chain))  # ตามจำนวนคำใน chain
+
+
+async def is_valid_dictionary_word(word: str, language: str, guild_id: Optional[int] = None) -> bool:  # ตรวจคำใน dictionary
+    return await word_validator.check(word, guild_id, language) is not None  # แหล่งแรกที่ยอมรับ (cache ใน LRU)
+
+
+rule_builds: Dict[Tuple[str, str], asyncio.Task] = {}  # (ภาษา, กติกา) -> task ที่กำลังสร้าง index
+
+
+def start_rule_build(language: Language, rule: ChainRule, base: ChainGraph) -> asyncio.Task:  # สร้าง index ของกติกาใน thread (ครั้งเดียวต่อคู่)
+    key = (language.code, rule.key)  # ต่อภาษา + กติกา
+    task = rule_builds.get(key)  # มีคนสร้างอยู่แล้วไหม
+    if task is None:  # ยังไม่มี -> เริ่มสร้าง
+        task = rule_builds[key] = asyncio.create_task(asyncio.to_thread(rulebook.build_graph, language, rule, base), name=f"rule-index-{key[0]}-{key[1]}")
+
+        def done(t: asyncio.Task):  # เสร็จ/ล้มเหลว -> ให้สร้างใหม่ได้ถ้า dictionary เปลี่ยน
+            rule_builds.pop(key, None)
+            if not t.cancelled() and t.exception() is not None:
+                print(f"Rule index error for {key[0]}/{key[1]}: {t.exception()}")  # log
+        task.add_done_callback(done)
+    return task  # task เดิมหรือใหม่
+
+
+async def build_rule_graph(language: Language, rule: ChainRule, base: ChainGraph) -> ChainGraph:  # รอ index ของกติกา
+    return await asyncio.shield(start_rule_build(language, rule, base))  # รอร่วมกัน (คนหนึ่งยกเลิกไม่กระทบคนอื่น)
+
+
+def rule_graph_for(state: GameState) -> ChainGraph:  # index ของกติกาห้องนี้ (ยังไม่พร้อม -> สร้างเบื้องหลัง, ใช้กราฟว่างไปก่อน)
+    base = dictionaries.peek(state.language) or EMPTY_GRAPH  # dictionary ของภาษาห้องนี้
+    language, rule = state_language(state), state_rule(state)  # ภาษา + กติกา
+    graph = rulebook.peek_graph(language, rule, base)  # classic -> base เลย
+    if graph is None:  # ยังไม่ได้สร้าง (เช่น resume จาก checkpoint)
+        if len(base):  # มี dictionary แล้ว
+            start_rule_build(language, rule, base)  # สร้างใน thread
+        return EMPTY_GRAPH  # ระหว่างนี้ไม่มีใบ้/AI pick
+    return graph  # index ของกติกา
+
+
+def chain_counts_for(state: GameState) -> ChainCounts:  # จำนวนคำที่ยังต่อได้ของห้องนี้ (สร้างใหม่ถ้า dictionary/กติกาเปลี่ยน)
+    graph = rule_graph_for(state)  # index ของภาษา + กติกาห้องนี้
+    if state.chain_counts is None or state.chain_counts.graph is not graph:  # ยังไม่มี หรือกราฟเก่า
+        state.chain_counts = graph.counts(state.used_words)  # นับจากคำที่ใช้ไปแล้ว
+    return state.chain_counts  # คืน counts
+
+
+fuzzy_indexes: Dict[str, Tuple[ChainGraph, Optional[FuzzyIndex]]] = {}  # ภาษา -> (กราฟที่ใช้สร้าง, index หรือ None ถ้าสร้างไม่สำเร็จ)
+fuzzy_builds: Dict[str, asyncio.Task] = {}  # ภาษา -> task ที่กำลังสร้าง index
+fuzzy_available = True  # False เมื่อไม่มี numpy (ไม่ลองสร้างซ้ำ)
+
+
+def build_fuzzy_index_sync(graph: ChainGraph) -> FuzzyIndex:  # สร้าง index จากทุกคำในกราฟ (blocking, รันใน thread)
+    words = (word for bucket in graph.pairs.values() for word in bucket)  # ไม่ต้อง copy list ใหม่
+    return FuzzyIndex(words, prefix_length=config.fuzzy_prefix_length, max_entries=config.fuzzy_max_entries)  # index
+
+
+async def _build_fuzzy_index(code: str, graph: ChainGraph):  # สร้าง index ใน thread แล้วเก็บไว้
+    global fuzzy_available
+    try:
+        index = await asyncio.to_thread(build_fuzzy_index_sync, graph)  # ไม่ block loop
+    except ImportError as e:  # ไม่มี numpy -> ปิด suggestion
+        print(f"Warning: word suggestions disabled ({e})")
+        fuzzy_available = False  # ไม่ต้องลองใหม่
+        return
+    except Exception as e:  # สร้างไม่สำเร็จ -> ไม่มีคำแนะนำ แต่เกมเล่นต่อได้
+        print(f"Suggestion index error for {code}: {e}")
+        fuzzy_indexes[code] = (graph, None)  # ไม่ลองใหม่จนกว่า dictionary จะเปลี่ยน
+        return
+    finally:
+        fuzzy_builds.pop(code, None)  # ให้สร้างใหม่ได้ถ้ากราฟเปลี่ยนอีก
+    fuzzy_indexes[code] = (graph, index)  # เก็บคู่กับกราฟที่ใช้สร้าง
+    print(f"Suggestion index for {code}: {len(index)} words, {index.nbytes() / 1e6:.1f} MB in {index.build_seconds:.2f}s")
+
+
+def fuzzy_index_for(code: str) -> Optional[FuzzyIndex]:  # index ของภาษา (ยังไม่พร้อม -> เริ่มสร้างเบื้องหลังแล้วคืน None)
+    if not config.fuzzy_suggestions or not fuzzy_available:  # ปิดไว้ / ไม่มี numpy
+        return None
+    graph = dictionaries.peek(code)  # dictionary ที่โหลดอยู่
+    if graph is None or not len(graph):  # ยังไม่มี dictionary
+        return None
+    entry = fuzzy_indexes.get(code)  # index ที่มีอยู่
+    if entry is not None and entry[0] is graph:  # ตรงกับกราฟปัจจุบัน
+        return entry[1]
+    if code not in fuzzy_builds:  # ยังไม่มีใครสร้าง
+        fuzzy_builds[code] = asyncio.create_task(_build_fuzzy_index(code, graph), name=f"fuzzy-index-{code}")  # สร้างเบื้องหลัง
+    return None  # ครั้งนี้ยังไม่มีคำแนะนำ
+
+
+def suggest_words(state: GameState, word: str) -> List[str]:  # คำใน dictionary ที่ใกล้กับคำที่ผิด และยังเล่นได้
+    index = fuzzy_index_for(state.language)  # index ของภาษาห้องนี้
+    if index is None:  # ยังไม่พร้อม/ปิด
+        return []
+    language, rule = state_language(state), state_rule(state)  # กติกาภาษา + กติกาต่อคำ
+    need, min_len = required_letter(state), required_length(state)  # key ที่ต้องขึ้นต้น (None = คำแรก) + ความยาวขั้นต่ำ
+    accept = lambda c: (c not in state.used_words and len(c) >= min_len and rule.accept(language, c)
+                        and (need is None or rule.first(language, c) == need))  # ต้องเล่นได้จริง
+    return index.suggest(word, accept=accept)  # เรียงจากใกล้สุด
+
+
+def local_ai_word(state: GameState) -> Optional[str]:  # AI แบบ local: เลือกคำที่เหลือทางต่อให้คนถัดไปน้อยที่สุด (กับดัก)
+    letter = required_letter(state)  # ตัวที่ต้องขึ้นต้น
+    picks = chain_counts_for(state).pick(letter, state.used_words, trap=True, min_len=required_length(state))  # เรียงตามจำนวนทางต่อ
+    return picks[0] if picks else None  # ไม่มีคำเหลือ -> None
 
 
 def create_progress_bar(current: int, total: int, length: int = 10) -> str:  # สร้าง progress bar
@@ -263,9 +524,11 @@ def create_progress_bar(current: int, total: int, length: int = 10) -> str:  # 
 def build_turn_text(state: GameState, name: str, remaining: int) -> str:  # สร้างข้อความเทิร์นแบบ deterministic
     bar = create_progress_bar(remaining, state.turn_seconds, 10)  # progress bar
     if not state.word_chain:  # ยังไม่มีคำเริ่ม
-        return f"🎮 It's {name}'s turn! Start with any English word.\n{bar} ({remaining}s)"  # ข้อความเริ่ม
-    last_letter = state.word_chain[-1][-1]  # ตัวท้ายคำล่าสุด
-    return f"🎮 It's {name}'s turn! Word must start with '{last_letter}'.\n{bar} ({remaining}s)"  # ข้อความต่อคำ
+        return f"🎮 It's {name}'s turn! Start with any {state_language(state).name} word.\n{bar} ({remaining}s)"  # ข้อความเริ่ม
+    need = state_rule(state).requirement(required_letter(state))  # เงื่อนไขตามกติกาห้อง
+    min_len = required_length(state)  # ความยาวขั้นต่ำ
+    length = f" (at least {min_len} letters)" if min_len > state_language(state).min_len else ""  # escalate แล้ว -> บอกด้วย
+    return f"🎮 It's {name}'s turn! Word must {need}{length}.\n{bar} ({remaining}s)"  # ข้อความต่อคำ
 
 
 def sanitize_ai_key(ai_name: str) -> str:  # ทำชื่อ AI ให้ปลอดภัยเป็น key
@@ -293,6 +556,36 @@ async def cleanup_cooldowns_async():  # async version สำหรับ cleanup
         not_your_turn_cooldowns = {k: v for k, v in not_your_turn_cooldowns.items() if v > cutoff}
 
 
+def finalize_game_history(state: GameState, channel: discord.abc.Messageable, reason: str):  # ส่งเกมที่จบเข้า history
+    if state.turn_log:  # มีเทิร์นให้เก็บ
+        guild = getattr(channel, "guild", None)  # DM ไม่มี guild
+        history_store.append({
+            "id": f"{getattr(channel, 'id', 0)}-{int(state.started_at or state.turn_log[0][0])}",  # id เกม
+            "guild": guild.id if guild else None,  # server
+            "channel": getattr(channel, "id", None),  # ห้อง
+            "started": state.started_at or state.turn_log[0][0],  # เริ่ม
+            "ended": time.time(),  # จบ
+            "reason": reason,  # จบเพราะอะไร
+            "language": state.language,  # ภาษา (ใช้หาตัวท้ายตอนวิเคราะห์)
+            "rule": state.rule,  # กติกาต่อคำ
+            "turns": state.turn_log,  # ทุกเทิร์น
+        })  # เข้าคิว (เขียนเป็น batch นอก loop)
+    state.turn_log = []  # เริ่มใหม่
+    state.started_at = time.time()  # เวลาเริ่มรอบถัดไป
+
+
+def record_partition_score(channel: discord.abc.Messageable, key: str, points: int):  # บวกคะแนนเข้าทุก partition
+    guild = getattr(channel, "guild", None)  # DM ไม่มี guild
+    leaderboards.record(key, points, guild.id if guild else None, getattr(channel, "id", None), active_season())  # ค้นแบบ binary search + เลื่อน list ต่อ partition
+    scopes = [PartitionedLeaderboards.GLOBAL] + ([guild_partition(guild.id)] if guild else [])  # ช่วงเวลา: global + server
+    windowed_leaderboards.record(key, points, scopes, time.time())  # ลง bucket ชั่วโมง/วัน/สัปดาห์/เดือน
+
+
+async def send_message(channel: discord.abc.Messageable, text: str):  # ส่งข้อความพร้อม span
+    with tracer.span("discord.send"):  # วัดเวลาส่ง
+        return await channel.send(text, allowed_mentions=allowed_mentions_none)  # ส่ง
+
+
 # ---------------------------
 # Turn timer (safe cancel + token)
 # ---------------------------
@@ -311,29 +604,39 @@ async def cancel_turn_timer_async(state: GameState):  # ยกเลิก timer
     state.turn_task = None  # เคลียร์ตัวชี้
 
 
-async def send_turn_prompt(channel: discord.abc.Messageable, state: GameState):  # ส่ง prompt เทิร์น
-    state.turn_message = None  # เคลียร์ก่อนส่งใหม่ กัน edit ข้อความผิด
+async def send_turn_prompt(channel: discord.abc.Messageable, state: GameState, remaining: Optional[int] = None):  # ส่ง prompt เทิร์น
+    state.turn_message_id = None  # เคลียร์ก่อนส่งใหม่ กัน edit ข้อความผิด
     uid, ai_name = current_player_info(state)  # ดึงคนที่ถึงตา
     if uid is None and ai_name is None:  # ไม่มีผู้เล่น
         await channel.send("No players joined yet! Use !join or !add_ai", allowed_mentions=allowed_mentions_none)  # แจ้ง
         return None  # จบ
 
     name = state.player_names.get(uid, f"User {uid}") if uid is not None else (ai_name or "Unknown")  # ชื่อผู้เล่น
+    event_bus.publish(  # แจ้งผู้ชม: เทิร์นใหม่
+        "turn", getattr(channel, "id", None), player=name, ai=ai_name is not None,
+        need=required_letter(state), min_length=required_length(state),
+        seconds=state.turn_seconds if remaining is None else remaining,
+    )
     name = discord.utils.escape_markdown(name)  # escape markdown/mentions
-    text = build_turn_text(state, name, state.turn_seconds)  # ข้อความเริ่มต้น
+    text = build_turn_text(state, name, state.turn_seconds if remaining is None else remaining)  # ข้อความเริ่มต้น
     msg = await channel.send(text, allowed_mentions=allowed_mentions_none)  # ส่งข้อความ
-    state.turn_message = msg  # เก็บไว้แก้ progress
+    state.turn_message_id = msg.id  # เก็บแค่ id ไว้แก้ progress
     return msg  # คืน message
 
 
-async def start_turn_timer(channel: discord.abc.Messageable, state: GameState):  # เริ่ม timer เทิร์น
-    await cancel_turn_timer_async(state)  # ยกเลิกของเก่าก่อน
+async def start_turn_timer(channel: discord.abc.Messageable, state: GameState, remaining: Optional[int] = None):  # เริ่ม timer เทิร์น (remaining = เวลาที่เหลือตอน resume)
+    with tracer.span("start_turn_timer", channel_id=getattr(channel, "id", None)) as span:  # span ของการเริ่ม timer
+        await cancel_turn_timer_async(state)  # ยกเลิกของเก่าก่อน
 
-    # token เพิ่มทุกครั้งที่เริ่มเทิร์น เพื่อกัน task/AI เก่าทำงานทับ
-    state.turn_token += 1  # bump token
+        # token เพิ่มทุกครั้งที่เริ่มเทิร์น เพื่อกัน task/AI เก่าทำงานทับ
+        state.turn_token += 1  # bump token
+        span.set_attribute("turn_token", state.turn_token)  # tag token ใหม่
     my_token = state.turn_token  # token ของ task นี้
+    turn_length = state.turn_seconds if remaining is None else max(0, remaining)  # ความยาวเทิร์นนี้
+    state.turn_deadline = time.time() + turn_length  # เวลาหมดเทิร์น (เก็บลง checkpoint)
 
     async def timer():  # task นับถอยหลัง
+        tracer.detach()  # ไม่ผูก task ยาว ๆ กับ trace ของข้อความที่สร้างมัน
         try:
             tp = total_players(state)  # จำนวนผู้เล่น
             if not state.active or tp == 0:  # เกมปิดหรือไม่มีคน
@@ -349,24 +652,14 @@ async def start_turn_timer(channel: discord.abc.Messageable, state: GameState):
                 if my_token != state.turn_token or not state.active:  # ตรวจ token
                     return  # จบ
 
-                word = await generate_ai_word_async(state, ai_name)  # ขอคำจาก AI แบบไม่ค้างบอท
-
-                # token ตรวจซ้ำกัน race condition
-                if my_token != state.turn_token or not state.active:  # ตรวจ token
-                    return  # จบ
-
-                if word:  # ถ้าได้คำ
-                    await process_word_submission(channel, word, state, player_id=None, ai_player=ai_name)  # ส่งเข้าระบบ
-                    return  # จบ (process_word_submission จะเปิดเทิร์นใหม่)
-                # AI คิดไม่ออก -> ข้าม
-                advance_turn(state)  # ข้ามไปคนถัดไป
-                await channel.send(f"🤖 {ai_name} couldn't think of a word! Skipping...", allowed_mentions=allowed_mentions_none)  # แจ้ง
-                await send_turn_prompt(channel, state)  # prompt เทิร์นใหม่
-                await start_turn_timer(channel, state)  # เริ่ม timer ใหม่
+                with tracer.start_trace("ai_turn", channel_id=getattr(channel, "id", None), turn_token=my_token):  # trace เทิร์น AI
+                    with tracer.span("ai.generate"):  # วัดเวลาขอคำจาก AI (นอก actor: ห้องไม่ค้างระหว่างรอ LLM)
+                        word = await generate_ai_word_async(state, ai_name)  # ขอคำจาก AI แบบไม่ค้างบอท
+                actors.get(channel.id).tell(play_ai_turn, channel, state, my_token, ai_name, word)  # ลงคิวของห้อง (ตรวจ token อีกครั้งในนั้น)
                 return  # จบ
 
             # --- Human turn countdown ---
-            remaining = state.turn_seconds  # เวลาที่เหลือ
+            remaining = turn_length  # เวลาที่เหลือ
             update_interval = 2  # อัปเดตทุก 2 วินาที (ลดโอกาสโดน rate-limit)
 
             while remaining > 0:  # นับถอยหลัง
@@ -379,10 +672,11 @@ async def start_turn_timer(channel: discord.abc.Messageable, state: GameState):
                     return  # จบ
 
                 # อัปเดตข้อความ progress
-                if state.turn_message and remaining < state.turn_seconds:  # ไม่ใช่รอบแรก
+                if state.turn_message_id and remaining < state.turn_seconds and hasattr(channel, "get_partial_message"):  # ไม่ใช่รอบแรก
                     name = peek_current_name(state)  # ชื่อคนที่ถึงตา ณ ตอนนี้
                     try:
-                        await state.turn_message.edit(content=build_turn_text(state, name, remaining))  # แก้ไขข้อความ
+                        turn_message = channel.get_partial_message(state.turn_message_id)  # สร้างจาก id (ไม่ต้องมีใน cache)
+                        await turn_message.edit(content=build_turn_text(state, name, remaining))  # แก้ไขข้อความ
                     except discord.errors.HTTPException:
                         pass  # ถ้าแก้ไม่ได้ก็ข้าม
 
@@ -390,25 +684,8 @@ async def start_turn_timer(channel: discord.abc.Messageable, state: GameState):
                 await asyncio.sleep(sleep_time)  # รอ
                 remaining -= sleep_time  # ลดเวลาที่เหลือ
 
-            # --- Time's up -> skip human ---
-            # ถ้า token ไม่ตรง แปลว่าเทิร์นเปลี่ยนแล้ว -> ไม่ต้อง skip
-            if my_token != state.turn_token or not state.active:  # ตรวจ token
-                return  # จบ
-
-            tp3 = total_players(state)  # จำนวนผู้เล่นอีกครั้ง
-            if tp3 == 0:  # ไม่มีคน
-                return  # จบ
-
-            # รีเซ็ต streak/combo เมื่อโดนข้าม
-            if uid is not None:  # เป็นคน
-                state.player_streaks[uid] = 0  # รีเซ็ต streak คนนี้
-            state.combo_count = 0  # รีเซ็ต combo ห้อง
-
-            name = state.player_names.get(uid, f"User {uid}") if uid is not None else "Unknown"  # ชื่อคนที่โดนข้าม
-            advance_turn(state)  # เลื่อนไปคนถัดไป
-            await channel.send(f"⏰ Time's up! Skipping {name}.", allowed_mentions=allowed_mentions_none)  # แจ้ง
-            await send_turn_prompt(channel, state)  # ส่ง prompt ใหม่
-            await start_turn_timer(channel, state)  # เริ่ม timer ใหม่
+            # --- Time's up -> skip human (ใน actor ของห้อง ต่อคิวหลังคำที่ส่งมาก่อนหมดเวลา) ---
+            actors.get(channel.id).tell(expire_turn, channel, state, my_token, uid)  # ลงคิว
 
         except asyncio.CancelledError:
             return  # ถูก cancel ก็จบ
@@ -419,11 +696,84 @@ async def start_turn_timer(channel: discord.abc.Messageable, state: GameState):
     state.turn_task = asyncio.create_task(timer())  # สร้าง task ใหม่
 
 
+async def skip_turn(channel: discord.abc.Messageable, state: GameState, key: str, text: str):  # ข้ามเทิร์น (dead end) แล้วเปิดเทิร์นใหม่
+    state.turn_log.append([time.time(), key, None, 0, 0, 0, 0, 0])  # บันทึกการข้าม (dead end)
+    advance_turn(state)  # เลื่อนไปคนถัดไป
+    await channel.send(text, allowed_mentions=allowed_mentions_none)  # แจ้ง
+    await send_turn_prompt(channel, state)  # prompt เทิร์นใหม่
+    await start_turn_timer(channel, state)  # เริ่ม timer ใหม่
+
+
+async def expire_turn(channel: discord.abc.Messageable, state: GameState, token: int, uid: Optional[int]):  # หมดเวลา (รันใน actor)
+    if token != state.turn_token or not state.active or total_players(state) == 0:  # มีคำเข้ามาก่อน / เกมจบ
+        return  # จบ
+
+    # รีเซ็ต streak/combo เมื่อโดนข้าม
+    if uid is not None:  # เป็นคน
+        state.player_streaks[uid] = 0  # รีเซ็ต streak คนนี้
+    state.combo_count = 0  # รีเซ็ต combo ห้อง
+
+    name = state.player_names.get(uid, f"User {uid}") if uid is not None else "Unknown"  # ชื่อคนที่โดนข้าม
+    event_bus.publish("timeout", getattr(channel, "id", None), player=name)  # แจ้งผู้ชม: หมดเวลา
+    await skip_turn(channel, state, str(uid), f"⏰ Time's up! Skipping {name}.")  # ข้าม
+
+
+async def play_ai_turn(channel: discord.abc.Messageable, state: GameState, token: int, ai_name: str, word: Optional[str]):  # เล่นคำของ AI (รันใน actor)
+    if token != state.turn_token or not state.active:  # เทิร์นเปลี่ยนระหว่าง AI คิด
+        return  # จบ
+    if word and await process_word_submission(channel, word, state, player_id=None, ai_player=ai_name):  # ผ่าน -> เปิดเทิร์นใหม่แล้ว
+        return  # จบ
+    await skip_turn(channel, state, sanitize_ai_key(ai_name), f"🤖 {ai_name} couldn't think of a word! Skipping...")  # คิดไม่ออก / คำไม่ผ่าน -> ข้าม
+
+
 # ---------------------------
 # AI (OpenRouter via OpenAI SDK) - sync + to_thread
 # ---------------------------
 
-def generate_ai_word(state: GameState, ai_name: str) -> Optional[str]:  # สร้างคำ AI (sync) กับ retry
+def ai_candidates(state: GameState) -> List[str]:  # คำที่ยังไม่ใช้และต่อได้จาก dictionary (บน loop ก่อนส่งเข้า thread)
+    if config.ai_candidate_count <= 0:  # ปิดโหมด shortlist
+        return []  # ใช้ prompt แบบเดิม
+    return chain_counts_for(state).pick(required_letter(state), state.used_words, trap=True, limit=config.ai_candidate_count,
+                                        min_len=required_length(state))  # ตัวท้ายไม่ซ้ำกัน เรียงจากต่อยากสุด
+
+
+def parse_candidate_reply(reply: str, candidates: List[str], language: Language) -> Optional[str]:  # คำตอบ -> คำใน shortlist (lookup O(1))
+    choices = {str(i): word for i, word in enumerate(candidates, 1)}  # "3" -> คำที่ 3
+    choices.update((word, word) for word in candidates)  # ตอบเป็นคำก็ได้
+    text = reply.strip().strip("#*").strip()  # ตัดเครื่องหมายรอบ ๆ
+    first = text.split()[0].rstrip(".):") if text else ""  # เผื่อตอบ "3. tiger"
+    return choices.get(first) or choices.get(language.clean(text))  # None = ตอบนอก shortlist
+
+
+def generate_candidate_ai_word(state: GameState, ai_name: str, candidates: List[str]) -> Optional[str]:  # ให้โมเดลเลือกจาก shortlist (sync)
+    language = state_language(state)  # ภาษาของห้อง
+    last_letter = required_letter(state)  # ตัวที่ต้องขึ้นต้น
+    need = state_rule(state).requirement(last_letter) if last_letter else ""  # เงื่อนไขตามกติกาห้อง
+    listing = "\n".join(f"{i}. {word}" for i, word in enumerate(candidates, 1))  # รายการมีเลขกำกับ
+    prompt = (
+        f"You are playing a Word Chain game in {language.name}"
+        + (f"; the word must {need}" if need else "")
+        + ". Every option below is valid and unused. Earlier options leave the next player fewer replies.\n"
+        + listing
+        + "\nReply with only the number of your choice."
+    )  # ไม่ต้องส่งคำที่ใช้แล้ว (กรองไว้ใน shortlist แล้ว) -> prompt สั้นลง
+    for attempt in range(2):  # ลองซ้ำเฉพาะตอน API error
+        try:
+            resp = get_openai_client().chat.completions.create(  # เรียกโมเดล
+                model=config.ai_model,  # โมเดลจาก config
+                messages=[{"role": "user", "content": prompt}],  # ข้อความ user
+                max_tokens=min(config.ai_max_tokens, 8),  # ตอบแค่ตัวเลข
+                temperature=config.ai_temperature,  # ความสุ่ม
+            )
+            return parse_candidate_reply(resp.choices[0].message.content or "", candidates, language)  # None = ตอบนอก shortlist
+        except Exception as e:
+            print(f"AI candidate choice error (attempt {attempt + 1}): {e}")  # log
+    return None  # ยอมแพ้
+
+
+def generate_ai_word(state: GameState, ai_name: str, candidates: Optional[List[str]] = None) -> Optional[str]:  # สร้างคำ AI (sync) กับ retry
+    if candidates and OPENROUTER_API_KEY:  # มี shortlist -> ให้เลือก ไม่ต้องเดา
+        return generate_candidate_ai_word(state, ai_name, candidates)  # ไม่ต้อง retry เพราะคำตอบตรวจจาก shortlist ได้ทันที
     max_retries = 3  # ลองใหม่ได้ 3 ครั้ง
     for attempt in range(max_retries):  # ลูป retry
         try:
@@ -431,39 +781,47 @@ def generate_ai_word(state: GameState, ai_name: str) -> Optional[str]:  # สร
                 print("AI error: OPENROUTER_API_KEY is not set")  # log
                 return None  # จบ
 
-            last_letter = state.word_chain[-1][-1] if state.word_chain else None  # ตัวท้ายคำล่าสุด
+            language, rule = state_language(state), state_rule(state)  # ภาษา + กติกาของห้อง
+            last_letter = required_letter(state)  # key ที่ต้องขึ้นต้น (ตามกติกาห้อง)
+            min_len = required_length(state)  # ความยาวขั้นต่ำตอนนี้
             used_words_preview = state.word_chain[-20:] if state.word_chain else []  # เอาท้าย ๆ 20 คำ (ตามลำดับเวลา)
             used_words_str = ", ".join(used_words_preview)  # ทำเป็นสตริง
 
             prompt = "You are playing a Word Chain game.\n"  # ตั้งบทบาท
             if last_letter:  # ถ้ามีเงื่อนไขตัวอักษร
-                prompt += f"Your word must start with '{last_letter}'.\n"  # บอกกติกา
+                prompt += f"Your word must {rule.requirement(last_letter)}.\n"  # บอกกติกา
             else:
                 prompt += "You can start with any word.\n"  # เริ่มได้ทุกคำ
             prompt += f"Used words: {used_words_str}\n"  # บอกคำที่ใช้แล้ว
-            prompt += "Return ONE valid English word (3-15 letters), letters only, not used yet. Reply with only the word."  # ข้อกำหนด
+            prompt += (
+                f"Return ONE valid {language.name} word ({min_len}-{language.max_len} letters), "
+                "letters only, not used yet. Reply with only the word."
+            )  # ข้อกำหนด
 
-            resp = openai_client.chat.completions.create(  # เรียกโมเดล
+            resp = get_openai_client().chat.completions.create(  # เรียกโมเดล
                 model=config.ai_model,  # โมเดลจาก config
                 messages=[{"role": "user", "content": prompt}],  # ข้อความ user
                 max_tokens=config.ai_max_tokens,  # จำกัด token
                 temperature=config.ai_temperature,  # ความสุ่ม
             )
 
-            word = (resp.choices[0].message.content or "").strip().lower()  # ดึงคำตอบ
+            word = (resp.choices[0].message.content or "").strip()  # ดึงคำตอบ
             if not word:  # กันคำตอบว่าง
                 continue  # ลองใหม่
 
             # ทำความสะอาดคำตอบเผื่อมีเครื่องหมาย / ข้อความอื่น
-            word = "".join(ch for ch in word if ch.isalpha())  # เอาเฉพาะตัวอักษร
+            word = language.clean(word)  # normalize + เอาเฉพาะตัวอักษร (รวมสระ/วรรณยุกต์)
 
-            if not is_valid_word_basic(word):  # ตรวจรูปแบบ
+            if not is_valid_word_basic(word, language):  # ตรวจรูปแบบ
                 continue  # ลองใหม่
 
             if word in state.used_words:  # กันซ้ำ
                 continue  # ลองใหม่
 
-            if last_letter and not word.startswith(last_letter):  # ต้องเริ่มด้วยตัวท้ายเดิม
+            if len(word) < min_len or not rule.accept(language, word):  # สั้นไป / ไม่อยู่ในหมวด
+                continue  # ลองใหม่
+
+            if last_letter and rule.first(language, word) != last_letter:  # ต้องเริ่มด้วย key ตามกติกา
                 continue  # ลองใหม่
 
             return word  # ผ่านทั้งหมด
@@ -475,7 +833,13 @@ def generate_ai_word(state: GameState, ai_name: str) -> Optional[str]:  # สร
 
 
 async def generate_ai_word_async(state: GameState, ai_name: str) -> Optional[str]:  # async wrapper
-    return await asyncio.to_thread(generate_ai_word, state, ai_name)  # ย้ายงาน sync ไป thread
+    candidates = ai_candidates(state)  # shortlist จาก dictionary (ว่างถ้ายังไม่มี dictionary)
+    word = await asyncio.to_thread(generate_ai_word, state, ai_name, candidates)  # ย้ายงาน sync ไป thread
+    if word is None and candidates and config.ai_local_fallback:  # ตอบนอก shortlist -> ใช้ตัวเลือกแรก (ต่อยากสุด)
+        word = next((w for w in candidates if w not in state.used_words), None)  # กันคำที่เพิ่งถูกใช้ระหว่างรอ
+    if word is None and config.ai_local_fallback:  # LLM ตอบไม่ได้ -> เลือกจาก dictionary แทน
+        word = local_ai_word(state)  # O(จำนวนตัวอักษร) บน loop
+    return word  # คืนคำ (หรือ None)
 
 
 # ---------------------------
@@ -488,127 +852,700 @@ async def process_word_submission(
     state: GameState,  # state ห้อง
     player_id: Optional[int] = None,  # user_id (ถ้าเป็นคน)
     ai_player: Optional[str] = None,  # ai_name (ถ้าเป็น AI)
-):
-    word = normalize_word(word)  # normalize
+    reply: Optional[Callable[[str], Awaitable[Any]]] = None,  # ส่ง error ให้คนส่งคำเท่านั้น (เช่น ephemeral ของ slash command)
+) -> bool:  # True = รับคำแล้ว
+    with tracer.span("process_word_submission", channel_id=getattr(channel, "id", None), turn_token=state.turn_token):  # span ทั้ง pipeline
+        return await _process_word_submission(channel, word, state, player_id, ai_player, reply)  # ทำงานจริง
+
+
+async def _process_word_submission(
+    channel: discord.abc.Messageable,
+    word: str,
+    state: GameState,
+    player_id: Optional[int],
+    ai_player: Optional[str],
+    reply: Optional[Callable[[str], Awaitable[Any]]] = None,
+) -> bool:
+    async def notify(text: str):  # แจ้ง error ของคน (ไม่มี reply -> ส่งในห้อง)
+        if reply is not None:
+            await reply(text)  # ส่งเฉพาะคนส่งคำ
+        else:
+            await send_message(channel, text)  # ส่งในห้อง
+
+    language = state_language(state)  # กติกาภาษาของห้อง
+    word = normalize_word(word, language)  # normalize
 
     # --- Validate basic ---
-    if not is_valid_word_basic(word):  # ตรวจรูปแบบคำ
+    if not is_valid_word_basic(word, language):  # ตรวจรูปแบบคำ
         if ai_player:
-            await channel.send(f"🤖 {ai_player} submitted invalid word format.", allowed_mentions=allowed_mentions_none)  # แจ้ง
+            await send_message(channel, f"🤖 {ai_player} submitted invalid word format.")  # แจ้ง
         else:
-            await channel.send("Please enter a valid word (letters only, at least 2).", allowed_mentions=allowed_mentions_none)  # แจ้ง
-        return  # จบ
+            await notify("Please enter a valid word (letters only, at least 2).")  # แจ้ง
+        return False  # จบ
 
-    # --- Validate English ---
-    if not await is_valid_english_word(word):  # ตรวจคำอังกฤษ
+    # --- Validate dictionary ---
+    with tracer.span("validate.dictionary", language=state.language):  # วัดเวลาตรวจ dictionary
+        in_dictionary = await is_valid_dictionary_word(word, state.language, getattr(getattr(channel, "guild", None), "id", None))  # ตรวจคำ (+ wordlist ของ server)
+    if not in_dictionary:  # ไม่มีในภาษานี้
         if ai_player:
-            await channel.send(f"🤖 {ai_player} submitted invalid English word.", allowed_mentions=allowed_mentions_none)  # แจ้ง
+            await send_message(channel, f"🤖 {ai_player} submitted invalid {language.name} word.")  # แจ้ง
         else:
-            await channel.send("Not a valid English word (dictionary check failed).", allowed_mentions=allowed_mentions_none)  # แจ้ง
-        return  # จบ
+            suggestions = suggest_words(state, word)  # ดูเฉพาะตอนคำผิด คำที่ถูกไม่เสียเวลาเลย
+            hint = f" Did you mean: {', '.join(suggestions)}?" if suggestions else ""  # มีคำใกล้เคียง -> แนะนำ
+            await notify(f"Not a valid {language.name} word (dictionary check failed).{hint}")  # แจ้ง
+        return False  # จบ
+
+    # --- Rule: category + length ---
+    rule = state_rule(state)  # กติกาต่อคำของห้อง
+    if not rule.accept(language, word):  # ไม่อยู่ในหมวด / สั้นกว่า key
+        if ai_player:
+            await send_message(channel, f"🤖 {ai_player} submitted a word outside {rule.name}.")  # แจ้ง
+        else:
+            await notify(f"That word isn't allowed in {rule.name}.")  # แจ้ง
+        return False  # จบ
+    min_len = required_length(state)  # ความยาวขั้นต่ำตอนนี้
+    if len(word) < min_len:  # สั้นไป (escalate)
+        if ai_player:
+            await send_message(channel, f"🤖 {ai_player} submitted a word shorter than {min_len} letters.")  # แจ้ง
+        else:
+            await notify(f"Words must be at least {min_len} letters now.")  # แจ้ง
+        return False  # จบ
 
     # --- Duplicate ---
     if word in state.used_words:  # คำซ้ำ
         if ai_player:
-            await channel.send(f"🤖 {ai_player} submitted already used word.", allowed_mentions=allowed_mentions_none)  # แจ้ง
+            await send_message(channel, f"🤖 {ai_player} submitted already used word.")  # แจ้ง
         else:
-            await channel.send("Word already used!", allowed_mentions=allowed_mentions_none)  # แจ้ง
-        return  # จบ
+            await notify("Word already used!")  # แจ้ง
+        return False  # จบ
 
     # --- Chain rule ---
     if state.word_chain:  # ถ้ามีคำก่อนหน้า
-        last_word = state.word_chain[-1]  # คำล่าสุด
-        if word[0] != last_word[-1]:  # ตัวแรกไม่ตรงตัวท้าย
+        need = required_letter(state)  # key ท้ายคำล่าสุด (ตามกติกาห้อง)
+        if rule.first(language, word) != need:  # key ต้นไม่ตรง key ท้าย
             if ai_player:
-                await channel.send(f"🤖 {ai_player} submitted word that doesn't chain properly.", allowed_mentions=allowed_mentions_none)  # แจ้ง
+                await send_message(channel, f"🤖 {ai_player} submitted word that doesn't chain properly.")  # แจ้ง
             else:
-                await channel.send(f"Word must start with '{last_word[-1]}'.", allowed_mentions=allowed_mentions_none)  # แจ้ง
-            return  # จบ
+                await notify(f"Word must {rule.requirement(need)}.")  # แจ้ง
+            return False  # จบ
+
+    if not ai_player and player_id is None:  # กันกรณีข้อมูลไม่ครบ
+        return False  # จบ
 
     # --- Stop timer for this turn (safe) ---
     await cancel_turn_timer_async(state)  # ยกเลิก timer รอบนี้ (ปลอดภัย)
 
-    # --- Apply word (with state lock) ---
-    async with state._lock:  # lock เพื่อแก้ไข state อย่างปลอดภัย
-        await update_state_activity(state)  # track activity
+    # --- Apply word (ไม่มี await จนจบการให้คะแนน: actor ของห้องทำทีละงานอยู่แล้ว) ---
+    cfg = config.snapshot()  # ใช้ config version เดียวตลอดการคิดคะแนน
+    state._last_activity = time.time()  # track activity
+
+    counts = chain_counts_for(state)  # counts ก่อนเพิ่มคำนี้
+    state.word_chain.append(word)  # เพิ่มใน chain
+    state.used_words.add(word)  # mark used
+    counts.use(word)  # ลดจำนวนคำที่เหลือ (O(1))
+
+    # --- Scoring ---
+    base_points = 1  # คะแนนพื้นฐาน
+    bonus_points = 0  # คะแนนโบนัส
+    long_bonus = streak_bonus = combo_bonus = difficulty_bonus = 0  # แยกโบนัสแต่ละแบบ (เก็บลง history)
+
+    if len(word) >= cfg.long_word_len:  # โบนัสคำยาว
+        long_bonus = cfg.long_word_bonus  # โบนัสคำยาว
+        bonus_points += long_bonus  # บวกโบนัส
+
+    if cfg.difficulty_bonus and len(counts.graph) and counts.followups(rule.last(language, word)) <= cfg.difficulty_max_followups:  # คำที่ต่อยาก (เหลือทางต่อน้อย; ไม่มี dictionary = ไม่รู้ ไม่ให้โบนัส)
+        difficulty_bonus = cfg.difficulty_bonus  # โบนัสความยาก
+        bonus_points += difficulty_bonus  # บวกโบนัส
+
+    if ai_player:  # ถ้าเป็น AI
+        key = sanitize_ai_key(ai_player)  # key ปลอดภัย
+        names.remember(key, ai_player)  # เก็บ display name (เขียน SQLite เบื้องหลัง)
+    else:  # ถ้าเป็น human
+        streak = state.player_streaks.get(player_id, 0) + 1  # เพิ่ม streak
+        state.player_streaks[player_id] = streak  # เก็บ streak
+        if streak >= cfg.streak_min:  # ถึงเกณฑ์ streak
+            streak_bonus = cfg.streak_bonus  # โบนัส streak
+            bonus_points += streak_bonus  # บวกโบนัส
+
+        state.combo_count += 1  # เพิ่ม combo
+        if cfg.combo_step > 0 and (state.combo_count % cfg.combo_step == 0):  # ทุก ๆ step
+            combo_bonus = cfg.combo_bonus  # โบนัส combo
+            bonus_points += combo_bonus  # บวกโบนัส
+        key = str(player_id)  # key ของ human
+
+    total_points = base_points + bonus_points  # รวมคะแนน
+    player_total = score_sink.add(key, total_points)  # คะแนนรวมใน memory (ไฟล์เขียนเบื้องหลัง)
+    record_partition_score(channel, key, total_points)  # อัปเดต guild/channel/season
+    advance_turn(state)  # เลื่อนไปคนถัดไป
+    state.turn_log.append([time.time(), key, word, total_points, long_bonus, streak_bonus, combo_bonus, difficulty_bonus])  # บันทึกเทิร์นลง history
+    event_bus.publish(  # แจ้งผู้ชม: คะแนน (แค่เข้าคิว ไม่รอผู้ชมที่ช้า)
+        "word", getattr(channel, "id", None), player=ai_player or state.player_names.get(player_id, f"User {player_id}"),
+        ai=ai_player is not None, word=word, points=total_points, bonus=bonus_points, total=player_total,
+        chain=len(state.word_chain),
+    )
 
-        state.word_chain.append(word)  # เพิ่มใน chain
-        state.used_words.add(word)  # mark used
+    # --- Send results ---
+    next_name = peek_current_name(state)  # ชื่อคนถัดไปจริง
+    next_name = discord.utils.escape_markdown(next_name)  # escape
+    next_need = rule.requirement(rule.last(language, word))  # เงื่อนไขของคำถัดไป
 
-        # --- Scoring ---
-        base_points = 1  # คะแนนพื้นฐาน
-        bonus_points = 0  # คะแนนโบนัส
+    if ai_player:
+        await send_message(  # ส่งผลลัพธ์
+            channel,
+            f"🤖 {discord.utils.escape_markdown(ai_player)} played '{word}' (+{total_points} pts). "
+            f"Next must {next_need}. Next: {next_name}",
+        )
+    else:
+        bonus_text = f" (+{bonus_points} bonus)" if bonus_points > 0 else ""  # ข้อความโบนัส
+        await send_message(  # ส่งผลลัพธ์
+            channel,
+            f"✅ Added '{word}' (+{total_points} pts{bonus_text}). Next must {next_need}. "
+            f"Your total score: {player_total}. Next: {next_name}",
+        )
+    await start_turn_timer(channel, state)  # เริ่ม timer เทิร์นใหม่
+    return True  # รับคำแล้ว
 
-        if len(word) >= config.long_word_len:  # โบนัสคำยาว
-            bonus_points += config.long_word_bonus  # บวกโบนัส
 
-        if ai_player:  # ถ้าเป็น AI
-            key = sanitize_ai_key(ai_player)  # key ปลอดภัย
-            async with display_names_lock:
-                ai_display_names[key] = ai_player  # เก็บ display name
-            total_points = base_points + bonus_points  # รวมคะแนน
-            async with scores_lock:  # lock เพื่อกัน lost update
-                scores_data[key] = scores_data.get(key, 0) + total_points  # เพิ่มคะแนน AI
-                await save_scores_async()  # เซฟ
+async def submit_player_word(
+    channel: discord.abc.Messageable,
+    state: GameState,
+    player_id: int,
+    word: str,
+    reply: Optional[Callable[[str], Awaitable[Any]]] = None,
+) -> bool:  # คำจากคน (รันใน actor ของห้อง: ตรวจตาซ้ำ เพราะงานก่อนหน้าในคิวอาจเปลี่ยนเทิร์นไปแล้ว)
+    uid, _ = current_player_info(state)  # คนที่ถึงตา ณ ตอนนี้
+    if not state.active or uid != player_id:  # เกมจบ / คำก่อนหน้าของคนนี้ผ่านไปแล้ว
+        if reply is not None and state.active:
+            await reply("🚫 Not your turn anymore.")  # แจ้ง (ผ่าน cooldown ของ reply)
+        return False  # จบ
+    return await process_word_submission(channel, word, state, player_id=player_id, ai_player=None, reply=reply)  # ประมวลผลคำ
 
-            advance_turn(state)  # เลื่อนไปคนถัดไป
 
-        else:  # ถ้าเป็น human
-            if player_id is None:  # กันกรณีข้อมูลไม่ครบ
-                return  # จบ
+# ---------------------------
+# Checkpoint / resume
+# ---------------------------
 
-            streak = state.player_streaks.get(player_id, 0) + 1  # เพิ่ม streak
-            state.player_streaks[player_id] = streak  # เก็บ streak
-            if streak >= config.streak_min:  # ถึงเกณฑ์ streak
-                bonus_points += config.streak_bonus  # บวกโบนัส
+def state_fingerprint(state: GameState) -> tuple:  # ค่าที่เปลี่ยนเมื่อ state เปลี่ยน (เทียบ O(1))
+    return (
+        state.active, state.turn_token, len(state.word_chain), len(state.turn_log), state.roster.version,
+        state.roster.current, state.roster.head, len(state.player_names), state.combo_count, state.turn_seconds,
+        state.language, state.rule,
+    )
 
-            state.combo_count += 1  # เพิ่ม combo
-            if config.combo_step > 0 and (state.combo_count % config.combo_step == 0):  # ทุก ๆ step
-                bonus_points += config.combo_bonus  # บวกโบนัส
 
-            total_points = base_points + bonus_points  # รวมคะแนน
-            key = str(player_id)  # key ของ human
-            async with scores_lock:  # lock เพื่อกัน lost update
-                scores_data[key] = scores_data.get(key, 0) + total_points  # เพิ่มคะแนน human
-                await save_scores_async()  # เซฟ
+def snapshot_state(state: GameState, now: float) -> Dict[str, Any]:  # copy state เป็น dict เล็ก ๆ (บน loop)
+    return {
+        "a": state.active,  # active
+        "o": state.roster.to_list(),  # ผู้เล่นตามลำดับ join (int = human, str = AI)
+        "n": {str(uid): name for uid, name in state.player_names.items()},  # ชื่อ
+        "u": state.roster.current,  # คนที่ถึงตา
+        "c": list(state.word_chain),  # chain (used_words สร้างใหม่จาก chain ได้)
+        "t": state.turn_seconds,  # เวลาต่อเทิร์น
+        "l": state.language,  # ภาษา
+        "v": state.rule,  # กติกาต่อคำ
+        "s": {str(uid): streak for uid, streak in state.player_streaks.items()},  # streak
+        "k": state.combo_count,  # combo
+        "r": max(0.0, state.turn_deadline - now) if state.active else 0.0,  # เวลาที่เหลือของเทิร์น
+        "h0": state.started_at,  # เวลาเริ่มเกม
+        "h": list(state.turn_log),  # history ของเกมที่ยังไม่จบ
+    }
+
+
+def restore_state(data: Dict[str, Any]) -> GameState:  # สร้าง GameState จาก snapshot
+    if "o" in data:  # ลำดับวงแหวน
+        roster = Roster.from_list(data["o"], data.get("u"))
+    else:  # checkpoint แบบเก่า: human ก่อนแล้วตามด้วย AI + index เทิร์น
+        members = list(data.get("p", [])) + list(data.get("ai", []))
+        roster = Roster.from_list(members, members[data.get("i", 0) % len(members)] if members else None)
+    state = GameState(
+        active=data.get("a", False),
+        roster=roster,
+        player_names={int(uid): name for uid, name in data.get("n", {}).items()},
+        word_chain=list(data.get("c", [])),
+        turn_seconds=data.get("t", config.turn_seconds),
+        language=data.get("l", config.default_language),
+        rule=data.get("v", config.default_chain_rule),
+        player_streaks={int(uid): streak for uid, streak in data.get("s", {}).items()},
+        combo_count=data.get("k", 0),
+        started_at=data.get("h0", 0.0),
+        turn_log=list(data.get("h", [])),
+    )
+    state.used_words = set(state.word_chain)  # used = ทุกคำใน chain
+    state.turn_deadline = time.time() + data.get("r", 0.0)  # หยุดนาฬิกาช่วงบอทปิด
+    return state
 
-            advance_turn(state)  # เลื่อนไปคนถัดไป
 
-    # --- Send results (outside lock to avoid blocking) ---
-    next_name = peek_current_name(state)  # ชื่อคนถัดไปจริง
-    next_name = discord.utils.escape_markdown(next_name)  # escape
+def load_checkpoint_sync():  # โหลด checkpoint ทั้งหมด (ยังไม่ decode) ตอน startup
+    global pending_restore, resume_channels  # ใช้ global
+    pending_restore, resume_channels = checkpoint_store.load_all()  # blob + ห้องที่ active
+    print(f"Checkpoint: {len(pending_restore)} games stored, {len(resume_channels)} to resume")  # log
 
-    if ai_player:
-        await channel.send(  # ส่งผลลัพธ์
-            f"🤖 {discord.utils.escape_markdown(ai_player)} played '{word}' (+{total_points} pts). "
-            f"Next starts with '{word[-1]}'. Next: {next_name}",
-            allowed_mentions=allowed_mentions_none,
-        )
-    else:
-        bonus_text = f" (+{bonus_points} bonus)" if bonus_points > 0 else ""  # ข้อความโบนัส
-        await channel.send(  # ส่งผลลัพธ์
-            f"✅ Added '{word}' (+{total_points} pts{bonus_text}). Next starts with '{word[-1]}'. "
-            f"Your total score: {scores_data[key]}. Next: {next_name}",
-            allowed_mentions=allowed_mentions_none,
-        )
-    await start_turn_timer(channel, state)  # เริ่ม timer เทิร์นใหม่
+
+async def resume_game(channel: discord.abc.Messageable, state: GameState, remaining: int):  # เดินเทิร์นที่ค้างต่อ (รันใน actor)
+    await channel.send("♻️ Game resumed after restart.", allowed_mentions=allowed_mentions_none)  # แจ้ง
+    await send_turn_prompt(channel, state, remaining)  # prompt ด้วยเวลาที่เหลือ
+    await start_turn_timer(channel, state, remaining)  # timer ต่อจากเดิม
+
+
+async def resume_active_games():  # เดิน timer ต่อให้เกมที่ active ตอนปิดบอท
+    for channel_id in resume_channels:  # ทุกห้องที่ต้อง resume
+        channel = bot.get_channel(channel_id)  # channel จาก cache
+        if channel is None:  # บอทไม่เห็นห้องนี้แล้ว
+            continue  # ข้าม (state ยัง restore ได้ภายหลัง)
+        state = get_game(channel_id)  # decode ตอนนี้
+        if not state.active or total_players(state) == 0:  # ไม่มีอะไรต้องเดินต่อ
+            continue  # ข้าม
+        remaining = max(1, int(round(state.turn_deadline - time.time())))  # เวลาที่เหลือจริงของเทิร์น
+        try:
+            await actors.get(channel_id).ask(resume_game, channel, state, remaining)  # ใน actor ของห้อง
+        except discord.errors.HTTPException as e:
+            print(f"Could not resume game in channel {channel_id}: {e}")  # log
+    resume_channels.clear()  # เสร็จแล้ว
+
+
+async def checkpoint_games():  # เซฟ state ที่เปลี่ยนเท่านั้น (incremental)
+    now = time.time()  # เวลาปัจจุบัน
+    rows = []  # แถวที่ต้องเขียน
+    snapshots = []  # (channel_id, active, snapshot dict)
+    for channel_id, state in list(games.items()):  # snapshot ของ dict กัน dict เปลี่ยนระหว่างวน
+        fp = state_fingerprint(state)  # fingerprint
+        if checkpoint_fingerprints.get(channel_id) == fp:  # ไม่เปลี่ยน
+            continue  # ข้าม
+        snapshots.append((channel_id, state.active, snapshot_state(state, now), fp))  # copy บน loop
+    deleted = [cid for cid in checkpoint_fingerprints if cid not in games]  # ห้องที่ถูกลบไปแล้ว
+    if not snapshots and not deleted:  # ไม่มีอะไรเปลี่ยน
+        return  # จบ
+
+    def write():  # encode + เขียนใน thread
+        for channel_id, active, snap, _ in snapshots:
+            rows.append((channel_id, active, now, encode_snapshot(snap)))  # บีบอัด
+        checkpoint_store.write(rows, deleted)  # transaction เดียว
+
+    await asyncio.to_thread(write)  # ไม่ block loop
+    for channel_id, _, _, fp in snapshots:  # จำว่าเซฟแล้ว
+        checkpoint_fingerprints[channel_id] = fp
+    for channel_id in deleted:  # ลบที่จำไว้
+        checkpoint_fingerprints.pop(channel_id, None)
+
+
+async def checkpoint_loop():  # checkpoint เป็นระยะ
+    while True:
+        await asyncio.sleep(config.checkpoint_interval)  # รอรอบถัดไป
+        try:
+            await checkpoint_games()  # เซฟ
+        except Exception as e:
+            print(f"Checkpoint error: {e}")  # log
+
+
+# ---------------------------
+# Diagnostics (event loop lag)
+# ---------------------------
+
+def start_loop_watchdog():  # เริ่ม watchdog ถ้าเปิดใน config
+    global loop_watchdog  # ใช้ global
+    if loop_watchdog is not None or config.loop_lag_threshold_ms <= 0:  # เริ่มแล้ว หรือปิดไว้
+        return  # จบ
+    loop_watchdog = LoopLagWatchdog(config.loop_lag_threshold_ms, config.loop_lag_interval)  # สร้าง watchdog
+    loop_watchdog.start()  # heartbeat task + thread สุ่ม stack
+
+
+memory = MemoryInspector(  # วัดใน thread แยก (สุ่มตัวอย่างใน container ใหญ่) ไม่ block เกม
+    sample=config.memory_sample_size,
+    trace_frames=config.memory_trace_frames,
+    stop=(discord.Client, discord.state.ConnectionState, discord.Guild, discord.abc.GuildChannel, discord.Thread,
+          discord.abc.PrivateChannel, aiohttp.ClientSession),  # นับแค่ตัว object ไม่เดินเข้า cache ของ discord
+)
+memory_lock = asyncio.Lock()  # วัดทีละรอบ (คำสั่ง + metrics)
+
+
+def game_states() -> List[GameState]:  # copy รายการ state (list() ของ dict ทำทีเดียว ปลอดภัยจาก thread)
+    return list(games.values())
+
+
+def count_games() -> Dict[str, int]:  # จำนวนเกมแยกตามสถานะ
+    now = time.time()  # เวลาปัจจุบัน
+    states = game_states()  # snapshot
+    idle = [s for s in states if not s.active]  # ไม่ได้เล่นอยู่
+    return {
+        "total": len(states),
+        "active": len(states) - len(idle),
+        "idle": len(idle),
+        "idle_1h": sum(1 for s in idle if now - getattr(s, "_last_activity", 0.0) > 3600),  # รอ cleanup อยู่
+    }
+
+
+def guild_memory(report: Dict[str, Any]) -> Dict[str, Dict[str, Any]]:  # memory ต่อ guild จากรายงาน (blocking, เรียกใน thread)
+    rows = {row["name"]: row.get("bytes", 0.0) for row in report["structures"]}  # bytes ต่อโครงสร้าง
+    items = list(games.items())  # snapshot (channel id, state)
+    words = {cid: len(s.used_words) for cid, s in items}  # คำที่ใช้แล้วต่อห้อง
+    per_game = (rows.get("games", 0.0) + rows.get("chain_counts", 0.0)) / max(1, len(items))  # ส่วนคงที่ต่อเกม
+    per_word = (rows.get("used_words", 0.0) + rows.get("word_chain", 0.0)) / max(1, sum(words.values()))  # ส่วนที่โตตามคำ
+    guilds: Dict[str, Dict[str, Any]] = {}
+    for cid, s in items:
+        guild = getattr(bot.get_channel(cid), "guild", None)  # DM / ห้องที่ไม่อยู่ใน cache -> other
+        row = guilds.setdefault(str(guild.id) if guild else "other", {"games": 0, "active": 0, "words": 0, "players": 0, "bytes": 0.0})
+        row["games"] += 1
+        row["active"] += 1 if s.active else 0
+        row["words"] += words[cid]
+        row["players"] += total_players(s)
+        row["bytes"] += per_game + per_word * words[cid]  # สัดส่วนของเกมนี้
+    return guilds
+
+
+def measure_with_guilds() -> Dict[str, Any]:  # รายงาน + แยกต่อ guild (blocking)
+    report = memory.measure()
+    report["guilds"] = guild_memory(report)
+    return report
+
+
+# ลำดับสำคัญ: object ที่ถูกอ้างจากหลายที่นับให้โครงสร้างแรกที่ลงทะเบียน (used_words ก่อน games)
+memory.register("dictionaries", lambda: dictionaries)
+memory.register("rule_indexes", lambda: rulebook)
+memory.register("fuzzy_indexes", lambda: fuzzy_indexes)
+memory.register("validation_cache", lambda: word_validator)
+memory.register("used_words", lambda: [s.used_words for s in game_states()])
+memory.register("word_chain", lambda: [s.word_chain for s in game_states()])
+memory.register("chain_counts", lambda: [s.chain_counts for s in game_states() if s.chain_counts is not None])
+memory.register("games", lambda: games)  # ส่วนที่เหลือของ GameState
+memory.register("checkpoints", lambda: (pending_restore, checkpoint_fingerprints))
+memory.register("not_your_turn_cooldowns", lambda: not_your_turn_cooldowns)
+memory.register("names", lambda: names)
+memory.register("scores", lambda: score_sink)
+memory.register("leaderboards", lambda: (leaderboards, windowed_leaderboards))
+memory.register("admission", lambda: admission)
+memory.register("actors", lambda: actors)
+memory.register("spectators", lambda: event_bus)
+memory.register("tournaments", lambda: (tournaments, match_routes))
+memory.register("deadline_scheduler", lambda: deadline_scheduler)
+memory.register("history_queue", lambda: history_store)
+memory.register("discord_messages", lambda: list(bot.cached_messages))  # cache ของ discord.py (max_messages)
+memory.register("discord_users", lambda: list(bot.users))
+memory.count("games", count_games)
+memory.count("discord", lambda: {"messages": len(bot.cached_messages), "users": len(bot.users), "guilds": len(bot.guilds)})
+memory.count("runtime", lambda: {"profile": config.runtime_profile, "loop": type(bot.loop).__module__.split(".")[0]})  # profile + event loop ที่ใช้
+
+
+async def measure_memory() -> Dict[str, Any]:  # รายงาน memory (วัดใน thread)
+    async with memory_lock:  # ไม่วัดซ้อน
+        return await asyncio.to_thread(measure_with_guilds)
+
+
+async def memory_metrics_loop():  # เขียนรายงาน memory เป็นระยะ (metrics)
+    while True:
+        await asyncio.sleep(config.memory_metrics_interval or 60.0)  # ปิดกลางทาง (0) -> แค่รอ
+        if config.memory_metrics_interval <= 0:
+            continue
+        try:
+            report = await measure_memory()  # วัด
+            await asyncio.to_thread(MemoryInspector.append_metrics, config.memory_metrics_file, report)  # ต่อท้าย JSONL
+        except Exception as e:
+            print(f"Memory metrics error: {e}")  # log
+
+
+def format_memory_report(report: Dict[str, Any], guild_id: Optional[int] = None, limit: int = 12) -> str:  # รายงานสำหรับ Discord (< 2000 ตัวอักษร)
+    games_count = report["counts"].get("games", {})  # จำนวนเกม
+    cache = report["counts"].get("discord", {})  # cache ของ discord
+    runtime = report["counts"].get("runtime", {})  # profile + loop
+    guilds = report.get("guilds", {})  # ต่อ guild
+    here = guilds.get(str(guild_id), {})  # ของ server นี้ (ไม่แสดง guild อื่น)
+    lines = [
+        f"🧠 RSS {format_bytes(report['rss'])} | estimated in {report['elapsed_ms']:.0f}ms (sampled) | "
+        f"profile {runtime.get('profile', '?')}, {runtime.get('loop', '?')} loop",
+        f"🎮 Games: {games_count.get('total', 0)} ({games_count.get('active', 0)} active, {games_count.get('idle', 0)} idle, "
+        f"{games_count.get('idle_1h', 0)} idle > 1h) in {len(guilds)} servers",
+        f"🏠 This server: {here.get('games', 0)} games, {here.get('words', 0)} words, ~{format_bytes(here.get('bytes', 0.0))}",
+        f"💬 Discord cache: {cache.get('messages', 0)} messages, {cache.get('users', 0)} users, {cache.get('guilds', 0)} guilds",
+        "```",
+    ]
+    for row in report["structures"][:limit]:  # ใหญ่สุดก่อน
+        size = f"error: {row['error'][:40]}" if "error" in row else format_bytes(row["bytes"]) + ("+" if row["truncated"] else "")
+        items = "" if row.get("items") is None else f"{row['items']} items"
+        lines.append(f"{row['name']:<24}{size:>10}  {items}")
+    lines.append("```")
+    if report.get("allocations"):  # กำลัง trace -> โตขึ้นจาก baseline ตรงไหน
+        lines.append("📈 Since baseline:")
+        for stat in report["allocations"][:5]:
+            lines.append(f"`{stat['where']}` {'+' if stat['size_diff'] >= 0 else '-'}{format_bytes(abs(stat['size_diff']))} ({stat['count_diff']:+d} blocks)")
+    return "\n".join(lines)[:1990]
+
+
+# ---------------------------
+# Hot reload (build off-loop, swap atomically)
+# ---------------------------
+
+def build_reload_bundle(force_words: bool) -> Tuple[GameConfig, Optional[ChainGraph], Optional[Any], Optional[str]]:  # สร้างของใหม่ทั้งหมดใน thread
+    load_dotenv(override=True)  # อ่าน .env ใหม่ (เผื่อเปลี่ยน key)
+    new_config = GameConfig()  # อ่าน config.json + env
+    if not new_config.validate():  # ค่าผิด -> ไม่สร้างอย่างอื่นต่อ
+        return new_config, None, None, None  # คืนแค่ config
+
+    words = None  # ไม่ต้องโหลดคำใหม่ถ้าไฟล์ไม่เปลี่ยน
+    if force_words or new_config.words_file != config.words_file or new_config.default_language != config.default_language:  # เปลี่ยนไฟล์/ภาษา หรือสั่งโหลดใหม่
+        language = get_language(new_config.default_language)  # ภาษาหลักใหม่
+        words = load_language_graph(dictionary_path(language.code, new_config), language)  # index ใหม่ของภาษาหลัก
+
+    client = None  # ไม่ต้องสร้าง client ใหม่ถ้า key เดิม
+    api_key = os.getenv("OPENROUTER_API_KEY")  # key ล่าสุด
+    if api_key and api_key != OPENROUTER_API_KEY and openai_client is not None:  # key เปลี่ยน และเคยสร้าง client แล้ว
+        client = build_openai_client(api_key)  # client ใหม่ (ถ้ายังไม่เคยสร้าง จะสร้างแบบ lazy ด้วย key ใหม่เอง)
+    return new_config, words, client, api_key  # คืนทั้งหมด
+
+
+async def reload_runtime_config(force_words: bool = True) -> bool:  # reload config + ของที่ขึ้นกับ config
+    global word_validator, admission, openai_client, OPENROUTER_API_KEY  # ของที่จะสลับ
+    async with reload_lock:  # กัน reload ซ้อน
+        new_config, words, client, api_key = await asyncio.to_thread(build_reload_bundle, force_words)  # สร้างทั้งหมดนอก loop
+        if not new_config.validate():  # ค่าผิด -> ไม่สลับอะไรเลย
+            return False  # ล้มเหลว
+
+        # สลับทุกอย่างในช่วงเดียว (ไม่มี await คั่น) ให้ทุก handler เห็นชุดเดียวกัน
+        if words is not None:  # มีชุดคำใหม่
+            dictionaries.replace({new_config.default_language: words})  # สลับ dictionary ภาษาหลัก (ภาษาอื่นโหลดใหม่เมื่อใช้, counts ของแต่ละห้องสร้างใหม่เอง)
+        if client is not None:  # มี client ใหม่
+            openai_client = client  # สลับ AI client
+        if api_key:  # มี key
+            OPENROUTER_API_KEY = api_key  # จำ key ล่าสุด
+        config.swap(new_config)  # publish snapshot ใหม่
+        word_validator = build_validation_pipeline(new_config)  # sources + cache ใหม่ (wordlist ของ server โหลดใหม่เมื่อใช้)
+        admission = build_admission(new_config)  # rate ใหม่ (bucket เริ่มเต็ม)
+        score_sink.path = config.scores_file  # อัปเดตไฟล์คะแนนตาม config ใหม่
+        rulebook.configure(new_config.rule_escalation_step, new_config.rule_escalation_max)  # ค่า escalate ใหม่
+    await asyncio.to_thread(load_themes_sync)  # หมวดคำใหม่ (index ของหมวดสร้างใหม่เมื่อใช้)
+    loaded = ", ".join(f"{code}: {n} words" for code, n in dictionaries.loaded().items())  # dictionary ที่โหลดอยู่
+    print(f"Configuration v{config.version} loaded ({loaded or 'no dictionaries'})")  # log
+    return True  # สำเร็จ
+
+
+def watched_config_paths() -> List[str]:  # ไฟล์ที่ต้องเฝ้า
+    extra = [dictionary_path(code) for code in dictionaries.loaded() if code != config.default_language]  # dictionary ภาษาอื่นที่ใช้อยู่
+    return [CONFIG_FILE, config.words_file, *extra]  # config.json + words file ปัจจุบัน
+
+
+async def on_watched_files_changed(paths: Set[str]):  # callback เมื่อไฟล์เปลี่ยน (หลัง debounce)
+    words_changed = bool(paths - {CONFIG_FILE})  # ไฟล์คำ (ภาษาใดก็ได้) เปลี่ยนไหม
+    ok = await reload_runtime_config(force_words=words_changed)  # reload
+    if not ok:  # validate ไม่ผ่าน
+        print("Config change ignored: validation failed")  # log
+
+
+def start_config_watcher():  # เริ่ม watcher ถ้าเปิดใน config
+    global config_watcher  # ใช้ global
+    if config_watcher is not None or not config.config_watch:  # เริ่มแล้ว หรือปิดไว้
+        return  # จบ
+    config_watcher = FileWatcher(
+        watched_config_paths,
+        on_watched_files_changed,
+        interval=config.config_watch_interval,
+        debounce=config.config_watch_debounce,
+    )  # สร้าง watcher
+    config_watcher.start()  # เริ่ม
+
+
+# ---------------------------
+# Tournaments
+# ---------------------------
+
+bracket_store = BracketStore(config.tournament_file)  # bracket + ผลแมตช์ลง SQLite
+tournaments: Dict[int, Tournament] = {}  # {host channel_id: ทัวร์นาเมนต์ที่ยังไม่จบ}
+match_routes: Dict[Tuple[int, int], Match] = {}  # {(channel_id, player_id): แมตช์ที่กำลังเล่น}
+
+
+def load_brackets_sync():  # ทัวร์ที่ค้างจาก process ก่อน resume ไม่ได้ -> mark interrupted (sync, รันใน thread)
+    interrupted = bracket_store.mark_interrupted()  # อัปเดตสถานะ
+    if interrupted:
+        print(f"Marked {interrupted} unfinished tournament(s) as interrupted")  # log
+
+
+async def save_bracket(t: Tournament, matches: List[Match] = ()):  # เขียน bracket ลง SQLite ใน thread
+    try:
+        await asyncio.to_thread(bracket_store.write, t, list(matches))  # ไม่ block loop
+    except Exception as e:
+        print(f"Tournament save error: {e}")  # log
+
+
+def match_name(t: Tournament, player_id: int) -> str:  # ชื่อผู้เล่นในทัวร์ (escape แล้ว)
+    return discord.utils.escape_markdown(t.names.get(player_id, f"User {player_id}"))  # ชื่อตอนสมัคร
+
+
+def schedule_match_turn(match: Match):  # เริ่มนับเวลาเทิร์นใหม่ของแมตช์
+    deadline_scheduler.cancel(match.timer)  # ยกเลิก timer เดิม (lazy)
+    match.turn_token += 1  # token ใหม่ กัน timeout เก่ายิงซ้อน
+    match.timer = deadline_scheduler.call_later(config.tournament_turn_seconds, on_match_timeout, match, match.turn_token)  # deadline ใน heap
+
+
+def on_match_timeout(match: Match, token: int):  # callback จาก scheduler (sync, บน loop)
+    if match.finished or token != match.turn_token:  # ตอบทันแล้ว / แมตช์จบแล้ว
+        return  # จบ
+    loser = match.current_player()  # คนที่หมดเวลาแพ้
+    match.finish(match.opponent(loser), "timeout")  # อีกฝ่ายชนะ
+    asyncio.create_task(finish_match(match))  # ประกาศผล + เดินรอบถัดไป
+
+
+async def launch_matches(channel: discord.abc.Messageable, t: Tournament, matches: List[Match]):  # เปิดแมตช์ทั้งรอบ (thread ละแมตช์)
+    now = time.time()  # เวลาเริ่ม
+    byes = [m for m in matches if m.finished]  # คนที่ได้ bye
+    for match in byes:
+        await send_message(channel, f"🎟️ Round {match.round}: {match_name(t, match.winner)} advances with a bye.")  # แจ้ง
+    for match in matches:
+        if match.finished:  # bye ไม่ต้องเล่น
+            continue
+        a, b = match.players  # ผู้เล่นสองคน
+        title = f"R{match.round} M{match.slot}: {t.names.get(a, a)} vs {t.names.get(b, b)}"[:100]  # ชื่อ thread (Discord จำกัด 100)
+        target = channel  # ค่าเริ่มต้น: เล่นในห้องหลัก
+        if config.tournament_threads and hasattr(channel, "create_thread"):  # แยก thread ต่อแมตช์
+            try:
+                target = await channel.create_thread(name=title, type=discord.ChannelType.public_thread, auto_archive_duration=60)  # สร้าง thread
+            except discord.HTTPException as e:
+                print(f"Tournament thread error: {e}")  # ไม่มีสิทธิ์ -> เล่นในห้องหลัก
+        match.channel_id = target.id  # ห้องของแมตช์
+        match.started_at = now  # เวลาเริ่ม
+        match.points = {a: 0, b: 0}  # คะแนนในแมตช์
+        for player in match.players:
+            match_routes[(target.id, player)] = match  # ส่งข้อความของผู้เล่นในห้องนี้ไปที่แมตช์
+        await send_message(
+            target,
+            f"⚔️ {match_name(t, a)} vs {match_name(t, b)} — first to lead after {config.tournament_match_words} words wins. "
+            f"{config.tournament_turn_seconds}s per turn. {match_name(t, a)} starts with any word!",
+        )  # แจ้งเริ่มแมตช์
+        schedule_match_turn(match)  # เริ่มนับเวลา
+
+
+async def finish_round_if_done(channel: discord.abc.Messageable, t: Tournament):  # รอบครบแล้ว -> รอบถัดไปหรือประกาศแชมป์
+    if t.status != "running":  # ยกเลิก/จบไปแล้ว
+        return  # จบ
+    next_round = t.advance()  # [] ถ้ารอบยังไม่ครบ หรือได้แชมป์แล้ว
+    if t.champion is not None:  # ได้แชมป์
+        tournaments.pop(t.channel_id, None)  # ปลดทัวร์ออกจากห้อง
+        await save_bracket(t)  # เซฟสถานะสุดท้าย
+        await send_message(channel, f"🏆 {match_name(t, t.champion)} wins the tournament!")  # ประกาศ
+        return  # จบ
+    if next_round:  # รอบใหม่
+        await save_bracket(t, [m for m in next_round if m.finished])  # เซฟ bracket (+ bye)
+        await send_message(channel, f"📣 Round {len(t.rounds)} begins: {len(next_round)} match(es).")  # แจ้ง
+        await launch_matches(channel, t, next_round)  # เปิดแมตช์
+
+
+async def finish_match(match: Match):  # แมตช์จบ (ชนะด้วยคะแนนหรือ timeout)
+    deadline_scheduler.cancel(match.timer)  # หยุด timer
+    match.timer = None  # เคลียร์
+    for player in match.players:
+        match_routes.pop((match.channel_id, player), None)  # ข้อความหลังจากนี้ไม่เข้าแมตช์แล้ว
+    t = next((t for t in tournaments.values() if t.id == match.tournament_id), None)  # ทัวร์ของแมตช์
+    if t is None:  # ถูกยกเลิกไปแล้ว
+        return  # จบ
+    host = bot.get_channel(t.channel_id)  # ห้องหลัก
+    room = bot.get_channel(match.channel_id) or host  # ห้อง/thread ของแมตช์
+    score = " - ".join(str(match.points.get(p, 0)) for p in match.players)  # สกอร์
+    text = f"🏁 {match_name(t, match.winner)} beats {match_name(t, match.opponent(match.winner))} ({score}, {match.reason})."  # ผล
+    if room is not None:
+        await send_message(room, text)  # แจ้งในแมตช์
+    if host is not None and host is not room:
+        await send_message(host, f"R{match.round} M{match.slot}: {text}")  # แจ้งในห้องหลัก
+    await save_bracket(t, [match])  # เซฟผลแมตช์
+    if host is not None:
+        await finish_round_if_done(host, t)  # อาจเปิดรอบถัดไป
+
+
+async def handle_match_message(message: discord.Message) -> bool:  # ข้อความในแมตช์ทัวร์ (True = ใช้ข้อความนี้แล้ว)
+    match = match_routes.get((message.channel.id, message.author.id))  # แมตช์ของคนนี้ในห้องนี้
+    if match is None or match.finished:  # ไม่ได้อยู่ในแมตช์
+        return False  # ให้เกมปกติจัดการ
+    if match.current_player() != message.author.id:  # ไม่ใช่ตา (ไม่ตอบ กัน spam ในแมตช์)
+        return True  # ใช้ข้อความแล้ว
+    t = next((t for t in tournaments.values() if t.id == match.tournament_id), None)  # ทัวร์ของแมตช์
+    if t is None:
+        return True  # ทัวร์ถูกยกเลิก
+    language = get_language(t.language)  # ภาษาของทัวร์
+    word = normalize_word(message.content, language)  # normalize
+    token = match.turn_token  # token เทิร์นนี้ (เช็คซ้ำหลัง await)
+
+    if not is_valid_word_basic(word, language):  # รูปแบบผิด
+        await send_message(message.channel, "Please enter a valid word.")  # แจ้ง
+        return True  # จบ
+    if word in match.used:  # ซ้ำ
+        await send_message(message.channel, "Word already used!")  # แจ้ง
+        return True  # จบ
+    if match.words and language.first_letter(word) != language.last_letter(match.words[-1]):  # ต่อไม่ได้
+        await send_message(message.channel, f"Word must start with '{language.last_letter(match.words[-1])}'.")  # แจ้ง
+        return True  # จบ
+    guild_id = getattr(message.guild, "id", None)  # wordlist ของ server
+    if not await is_valid_dictionary_word(word, t.language, guild_id):  # ไม่มีใน dictionary
+        await send_message(message.channel, f"Not a valid {language.name} word.")  # แจ้ง
+        return True  # จบ
+    if match.finished or token != match.turn_token:  # หมดเวลาระหว่างตรวจคำ
+        return True  # จบ
+
+    cfg = config.snapshot()  # config เดียวตลอดการคิดคะแนน
+    points = 1 + (cfg.long_word_bonus if len(word) >= cfg.long_word_len else 0)  # คะแนน + โบนัสคำยาว
+    match.words.append(word)  # เพิ่มใน chain
+    match.used.add(word)  # mark used
+    match.points[message.author.id] = match.points.get(message.author.id, 0) + points  # บวกคะแนนในแมตช์
+    match.turn += 1  # สลับตา
+
+    leader = match.leader()  # คนที่นำ (None = เสมอ)
+    if len(match.words) >= cfg.tournament_match_words and leader is not None:  # ครบจำนวนคำและมีคนนำ (เสมอ -> เล่นต่อจนมีคนหมดเวลา)
+        match.finish(leader, "points")  # จบด้วยคะแนน
+        await finish_match(match)  # ประกาศผล
+        return True  # จบ
+
+    schedule_match_turn(match)  # เทิร์นใหม่
+    await send_message(
+        message.channel,
+        f"✅ '{word}' (+{points}). Next: {match_name(t, match.current_player())}, starts with '{language.last_letter(word)}'.",
+    )  # แจ้ง
+    return True  # จบ
 
 
 # ---------------------------
 # Events
 # ---------------------------
 
-@bot.event
-async def on_ready():  # บอทพร้อม
-    global SCORES_FILE, http_session  # ใช้ scores_file และ http_session global
-    SCORES_FILE = config.scores_file  # กำหนดไฟล์คะแนนจาก config ปัจจุบัน
-    load_scores_sync()  # โหลดคะแนน
-    http_session = aiohttp.ClientSession()  # สร้าง session ครั้งเดียว
-    await load_valid_words_async()  # โหลด wordlist
+async def create_http_session():  # สร้าง session ครั้งเดียว (ต้องสร้างบน loop)
+    global http_session  # ใช้ global
+    if http_session is None or http_session.closed:  # ยังไม่มี
+        http_session = aiohttp.ClientSession()  # สร้าง
+
+
+async def start_background_tasks():  # เริ่ม task เบื้องหลัง (ครั้งเดียว)
+    asyncio.create_task(cleanup_inactive_games())  # Start cleanup task for inactive games
+    start_loop_watchdog()  # เริ่ม watchdog วัด loop lag
+    start_config_watcher()  # เริ่มเฝ้าไฟล์ config (ถ้าเปิด)
+    if config.checkpoint_interval > 0:  # เปิด checkpoint
+        asyncio.create_task(checkpoint_loop())  # เริ่ม checkpoint เป็นระยะ
+    asyncio.create_task(leaderboard_flush_loop())  # เขียน leaderboard partition เป็นระยะ
+    history_store.start()  # เขียน history เป็น batch เป็นระยะ
+    score_sink.start()  # เขียน scores.json เบื้องหลังเมื่อคะแนนเปลี่ยน
+    deadline_scheduler.start()  # timer รวม: แมตช์ทัวร์นาเมนต์ + สรุป join/leave (task เดียว)
+    if traffic_recorder is not None:  # เปิด capture
+        traffic_recorder.start()  # เขียน capture เป็นระยะ
+    if config.memory_metrics_interval > 0:  # เปิด metrics memory
+        asyncio.create_task(memory_metrics_loop())  # รายงานเป็นระยะ
+    if config.spectator_enabled:  # เปิด feed ผู้ชม
+        try:
+            await spectator_server.start()  # ฟังที่ spectator_host:spectator_port
+        except OSError as e:
+            print(f"Spectator feed error: {e}")  # port ถูกใช้อยู่ ฯลฯ -> เกมยังเล่นได้ตามปกติ
+
+
+startup = StartupPipeline(PROCESS_START)  # ขั้นตอน startup (รันครั้งเดียวต่อ process)
+startup.add_group(  # โหลดพร้อมกัน: คะแนน (thread) + dictionary (thread) + http session
+    ("scores", load_scores_and_leaderboards),
+    ("words", load_valid_words_async),
+    ("http_session", create_http_session),
+    ("checkpoint", load_checkpoint_sync),
+    ("tournaments", load_brackets_sync),
+    ("themes", load_themes_sync),
+)
+startup.add_group(("background_tasks", start_background_tasks), ("resume_games", resume_active_games))  # แล้วค่อยเริ่ม task เบื้องหลัง + resume เกม
 
-    # Start cleanup task for inactive games
-    asyncio.create_task(cleanup_inactive_games())
 
+@bot.event
+async def on_ready():  # บอทพร้อม (ถูกเรียกซ้ำทุกครั้งที่ reconnect)
+    if startup.done:  # เคย startup แล้ว -> แค่ reconnect
+        print("Bot reconnected")  # log
+        return  # ไม่โหลดซ้ำ ไม่สร้าง session/task ซ้ำ
+    await startup.run()  # รันครั้งเดียว (เรียกซ้อนก็รอผลเดิม)
+    print(startup.report())  # รายงานเวลาแต่ละขั้น
     print("Bot is ready")  # log
 
 
@@ -616,13 +1553,29 @@ async def on_ready():  # บอทพร้อม
 async def on_message(message: discord.Message):  # รับข้อความ
     if message.author == bot.user:  # กัน loop
         return  # จบ
+    if traffic_recorder is not None:  # เปิด capture
+        traffic_recorder.record(message)  # แค่ต่อท้าย buffer (เขียนไฟล์เบื้องหลัง)
+
+    state = games.get(message.channel.id)  # ห้องที่มีเกม (ไม่สร้าง state ใหม่)
+    if state is not None and state.active:  # กัน flood เฉพาะห้องที่กำลังเล่น ก่อน parse อะไรทั้งสิ้น
+        uid, _ = current_player_info(state)  # คนที่ถึงตา
+        is_command = message.content.startswith(config.command_prefix)  # command ยังผ่านได้ตอน degraded
+        if not admission.admit(message.channel.id, message.author.id, uid == message.author.id, is_command):  # เกิน rate
+            return  # ทิ้งเงียบ ๆ
 
+    with tracer.start_trace("on_message", channel_id=message.channel.id):  # root span (head sampling)
+        await handle_message(message)  # ประมวลผลข้อความ
+
+
+async def handle_message(message: discord.Message):  # ประมวลผลข้อความ (command หรือคำในเกม)
     # ให้ command ทำงานก่อน (รองรับ mention prefix + prefix ปัจจุบัน)
-    await bot.process_commands(message)  # สำคัญ
+    with tracer.span("process_commands"):  # วัดเวลา command framework
+        await bot.process_commands(message)  # สำคัญ
 
     # ถ้าเป็น command (prefix หรือ mention) ให้หยุด ไม่เอาเข้าเกม
     try:
-        prefixes = await bot.get_prefix(message)  # ได้ list ของ prefix (รวม mention)
+        with tracer.span("get_prefix"):  # วัดเวลาหา prefix
+            prefixes = await bot.get_prefix(message)  # ได้ list ของ prefix (รวม mention)
         if isinstance(prefixes, str):  # กันกรณีเป็นสตริง
             prefixes = [prefixes]  # ทำเป็น list
         if any(message.content.startswith(p) for p in prefixes):  # เช็คทุก prefix
@@ -632,6 +1585,9 @@ async def on_message(message: discord.Message):  # รับข้อควา
         if message.content.startswith(config.command_prefix):  # เช็ค prefix ปกติ
             return  # จบ
 
+    if match_routes and await handle_match_message(message):  # ข้อความในแมตช์ทัวร์นาเมนต์
+        return  # จบ
+
     state = get_game(message.channel.id)  # state ห้อง
     if not state.active:  # เกมไม่ active
         return  # จบ
@@ -654,14 +1610,20 @@ async def on_message(message: discord.Message):  # รับข้อควา
             if now - last_quiet < 5.0:  # cooldown 5 วินาทีสำหรับข้อความนี้
                 return  # เงียบ ๆ ไม่ส่งข้อความซ้ำ
             not_your_turn_cooldowns[message.author.id] = now  # อัปเดตเวลา
+        if not admission.should_reply(message.channel.id, message.author.id):  # ห้องนี้ตอบ error ไปเยอะแล้ว
+            return  # เงียบ
 
         name = state.player_names.get(uid, f"User {uid}") if uid is not None else (ai_name or "Unknown")  # ชื่อคนที่ถึงตา
         name = discord.utils.escape_markdown(name)  # escape
         await message.channel.send(f"🚫 Not your turn. It's {name}'s turn!", allowed_mentions=allowed_mentions_none)  # แจ้ง
         return  # จบ
 
+    async def reply(text: str):  # error ของคำ: ตอบซ้ำไม่ได้ภายใน cooldown (กันบอท spam ตาม)
+        if admission.should_reply(message.channel.id, message.author.id):
+            await send_message(message.channel, text)  # ส่ง
+
     # ถึงตาแล้ว ไม่ใช้ cooldown เพื่อไม่ block การเล่น
-    await process_word_submission(message.channel, message.content, state, player_id=message.author.id, ai_player=None)  # ประมวลผลคำ
+    await actors.get(message.channel.id).ask(submit_player_word, message.channel, state, message.author.id, message.content, reply)  # ประมวลผลคำตามลำดับในห้อง
 
 
 @bot.event
@@ -679,116 +1641,166 @@ async def on_error(event, *args, **kwargs):  # log error ระดับ event
 # Commands
 # ---------------------------
 
+def in_channel_actor(func):  # รันคำสั่งใน actor ของห้อง (เรียงคิวเดียวกับคำที่ส่งมาและ timeout)
+    @functools.wraps(func)
+    async def wrapper(ctx, *args, **kwargs):
+        return await actors.get(ctx.channel.id).ask(func, ctx, *args, **kwargs)  # รอผลเหมือนเรียกตรง
+    return wrapper
+
+
 @bot.command()
+@in_channel_actor
 async def start_game(ctx):  # เริ่มเกม
     state = get_game(ctx.channel.id)  # state ห้อง
+    await update_state_activity(state)  # track activity
 
-    async with state._lock:  # lock เพื่อแก้ไข state อย่างปลอดภัย
-        await update_state_activity(state)  # track activity
-
-        state.active = True  # เปิดเกม
+    state.active = True  # เปิดเกม
 
-        # reset เกมในห้อง
-        state.word_chain = []  # รีเซ็ตคำ
-        state.used_words = set()  # รีเซ็ต used
-        state.player_streaks = {}  # รีเซ็ต streak
-        state.combo_count = 0  # รีเซ็ต combo
-        state.turn_seconds = config.turn_seconds  # ใช้ค่าจาก config ล่าสุด
-        state.current_idx = 0  # เริ่มที่คนแรก
-        state.turn_token += 1  # bump token เพื่อกัน task เก่าทับ
+    # reset เกมในห้อง
+    finalize_game_history(state, ctx.channel, "restarted")  # เก็บ chain เดิมเข้า history ก่อนล้าง
+    state.word_chain = []  # รีเซ็ตคำ
+    state.used_words = set()  # รีเซ็ต used
+    state.chain_counts = None  # นับใหม่
+    state.player_streaks = {}  # รีเซ็ต streak
+    state.combo_count = 0  # รีเซ็ต combo
+    state.turn_seconds = config.turn_seconds  # ใช้ค่าจาก config ล่าสุด
+    state.roster.rewind()  # เริ่มที่คนที่ join ก่อนสุด
+    state.turn_token += 1  # bump token เพื่อกัน task เก่าทับ
 
-        await cancel_turn_timer_async(state)  # ยกเลิก timer เก่า
+    await cancel_turn_timer_async(state)  # ยกเลิก timer เก่า
 
-        tp = total_players(state)  # จำนวนผู้เล่นทั้งหมด
-        if tp == 0:  # ไม่มีผู้เล่น
-            await ctx.send("🎮 Game started, but no players yet. Use !join or !add_ai", allowed_mentions=allowed_mentions_none)  # แจ้ง
-            return  # จบ
+    tp = total_players(state)  # จำนวนผู้เล่นทั้งหมด
+    if tp == 0:  # ไม่มีผู้เล่น
+        await ctx.send("🎮 Game started, but no players yet. Use !join or !add_ai", allowed_mentions=allowed_mentions_none)  # แจ้ง
+        return  # จบ
 
-        await ctx.send("🎮 Word chain started in this channel! Use !join / !add_ai then play in turn.", allowed_mentions=allowed_mentions_none)  # แจ้งเริ่ม
-        await send_turn_prompt(ctx.channel, state)  # ส่ง prompt
-        await start_turn_timer(ctx.channel, state)  # เริ่ม timer
+    await ctx.send("🎮 Word chain started in this channel! Use !join / !add_ai then play in turn.", allowed_mentions=allowed_mentions_none)  # แจ้งเริ่ม
+    event_bus.publish("game", ctx.channel.id, status="started", language=state.language, rule=state.rule, players=tp)  # แจ้งผู้ชม
+    await send_turn_prompt(ctx.channel, state)  # ส่ง prompt
+    await start_turn_timer(ctx.channel, state)  # เริ่ม timer
 
 
 @bot.command()
 @commands.has_permissions(manage_guild=True)
+@in_channel_actor
 async def end_game(ctx):  # จบเกม (admin only)
     state = get_game(ctx.channel.id)  # state ห้อง
     state.active = False  # ปิดเกม
+    finalize_game_history(state, ctx.channel, "ended")  # เก็บเกมเข้า history
     state.turn_token += 1  # bump token เพื่อให้ task เก่าหยุดเอง
     await cancel_turn_timer_async(state)  # ยกเลิก timer
-    state.turn_message = None  # เคลียร์ message อ้างอิง
+    state.turn_message_id = None  # เคลียร์ message อ้างอิง
+    event_bus.publish("game", ctx.channel.id, status="ended", chain=len(state.word_chain))  # แจ้งผู้ชม
     await ctx.send("🛑 Game ended in this channel.", allowed_mentions=allowed_mentions_none)  # แจ้งจบ
 
 
-@bot.command()
-async def join(ctx):  # เข้าร่วมเกม
-    state = get_game(ctx.channel.id)  # state ห้อง
-    uid = ctx.author.id  # id ผู้ใช้
+def summarize_names(names: List[str], limit: int = 5) -> str:  # "a, b, c +12 more"
+    shown = ", ".join(discord.utils.escape_markdown(n) for n in names[:limit])  # แสดงไม่กี่ชื่อ
+    return shown + (f" +{len(names) - limit} more" if len(names) > limit else "")  # ที่เหลือบอกเป็นจำนวน
+
+
+def queue_roster_notice(channel: discord.abc.Messageable, state: GameState, name: str, joined: bool) -> bool:  # True = รวมไว้ประกาศเป็นรอบ, False = ผู้เรียกประกาศเอง
+    threshold = config.roster_batch_threshold  # ห้องที่มีคนเท่านี้ขึ้นไปรวมประกาศ
+    if threshold <= 0 or (len(state.roster) < threshold and not state.roster_joined and not state.roster_left):  # ห้องเล็ก -> ประกาศทันทีเหมือนเดิม
+        return False
+    (state.roster_joined if joined else state.roster_left).append(name)  # เก็บไว้สรุป
+    if state.roster_flush is None:  # ยังไม่มีรอบสรุป -> นัดไว้ใน scheduler รวม (ไม่สร้าง task ต่อห้อง)
+        state.roster_flush = deadline_scheduler.call_later(config.roster_announce_interval, post_roster_summary, channel, state)
+    return True
+
+
+def post_roster_summary(channel: discord.abc.Messageable, state: GameState):  # callback ของ scheduler (บน loop) -> ส่งเข้า actor ของห้อง
+    actors.get(channel.id).tell(flush_roster_summary, channel, state)
 
-    if uid in state.players:  # กัน join ซ้ำ
-        await ctx.send("You're already in this channel's game!", allowed_mentions=allowed_mentions_none)  # แจ้ง
+
+async def flush_roster_summary(channel: discord.abc.Messageable, state: GameState):  # ส่งสรุป join/leave ข้อความเดียว (รันใน actor)
+    state.roster_flush = None  # รอบถัดไปนัดใหม่ได้
+    joined, left = state.roster_joined, state.roster_left  # ของที่สะสมไว้
+    state.roster_joined, state.roster_left = [], []  # เริ่มรอบใหม่
+    parts = []  # ส่วนของข้อความ
+    if joined:
+        parts.append(f"➕ {len(joined)} joined ({summarize_names(joined)})")
+    if left:
+        parts.append(f"➖ {len(left)} left ({summarize_names(left)})")
+    if parts:  # มีอะไรให้ประกาศ
+        await send_message(channel, " | ".join(parts) + f". 👥 {len(state.roster)} players in this game.")  # ข้อความเดียวต่อรอบ
+
+
+async def hand_over_turn(channel: discord.abc.Messageable, state: GameState, was_turn: bool):  # หลังมีคนออก: รีสตาร์ทเทิร์นเฉพาะตอนคนที่ถึงตาออก
+    if total_players(state) == 0:  # ไม่มีใครเหลือ
+        state.turn_token += 1  # bump token ให้ task เก่าหยุด
+        await cancel_turn_timer_async(state)  # ไม่มีคนก็หยุด timer
         return  # จบ
+    if state.active and was_turn:  # คนที่ถึงตาออก -> ตาเป็นของคนถัดไป (ตาของคนอื่นไม่ถูกรีเซ็ต)
+        state.turn_token += 1  # bump token เพื่อกัน timer เดิมทับ
+        await cancel_turn_timer_async(state)  # ยกเลิก timer เดิม
+        await send_turn_prompt(channel, state)  # prompt ใหม่
+        await start_turn_timer(channel, state)  # timer ใหม่
 
+
+async def add_player(state: GameState, user: discord.abc.User) -> Optional[str]:  # เพิ่มผู้เล่น (None = สำเร็จ, "" = เงียบ, อื่น ๆ = error)
+    uid = user.id  # id ผู้ใช้
+    if uid in state.roster:  # กัน join ซ้ำ (O(1))
+        return "You're already in this channel's game!"  # error
     if uid in state.joining_users:  # กัน join ซ้อน
-        return  # จบ
+        return ""  # เงียบ
 
     state.joining_users.add(uid)  # mark กำลัง join
     try:
-        state.players.append(uid)  # เพิ่มผู้เล่น
-        state.player_names[uid] = ctx.author.display_name  # เก็บชื่อใน state
-        async with display_names_lock:
-            user_display_names[uid] = ctx.author.display_name  # เก็บชื่อ global สำหรับ leaderboard
-        await ctx.send(f"➕ {ctx.author.display_name} joined this channel's game!", allowed_mentions=allowed_mentions_none)  # แจ้ง
+        state.roster.add(uid)  # ต่อท้ายลำดับ (O(1), ไม่กระทบเทิร์นที่กำลังเดิน)
+        state.player_names[uid] = user.display_name  # เก็บชื่อใน state
+        names.remember(str(uid), user.display_name)  # เก็บชื่อสำหรับ leaderboard (คงอยู่หลัง restart)
     finally:
         state.joining_users.discard(uid)  # unmark
+    return None  # สำเร็จ
 
-    # ถ้าเกม active และผู้เล่นคนแรก -> เริ่ม prompt/timer
-    if state.active and total_players(state) == 1:  # คนแรกในห้อง
-        state.current_idx = 0  # ให้เริ่มที่คนแรก
-        await send_turn_prompt(ctx.channel, state)  # prompt
-        await start_turn_timer(ctx.channel, state)  # timer
+
+async def prompt_first_player(channel: discord.abc.Messageable, state: GameState):  # ถ้าเกม active และผู้เล่นคนแรก -> เริ่ม prompt/timer
+    if state.active and total_players(state) == 1:  # คนแรกในห้อง (roster ตั้งให้ถึงตาอยู่แล้ว)
+        await send_turn_prompt(channel, state)  # prompt
+        await start_turn_timer(channel, state)  # timer
 
 
 @bot.command()
+@in_channel_actor
+async def join(ctx):  # เข้าร่วมเกม
+    state = get_game(ctx.channel.id)  # state ห้อง
+    error = await add_player(state, ctx.author)  # เพิ่มผู้เล่น
+    if error is not None:  # เข้าไม่ได้
+        if error:
+            await ctx.send(error, allowed_mentions=allowed_mentions_none)  # แจ้ง
+        return  # จบ
+    if not queue_roster_notice(ctx.channel, state, ctx.author.display_name, joined=True):  # ห้องเล็ก -> แจ้งทันที
+        await ctx.send(f"➕ {ctx.author.display_name} joined this channel's game!", allowed_mentions=allowed_mentions_none)  # แจ้ง
+    await prompt_first_player(ctx.channel, state)  # เริ่มเทิร์นถ้าเป็นคนแรก
+
+
+@bot.command()
+@in_channel_actor
 async def leave(ctx):  # ออกจากเกม
     state = get_game(ctx.channel.id)  # state ห้อง
     uid = ctx.author.id  # id ผู้ใช้
 
-    if uid not in state.players:  # ไม่ได้อยู่ในเกม
+    if uid not in state.roster:  # ไม่ได้อยู่ในเกม (O(1))
         await ctx.send("You're not in this channel's game.", allowed_mentions=allowed_mentions_none)  # แจ้ง
         return  # จบ
 
-    idx = state.players.index(uid)  # index ในลิสต์ human (ฐาน global ก็เท่ากันเพราะ human อยู่ต้น)
-    removed_global_idx = idx  # global index ในลิสต์รวม (human อยู่ช่วงแรก)
-
-    state.players.remove(uid)  # ลบออก
+    was_turn = state.roster.remove(uid)  # ลบออก O(1) (ถ้าถึงตาเขา ตาเลื่อนไปคนถัดไป)
     state.player_names.pop(uid, None)  # ลบชื่อที่เก็บ
     state.player_streaks.pop(uid, None)  # ลบ streak
 
-    tp = total_players(state)  # จำนวนผู้เล่นหลังลบ
-    if tp > 0:  # ยังมีผู้เล่น
-        # ถ้าคนที่ออกอยู่ก่อน current_idx -> ลด current_idx ลง
-        if removed_global_idx < state.current_idx:  # เทียบฐานเดียวกันแล้ว
-            state.current_idx -= 1  # เลื่อนกลับ
-        state.current_idx %= tp  # mod ด้วยจำนวนรวม (รวม AI)
-    else:
-        state.current_idx = 0  # รีเซ็ต
-        state.turn_token += 1  # bump token ให้ task เก่าหยุด
-        await cancel_turn_timer_async(state)  # ไม่มีคนก็หยุด timer
-
-    await ctx.send(f"➖ {ctx.author.display_name} left this channel's game!", allowed_mentions=allowed_mentions_none)  # แจ้ง
-
-    # ถ้าเกม active และยังมีคน -> รีสตาร์ท prompt/timer (กันค้างเทิร์น)
-    if state.active and tp > 0:  # ยังเล่นได้
-        state.turn_token += 1  # bump token เพื่อกัน timer เดิมทับ
-        await cancel_turn_timer_async(state)  # ยกเลิก timer เดิม (ถ้ามี)
-        await send_turn_prompt(ctx.channel, state)  # prompt ใหม่
-        await start_turn_timer(ctx.channel, state)  # timer ใหม่
+    if not queue_roster_notice(ctx.channel, state, ctx.author.display_name, joined=False):  # ห้องเล็ก -> แจ้งทันที
+        await ctx.send(f"➖ {ctx.author.display_name} left this channel's game!", allowed_mentions=allowed_mentions_none)  # แจ้ง
+    await hand_over_turn(ctx.channel, state, was_turn)  # รีสตาร์ทเทิร์นเฉพาะตอนคนที่ออกถึงตาอยู่
 
 
 @bot.command()
+@in_channel_actor
 async def add_ai(ctx, ai_name: str = "AI"):  # เพิ่ม AI
     state = get_game(ctx.channel.id)  # state ห้อง
+    if not OPENROUTER_API_KEY:  # ไม่มี key -> AI เล่นไม่ได้
+        await ctx.send("🤖 AI players are disabled (OPENROUTER_API_KEY is not set).", allowed_mentions=allowed_mentions_none)  # แจ้ง
+        return  # จบ
     # Validate AI name
     ai_name = ai_name.strip()  # trim spaces
     if not ai_name:  # empty name
@@ -800,11 +1812,11 @@ async def add_ai(ctx, ai_name: str = "AI"):  # เพิ่ม AI
     if not ai_name.replace(" ", "").replace("_", "").isalnum():  # invalid characters
         await ctx.send("🤖 AI name can only contain letters, numbers, spaces, and underscores!", allowed_mentions=allowed_mentions_none)  # แจ้ง
         return  # จบ
-    if ai_name in state.ai_players:  # กันซ้ำ
+    if ai_name in state.roster:  # กันซ้ำ
         await ctx.send(f"🤖 {ai_name} is already in this channel's game!", allowed_mentions=allowed_mentions_none)  # แจ้ง
         return  # จบ
 
-    if len(state.ai_players) >= config.max_ai_players:  # จำกัดจำนวน AI
+    if state.roster.ais >= config.max_ai_players:  # จำกัดจำนวน AI
         await ctx.send(f"🤖 Maximum {config.max_ai_players} AI players allowed!", allowed_mentions=allowed_mentions_none)  # แจ้ง
         return  # จบ
 
@@ -813,59 +1825,34 @@ async def add_ai(ctx, ai_name: str = "AI"):  # เพิ่ม AI
 
     state.adding_ais.add(ai_name)  # mark
     try:
-        state.ai_players.append(ai_name)  # เพิ่ม AI
-        await ctx.send(f"🤖 {ai_name} joined this channel's game!", allowed_mentions=allowed_mentions_none)  # แจ้ง
+        state.roster.add(ai_name)  # ต่อท้ายลำดับ (เทิร์นที่กำลังเดินไม่ถูกรีเซ็ต)
+        if not queue_roster_notice(ctx.channel, state, f"🤖 {ai_name}", joined=True):  # ห้องเล็ก -> แจ้งทันที
+            await ctx.send(f"🤖 {ai_name} joined this channel's game!", allowed_mentions=allowed_mentions_none)  # แจ้ง
     finally:
         state.adding_ais.discard(ai_name)  # unmark
 
-    # ถ้าเกม active และเป็นผู้เล่นคนแรก -> เริ่ม prompt/timer
-    if state.active and total_players(state) == 1:  # คนแรกในห้อง
-        state.current_idx = 0  # เริ่มที่ index 0
-        await send_turn_prompt(ctx.channel, state)  # prompt
-        await start_turn_timer(ctx.channel, state)  # timer
-
-    # ถ้าเกม active และเทิร์นกำลังเดินอยู่ ให้รีสตาร์ท prompt/timer เพื่อ sync รายชื่อ
-    if state.active and total_players(state) > 1 and state.turn_task:  # มีเกมและมี timer อยู่
-        state.turn_token += 1  # bump token กัน task เดิม
-        await cancel_turn_timer_async(state)  # ยกเลิก task เดิม
-        await send_turn_prompt(ctx.channel, state)  # prompt ใหม่
-        await start_turn_timer(ctx.channel, state)  # timer ใหม่
+    await prompt_first_player(ctx.channel, state)  # เริ่มเทิร์นถ้าเป็นผู้เล่นคนแรก
 
 
 @bot.command()
+@in_channel_actor
 async def remove_ai(ctx, ai_name: str):  # ลบ AI
     state = get_game(ctx.channel.id)  # state ห้อง
 
-    if ai_name not in state.ai_players:  # ไม่มี AI นี้
+    if ai_name not in state.roster:  # ไม่มี AI นี้ (O(1))
         await ctx.send(f"🤖 {ai_name} is not in this channel's game.", allowed_mentions=allowed_mentions_none)  # แจ้ง
         return  # จบ
 
-    ai_idx = state.ai_players.index(ai_name)  # index ในลิสต์ AI
-    removed_global_idx = len(state.players) + ai_idx  # global index ของ AI ในลิสต์รวม "ก่อนลบ"
+    was_turn = state.roster.remove(ai_name)  # ลบออก O(1)
 
-    state.ai_players.remove(ai_name)  # ลบออก
-
-    tp = total_players(state)  # จำนวนผู้เล่นหลังลบ
-    if tp > 0:  # ยังมีผู้เล่น
-        if removed_global_idx < state.current_idx:  # ถ้า AI ที่ออกอยู่ก่อนเทิร์นปัจจุบัน
-            state.current_idx -= 1  # เลื่อนกลับ
-        state.current_idx %= tp  # mod ด้วยทั้งหมด
-    else:
-        state.current_idx = 0  # รีเซ็ต
-        state.turn_token += 1  # bump token ให้ task เก่าหยุด
-        await cancel_turn_timer_async(state)  # ไม่มีคนก็หยุด timer
-
-    await ctx.send(f"🤖 {ai_name} left this channel's game!", allowed_mentions=allowed_mentions_none)  # แจ้ง
-
-    if state.active and tp > 0:  # ถ้ายังเล่นได้
-        state.turn_token += 1  # bump token เพื่อกัน timer เดิมทับ
-        await cancel_turn_timer_async(state)  # ยกเลิก timer เดิม
-        await send_turn_prompt(ctx.channel, state)  # prompt ใหม่
-        await start_turn_timer(ctx.channel, state)  # timer ใหม่
+    if not queue_roster_notice(ctx.channel, state, f"🤖 {ai_name}", joined=False):  # ห้องเล็ก -> แจ้งทันที
+        await ctx.send(f"🤖 {ai_name} left this channel's game!", allowed_mentions=allowed_mentions_none)  # แจ้ง
+    await hand_over_turn(ctx.channel, state, was_turn)  # รีสตาร์ทเทิร์นเฉพาะตอน AI ตัวนี้ถึงตาอยู่
 
 
 @bot.command()
 @commands.has_permissions(manage_guild=True)
+@in_channel_actor
 async def settime(ctx, seconds: int):  # ตั้งเวลาเทิร์นต่อห้อง (admin only)
     state = get_game(ctx.channel.id)  # state ห้อง
     seconds = max(config.min_turn_time, min(seconds, config.max_turn_time))  # จำกัดช่วง
@@ -873,6 +1860,78 @@ async def settime(ctx, seconds: int):  # ตั้งเวลาเทิร์
     await ctx.send(f"⏳ Turn time set to {seconds}s for this channel.", allowed_mentions=allowed_mentions_none)  # แจ้ง
 
 
+@bot.command()
+@in_channel_actor
+async def language(ctx, code: Optional[str] = None):  # ดู/ตั้งภาษาของห้อง (ตั้งได้เฉพาะ admin และตอนไม่มีเกม)
+    state = get_game(ctx.channel.id)  # state ห้อง
+    available = dictionaries.codes(config.words_dir)  # ภาษาที่มี dictionary
+    if config.default_language not in available:  # ภาษาหลักใช้ words_file
+        available = sorted(set(available) | {config.default_language})
+    if code is None:  # แค่ดู
+        await ctx.send(
+            f"🌐 Language: {state_language(state).name} (`{state.language}`). Available: {', '.join(available)}",
+            allowed_mentions=allowed_mentions_none,
+        )  # แจ้ง
+        return  # จบ
+
+    perms = getattr(ctx.author, "guild_permissions", None)  # DM ไม่มี permission ของ server
+    if perms is None or not perms.manage_guild:  # ต้องเป็น admin
+        await ctx.send("❌ Only server managers can change the language.", allowed_mentions=allowed_mentions_none)  # แจ้ง
+        return  # จบ
+    code = code.strip().lower()  # normalize code
+    if state.active:  # เปลี่ยนกลางเกมไม่ได้ (chain เดิมผิดกติกา)
+        await ctx.send("❌ End the current game before changing the language.", allowed_mentions=allowed_mentions_none)  # แจ้ง
+        return  # จบ
+    if not dictionaries.available(code):  # ไม่มีไฟล์
+        await ctx.send(f"❌ No dictionary for `{code}`. Available: {', '.join(available)}", allowed_mentions=allowed_mentions_none)  # แจ้ง
+        return  # จบ
+
+    graph = await asyncio.to_thread(dictionaries.load, code)  # โหลดครั้งแรกใน thread (ห้องอื่นใช้ร่วมกัน)
+    state.language = code  # ตั้งภาษา
+    state.chain_counts = None  # นับใหม่ตาม dictionary ใหม่
+    await ctx.send(
+        f"🌐 Language set to {state_language(state).name} for this channel ({len(graph)} words).",
+        allowed_mentions=allowed_mentions_none,
+    )  # แจ้ง
+
+
+@bot.command()
+@in_channel_actor
+async def rule(ctx, key: Optional[str] = None):  # ดู/ตั้งกติกาต่อคำของห้อง (ตั้งได้เฉพาะ admin และตอนไม่มีเกม)
+    state = get_game(ctx.channel.id)  # state ห้อง
+    language = state_language(state)  # ภาษาของห้อง
+    available = rulebook.available(language)  # กติกาที่ใช้กับภาษานี้ได้
+    if key is None:  # แค่ดู
+        lines = [f"🔀 Rule: {state_rule(state).name} (`{state_rule(state).key}`)"]  # กติกาปัจจุบัน
+        lines += [f"`{r.key}` - {r.description}" for r in available]  # ตัวเลือก
+        await ctx.send("\n".join(lines), allowed_mentions=allowed_mentions_none)  # แจ้ง
+        return  # จบ
+
+    perms = getattr(ctx.author, "guild_permissions", None)  # DM ไม่มี permission ของ server
+    if perms is None or not perms.manage_guild:  # ต้องเป็น admin
+        await ctx.send("❌ Only server managers can change the rule.", allowed_mentions=allowed_mentions_none)  # แจ้ง
+        return  # จบ
+    if state.active:  # เปลี่ยนกลางเกมไม่ได้ (chain เดิมผิดกติกา)
+        await ctx.send("❌ End the current game before changing the rule.", allowed_mentions=allowed_mentions_none)  # แจ้ง
+        return  # จบ
+    chosen = rulebook.get(key.strip().lower(), language)  # หา rule
+    if chosen is None:  # ไม่มี / ใช้กับภาษานี้ไม่ได้
+        await ctx.send(
+            f"❌ No rule `{key}` for {language.name}. Available: {', '.join(r.key for r in available)}",
+            allowed_mentions=allowed_mentions_none,
+        )  # แจ้ง
+        return  # จบ
+
+    base = await asyncio.to_thread(dictionaries.load, language.code)  # dictionary ของภาษา (ครั้งแรกใน thread)
+    graph = await build_rule_graph(language, chosen, base)  # index ของกติกา (ครั้งแรกใน thread, แชร์ทุกห้อง)
+    state.rule = chosen.key  # ตั้งกติกา
+    state.chain_counts = None  # นับใหม่ตาม index ใหม่
+    await ctx.send(
+        f"🔀 Rule set to {chosen.name} for this channel ({len(graph)} playable words). {chosen.description}.",
+        allowed_mentions=allowed_mentions_none,
+    )  # แจ้ง
+
+
 @bot.command()
 async def status(ctx):  # ดูสถานะเกม
     state = get_game(ctx.channel.id)  # state ห้อง
@@ -890,42 +1949,67 @@ async def status(ctx):  # ดูสถานะเกม
 
     await ctx.send(  # สรุปสถานะ
         f"📣 Active: {state.active}\n"
-        f"👥 Humans: {len(state.players)} | 🤖 AIs: {len(state.ai_players)}\n"
+        f"👥 Humans: {state.roster.humans} | 🤖 AIs: {state.roster.ais}\n"
         f"🧠 Last word: {last}\n"
         f"🎯 Current turn: {turn_name}\n"
         f"⏳ Turn time: {state.turn_seconds}s\n"
+        f"🌐 Language: {state_language(state).name}\n"
+        f"🔀 Rule: {state_rule(state).name}\n"
         f"🔗 Chain length: {len(state.word_chain)}",
         allowed_mentions=allowed_mentions_none,
     )
 
 
+def leaderboard_partition(ctx, scope: str) -> Tuple[Optional[str], str]:  # scope -> (partition key, หัวข้อ)
+    guild_id = ctx.guild.id if ctx.guild else None  # guild ของห้องนี้
+    if scope == "global":
+        return PartitionedLeaderboards.GLOBAL, "Global"
+    if scope == "guild":
+        return (guild_partition(guild_id) if guild_id is not None else None), "Server"
+    if scope == "channel":
+        return channel_partition(ctx.channel.id), "Channel"
+    if scope == "season":
+        season = active_season()  # season ปัจจุบัน
+        return season_partition(season, guild_id), f"Season {season}"
+    return None, scope
+
+
+LEADERBOARD_WINDOWS = {"daily": ("day", "Today"), "weekly": ("week", "This Week"), "monthly": ("month", "This Month"), "24h": ("24h", "Last 24h")}  # scope -> (window, หัวข้อ)
+
+
 @bot.command(name="scores")
-async def leaderboard(ctx):  # top 10 คะแนนรวม (รองรับ AI)
-    if not scores_data:  # ยังไม่มีคะแนน
+async def leaderboard(ctx, scope: str = "global"):  # top 10 ตาม partition หรือช่วงเวลา
+    scope = scope.lower()  # normalize
+    if scope in LEADERBOARD_WINDOWS:  # leaderboard ตามช่วงเวลา (ของ server นี้)
+        window, title = LEADERBOARD_WINDOWS[scope]  # window + หัวข้อ
+        window_scope = guild_partition(ctx.guild.id) if ctx.guild else PartitionedLeaderboards.GLOBAL  # server หรือ global (DM)
+        sorted_scores = windowed_leaderboards.top(window_scope, window, time.time(), 10)  # อ่านจาก rollup ที่คำนวณไว้แล้ว
+    elif scope in ("global", "guild", "channel", "season"):  # leaderboard ตาม partition
+        partition, title = leaderboard_partition(ctx, scope)  # หา partition
+        table = leaderboards.get(partition) if partition else None  # ตารางคะแนนที่เรียงไว้แล้ว
+        sorted_scores = table.top(10) if table else []  # top 10 (slice ไม่ต้อง sort)
+    else:  # scope ไม่รู้จัก
+        await ctx.send("Usage: !scores [global|guild|channel|season|daily|weekly|monthly|24h]", allowed_mentions=allowed_mentions_none)  # แจ้ง
+        return  # จบ
+
+    if not sorted_scores:  # ยังไม่มีคะแนน
         await ctx.send("No scores yet!", allowed_mentions=allowed_mentions_none)  # แจ้ง
         return  # จบ
 
-    sorted_scores = sorted(scores_data.items(), key=lambda x: x[1], reverse=True)  # เรียงคะแนน
-    text = "🏆 **Leaderboard (Global)** 🏆\n"  # หัวข้อ
+    text = f"🏆 **Leaderboard ({title})** 🏆\n"  # หัวข้อ
+    resolved = await names.resolve([str(user_key) for user_key, _ in sorted_scores], name_resolver)  # ชื่อที่ขาดหาเป็น batch เดียว
 
     rank = 1  # ลำดับ
-    async with display_names_lock:  # lock เพื่ออ่าน display names อย่างปลอดภัย
-        for user_key, score in sorted_scores:  # วนทุกคน
-            if rank > 10:  # top 10
-                break  # จบ
-
-            if str(user_key).startswith("ai_"):  # ถ้าเป็น AI
-                display_name = ai_display_names.get(user_key, str(user_key).replace("ai_", ""))  # ใช้ display name ถ้ามี
-                name = f"🤖 {display_name}"  # ชื่อ AI
-            else:
-                try:
-                    user_id = int(user_key)
-                    name = user_display_names.get(user_id, f"User {user_key}")  # ใช้ชื่อที่เก็บไว้ หรือ fallback
-                except Exception:
-                    name = f"User {user_key}"  # กันข้อมูลแปลก
+    for user_key, score in sorted_scores:  # วนทุกคน
+        if str(user_key).startswith("ai_"):  # ถ้าเป็น AI
+            display_name = resolved.get(str(user_key), str(user_key).replace("ai_", ""))  # ใช้ display name ถ้ามี
+            name = f"🤖 {display_name}"  # ชื่อ AI
+        else:
+            name = resolved.get(str(user_key), f"User {user_key}")  # ชื่อที่รู้จัก หรือ fallback
+        name = discord.utils.escape_markdown(name)  # escape
 
-            text += f"{rank}. {name}: {score}\n"  # ต่อบรรทัด
-            rank += 1  # เพิ่มอันดับ
+        text += f"{rank}. {name}: {score}\n"  # ต่อบรรทัด
+        rank += 1  # เพิ่มอันดับ
 
     await ctx.send(text, allowed_mentions=allowed_mentions_none)  # ส่ง
 
@@ -933,7 +2017,7 @@ async def leaderboard(ctx):  # top 10 คะแนนรวม (รองรั
 @bot.command()
 async def myscore(ctx):  # ดูคะแนนตัวเอง
     key = str(ctx.author.id)  # key ของ user
-    score = scores_data.get(key, 0)  # คะแนน
+    score = score_sink.get(key)  # คะแนน
     await ctx.send(f"📌 {ctx.author.display_name}, your total score is {score}.", allowed_mentions=allowed_mentions_none)  # ส่ง
 
 
@@ -941,14 +2025,8 @@ async def myscore(ctx):  # ดูคะแนนตัวเอง
 @commands.has_permissions(manage_guild=True)
 async def reload_config(ctx):  # โหลด config ใหม่ (admin only)
     try:
-        from config import GameConfig  # import ตัวคลาส (ต้องมีในโปรเจกต์น้อง)
-        global config, SCORES_FILE  # ใช้ config และ scores_file global
-        config = GameConfig()  # โหลดใหม่จากไฟล์ของน้องเอง
-        SCORES_FILE = config.scores_file  # อัปเดตไฟล์คะแนนตาม config ใหม่
-
-        if config.validate():  # ตรวจความถูกต้อง
-            await load_valid_words_async()  # reload words เผื่อเปลี่ยนไฟล์
-            await ctx.send("✅ Configuration reloaded successfully!", allowed_mentions=allowed_mentions_none)  # แจ้งสำเร็จ
+        if await reload_runtime_config(force_words=True):  # สร้างนอก loop แล้วสลับ snapshot ทีเดียว
+            await ctx.send(f"✅ Configuration reloaded successfully! (v{config.version})", allowed_mentions=allowed_mentions_none)  # แจ้งสำเร็จ
             await ctx.send(
                 f"📋 Prefix: {config.command_prefix} | Turn: {config.turn_seconds}s | AI Model: {config.ai_model}",
                 allowed_mentions=allowed_mentions_none,
@@ -960,68 +2038,409 @@ async def reload_config(ctx):  # โหลด config ใหม่ (admin only)
 
 
 @bot.command()
-async def hint(ctx):  # ขอคำใบ้
-    state = get_game(ctx.channel.id)  # state ห้อง
-    if not state.active:  # เกมไม่เริ่ม
-        await ctx.send("No active game in this channel.", allowed_mentions=allowed_mentions_none)  # แจ้ง
+@commands.has_permissions(manage_guild=True)
+async def profile(ctx, seconds: float = 10.0):  # สุ่ม stack ของ loop แล้วเขียนไฟล์ flamegraph (admin only)
+    seconds = max(1.0, min(seconds, 60.0))  # จำกัดช่วง 1-60 วินาที
+    path = os.path.join(config.profile_dir, f"profile-{int(time.time())}.folded")  # ไฟล์ output (folded stacks)
+    await ctx.send(f"🔬 Profiling event loop for {seconds:.0f}s...", allowed_mentions=allowed_mentions_none)  # แจ้งเริ่ม
+    profiler = SamplingProfiler(threading.get_ident())  # thread ปัจจุบัน = thread ของ event loop
+    try:
+        path = await profiler.profile(seconds, path)  # สุ่มใน thread แยก ไม่ block loop
+    except OSError as e:
+        await ctx.send(f"❌ Could not write profile: {e}", allowed_mentions=allowed_mentions_none)  # แจ้ง error
         return  # จบ
+    lag = loop_watchdog.stats() if loop_watchdog else {}  # สถิติ lag
+    await ctx.send(
+        f"🔬 Profile written to `{path}` | Stalls: {lag.get('stalls', 0)} | Max lag: {lag.get('max_lag_ms', 0)}ms",
+        allowed_mentions=allowed_mentions_none,
+    )  # แจ้งผล
 
-    if not state.word_chain:  # ยังไม่มีคำ
-        await ctx.send("No words yet. Start with any word!", allowed_mentions=allowed_mentions_none)  # แจ้ง
+
+@bot.group(invoke_without_command=True)
+@commands.has_permissions(manage_guild=True)
+async def debug(ctx):  # คำสั่งวินิจฉัย (admin only)
+    p = config.command_prefix  # prefix ปัจจุบัน
+    await ctx.send(
+        f"🔧 Debug: `{p}debug memory`, `{p}debug memory baseline`, `{p}debug memory stop`",
+        allowed_mentions=allowed_mentions_none,
+    )  # แจ้ง
+
+
+@debug.command(name="memory")
+@commands.has_permissions(manage_guild=True)
+async def debug_memory(ctx, action: str = ""):  # memory ต่อโครงสร้าง + tracemalloc diff (admin only)
+    action = action.lower()  # ไม่สนตัวพิมพ์
+    if action == "baseline":  # เริ่ม trace + baseline
+        async with memory_lock:
+            await asyncio.to_thread(memory.start_tracing)  # snapshot ใน thread
+        await ctx.send(
+            f"📸 tracemalloc baseline taken. Run `{config.command_prefix}debug memory` later to see growth, "
+            f"`{config.command_prefix}debug memory stop` to stop tracing.",
+            allowed_mentions=allowed_mentions_none,
+        )  # แจ้ง
         return  # จบ
+    if action == "stop":  # หยุด trace (tracemalloc ทำให้ช้าลง)
+        async with memory_lock:
+            memory.stop_tracing()  # หยุด
+        await ctx.send("🛑 tracemalloc stopped.", allowed_mentions=allowed_mentions_none)  # แจ้ง
+        return  # จบ
+    if action:  # พิมพ์ผิด
+        await ctx.send(f"❌ Unknown action `{discord.utils.escape_markdown(action)}` (use baseline or stop).", allowed_mentions=allowed_mentions_none)  # แจ้ง
+        return  # จบ
+    report = await measure_memory()  # วัดใน thread
+    await ctx.send(format_memory_report(report, ctx.guild.id if ctx.guild else None), allowed_mentions=allowed_mentions_none)  # ส่ง
+
+
+@bot.command()
+@commands.has_permissions(manage_guild=True)
+async def validation_stats(ctx):  # สถิติการตรวจคำต่อแหล่ง (admin only)
+    stats = word_validator.stats()  # cache + ต่อ source
+    lines = [f"📚 Validation cache: {stats['cache_size']} entries, {stats['cache_hit_ratio'] * 100:.1f}% hits"]  # หัวข้อ
+    for row in stats["sources"]:  # ทีละแหล่งตามลำดับ
+        lines.append(
+            f"• {row['source']}: {row['calls']} lookups, {row['hit_ratio'] * 100:.1f}% accepted, {row['avg_ms']:.2f}ms avg"
+        )
+    await ctx.send("\n".join(lines), allowed_mentions=allowed_mentions_none)  # ส่ง
+
+
+async def build_hint(state: GameState) -> str:  # ข้อความคำใบ้ของห้อง (ใช้ทั้ง !hint และ /hint)
+    if not state.active:  # เกมไม่เริ่ม
+        return "No active game in this channel."  # แจ้ง
+
+    if not state.word_chain:  # ยังไม่มีคำ
+        return "No words yet. Start with any word!"  # แจ้ง
+
+    last_letter = required_letter(state)  # ตัวท้ายคำล่าสุด (ตามกติกาภาษา)
+    if len(chain_counts_for(state).graph):  # มี dictionary -> ใบ้จากกราฟ เรียงคำที่เหลือทางต่อมากที่สุดก่อน
+        suggestions = chain_counts_for(state).pick(last_letter, state.used_words, trap=False, limit=5, min_len=required_length(state))  # ไม่ต้องยิง API
+        if suggestions:
+            return f"💡 Hints for '{last_letter}': {', '.join(suggestions)}"  # 5 คำ
+        return f"💡 No hints left for '{last_letter}'."  # แจ้ง
+
+    if state.language != "en":  # Datamuse มีแต่ภาษาอังกฤษ
+        return f"💡 No hints available for {state_language(state).name} yet."  # แจ้ง
 
     if http_session is None or http_session.closed:  # session ยังไม่พร้อม
-        await ctx.send("HTTP session not ready.", allowed_mentions=allowed_mentions_none)  # แจ้ง
-        return  # จบ
+        return "HTTP session not ready."  # แจ้ง
 
-    last_letter = state.word_chain[-1][-1]  # ตัวท้ายคำล่าสุด
     url = f"https://api.datamuse.com/words?sp={last_letter}*&max=20"  # คำขึ้นต้นด้วย last_letter
     try:
         async with http_session.get(url, timeout=aiohttp.ClientTimeout(total=5)) as r:  # ยิง request
             data = await r.json()  # อ่าน json
         suggestions = [w["word"] for w in data if w.get("word") and w["word"] not in state.used_words and len(w["word"]) > 2]  # กรอง
         if suggestions:
-            await ctx.send(f"💡 Hints for '{last_letter}': {', '.join(suggestions[:5])}", allowed_mentions=allowed_mentions_none)  # ส่ง 5 คำ
-        else:
-            await ctx.send(f"💡 No hints left for '{last_letter}'.", allowed_mentions=allowed_mentions_none)  # แจ้ง
+            return f"💡 Hints for '{last_letter}': {', '.join(suggestions[:5])}"  # 5 คำ
+        return f"💡 No hints left for '{last_letter}'."  # แจ้ง
     except Exception:
-        await ctx.send("Couldn't fetch hints right now.", allowed_mentions=allowed_mentions_none)  # แจ้ง
+        return "Couldn't fetch hints right now."  # แจ้ง
+
+
+@bot.command()
+async def hint(ctx):  # ขอคำใบ้
+    await ctx.send(await build_hint(get_game(ctx.channel.id)), allowed_mentions=allowed_mentions_none)  # ส่งคำใบ้
 
 
 @bot.command()
 @commands.has_permissions(manage_guild=True)
 async def reset_scores(ctx):  # รีเซ็ตคะแนนทั้งหมด (admin only)
-    global scores_data, ai_display_names  # เคลียร์ global
-    scores_data = {}  # รีเซ็ต dict
-    ai_display_names = {}  # เคลียร์ display names
-    await save_scores_async()  # เซฟไฟล์ว่าง
+    score_sink.reset()  # รีเซ็ตคะแนนรวม (ชื่อใน directory ไม่เกี่ยวกับคะแนน เก็บไว้)
+    await score_sink.flush()  # เซฟไฟล์ว่างทันที
+    await reset_leaderboards()  # ล้างทุก partition + bucket
     await ctx.send("🗑️ All scores have been reset!", allowed_mentions=allowed_mentions_none)  # แจ้ง
 
 
 @bot.command()
 @commands.has_permissions(manage_guild=True)
+@in_channel_actor
 async def clear_channel(ctx):  # เคลียร์ state ของห้องนี้ (admin only)
     state = get_game(ctx.channel.id)  # state ห้อง
     state.active = False  # ปิดเกม
-    state.players = []  # เคลียร์ผู้เล่น
-    state.ai_players = []  # เคลียร์ AI
+    finalize_game_history(state, ctx.channel, "cleared")  # เก็บเกมเข้า history ก่อนล้าง
+    state.roster.clear()  # เคลียร์ผู้เล่น + AI
     state.player_names = {}  # เคลียร์ชื่อ
+    deadline_scheduler.cancel(state.roster_flush)  # ยกเลิกสรุป join/leave ที่ค้าง
+    state.roster_flush, state.roster_joined, state.roster_left = None, [], []  # เริ่มใหม่
     state.word_chain = []  # เคลียร์คำ
     state.used_words = set()  # เคลียร์ used
-    state.current_idx = 0  # รีเซ็ต index
+    state.chain_counts = None  # นับใหม่
     state.player_streaks = {}  # เคลียร์ streak
     state.combo_count = 0  # เคลียร์ combo
     state.cooldowns = {}  # เคลียร์ cooldowns
     state.turn_token += 1  # bump token
     await cancel_turn_timer_async(state)  # ยกเลิก timer
-    state.turn_message = None  # เคลียร์ message
+    state.turn_message_id = None  # เคลียร์ message
     await ctx.send("🧹 Channel state has been cleared!", allowed_mentions=allowed_mentions_none)  # แจ้ง
 
 
+@bot.group(invoke_without_command=True)
+async def tournament(ctx):  # ดูคำสั่งทัวร์นาเมนต์
+    p = config.command_prefix  # prefix ปัจจุบัน
+    await ctx.send(
+        f"🏟️ Tournament: `{p}tournament open`, `{p}tournament join`, `{p}tournament leave`, `{p}tournament start`, "
+        f"`{p}tournament bracket`, `{p}tournament standings`, `{p}tournament cancel`",
+        allowed_mentions=allowed_mentions_none,
+    )  # แจ้ง
+
+
+@tournament.command(name="open")
+@commands.has_permissions(manage_guild=True)
+async def tournament_open(ctx):  # เปิดรับสมัครทัวร์ในห้องนี้ (admin only)
+    if ctx.channel.id in tournaments:  # มีอยู่แล้ว
+        await ctx.send("❌ A tournament is already open in this channel.", allowed_mentions=allowed_mentions_none)  # แจ้ง
+        return  # จบ
+    language = get_game(ctx.channel.id).language  # ใช้ภาษาของห้อง
+    if not dictionaries.available(language):  # ไม่มี dictionary
+        await ctx.send(f"❌ No dictionary for `{language}`.", allowed_mentions=allowed_mentions_none)  # แจ้ง
+        return  # จบ
+    t = Tournament(
+        id=f"{ctx.channel.id}-{int(time.time())}",
+        guild_id=getattr(ctx.guild, "id", None),
+        channel_id=ctx.channel.id,
+        host_id=ctx.author.id,
+        language=language,
+    )  # สร้างทัวร์
+    tournaments[ctx.channel.id] = t  # ผูกกับห้อง
+    await save_bracket(t)  # เซฟ
+    await ctx.send(
+        f"🏟️ {get_language(language).name} tournament open! Use `{config.command_prefix}tournament join` to enter.",
+        allowed_mentions=allowed_mentions_none,
+    )  # แจ้ง
+
+
+@tournament.command(name="join")
+async def tournament_join(ctx):  # สมัครเข้าทัวร์
+    t = tournaments.get(ctx.channel.id)  # ทัวร์ของห้อง
+    if t is None or t.status != "open":  # ไม่ได้เปิดรับ
+        await ctx.send("❌ No tournament is open for entries here.", allowed_mentions=allowed_mentions_none)  # แจ้ง
+        return  # จบ
+    if ctx.author.id in t.players:  # สมัครแล้ว
+        await ctx.send("ℹ️ You're already entered.", allowed_mentions=allowed_mentions_none)  # แจ้ง
+        return  # จบ
+    t.players.append(ctx.author.id)  # เพิ่มผู้เล่น
+    t.names[ctx.author.id] = ctx.author.display_name  # เก็บชื่อ
+    await ctx.send(
+        f"✅ {discord.utils.escape_markdown(ctx.author.display_name)} entered ({len(t.players)} players).",
+        allowed_mentions=allowed_mentions_none,
+    )  # แจ้ง
+
+
+@tournament.command(name="leave")
+async def tournament_leave(ctx):  # ถอนตัวก่อนเริ่ม
+    t = tournaments.get(ctx.channel.id)  # ทัวร์ของห้อง
+    if t is None or t.status != "open" or ctx.author.id not in t.players:  # ออกได้เฉพาะก่อนเริ่ม
+        await ctx.send("❌ You're not entered in an open tournament here.", allowed_mentions=allowed_mentions_none)  # แจ้ง
+        return  # จบ
+    t.players.remove(ctx.author.id)  # เอาออก
+    t.names.pop(ctx.author.id, None)  # ลบชื่อ
+    await ctx.send(f"👋 Left the tournament ({len(t.players)} players).", allowed_mentions=allowed_mentions_none)  # แจ้ง
+
+
+@tournament.command(name="start")
+async def tournament_start(ctx):  # เริ่มรอบแรก (ผู้เปิดหรือ admin)
+    t = tournaments.get(ctx.channel.id)  # ทัวร์ของห้อง
+    if t is None or t.status != "open":  # ไม่มีทัวร์ที่รอเริ่ม
+        await ctx.send("❌ No tournament waiting to start here.", allowed_mentions=allowed_mentions_none)  # แจ้ง
+        return  # จบ
+    perms = getattr(ctx.author, "guild_permissions", None)  # DM ไม่มี permission ของ server
+    if ctx.author.id != t.host_id and (perms is None or not perms.manage_guild):  # ต้องเป็นคนเปิดหรือ admin
+        await ctx.send("❌ Only the host or a server manager can start the tournament.", allowed_mentions=allowed_mentions_none)  # แจ้ง
+        return  # จบ
+    if len(t.players) < 2:  # ต้องมีอย่างน้อย 2 คน
+        await ctx.send("❌ At least 2 players are needed.", allowed_mentions=allowed_mentions_none)  # แจ้ง
+        return  # จบ
+    t.status = "running"  # จองก่อน await: !tournament start ซ้อนระหว่างโหลดจะไม่ผ่านเช็คด้านบน (และปิดรับสมัคร)
+    try:
+        await asyncio.to_thread(dictionaries.load, t.language)  # โหลด dictionary ก่อนเริ่ม (ครั้งแรกใน thread)
+    except Exception:
+        t.status = "open"  # โหลดไม่ได้ -> กลับไปรอเริ่มเหมือนเดิม
+        raise
+    matches = t.start()  # สุ่มสายรอบแรก
+    await save_bracket(t, [m for m in matches if m.finished])  # เซฟ bracket (+ bye)
+    await ctx.send(f"📣 Round 1 begins: {len(matches)} match(es).", allowed_mentions=allowed_mentions_none)  # แจ้ง
+    await launch_matches(ctx.channel, t, matches)  # เปิดแมตช์ทั้งหมดพร้อมกัน
+
+
+@tournament.command(name="bracket")
+async def tournament_bracket(ctx):  # ดูสายการแข่งขัน
+    t = tournaments.get(ctx.channel.id)  # ทัวร์ของห้อง
+    if t is None:
+        await ctx.send("ℹ️ No tournament in this channel.", allowed_mentions=allowed_mentions_none)  # แจ้ง
+        return  # จบ
+    if not t.rounds:  # ยังไม่เริ่ม
+        entries = ", ".join(match_name(t, p) for p in t.players) or "none yet"  # ผู้สมัคร
+        await ctx.send(f"🏟️ Entries ({len(t.players)}): {entries}", allowed_mentions=allowed_mentions_none)  # แจ้ง
+        return  # จบ
+    lines = []  # บรรทัดผล
+    for match in t.current_round():
+        players = " vs ".join(match_name(t, p) for p in match.players)  # คู่
+        if match.finished:
+            lines.append(f"M{match.slot}: {players} → {match_name(t, match.winner)} ({match.reason})")  # จบแล้ว
+        else:
+            score = " - ".join(str(match.points.get(p, 0)) for p in match.players)  # สกอร์ระหว่างเล่น
+            lines.append(f"M{match.slot}: {players} — {score}, {len(match.words)} words")  # กำลังเล่น
+    running = sum(1 for match in t.current_round() if not match.finished and match.timer is not None)  # นับจากแมตช์ (scheduler ใช้ร่วมกับ roster)
+    header = f"🏟️ Round {len(t.rounds)} ({running} match timer(s) running)"  # หัวข้อ
+    await ctx.send("\n".join([header] + lines)[:1900], allowed_mentions=allowed_mentions_none)  # แจ้ง (กันเกิน 2000)
+
+
+@tournament.command(name="standings")
+async def tournament_standings(ctx):  # อันดับแชมป์/ชนะแมตช์ใน server
+    rows = await asyncio.to_thread(bracket_store.standings, getattr(ctx.guild, "id", None))  # อ่าน SQLite ใน thread
+    if not rows:
+        await ctx.send("ℹ️ No tournament results yet.", allowed_mentions=allowed_mentions_none)  # แจ้ง
+        return  # จบ
+    lines = ["🏆 Tournament standings"]  # หัวข้อ
+    resolved = await names.resolve([str(player) for player, _, _ in rows], name_resolver)  # ชื่อทั้งหมดใน batch เดียว
+    for i, (player, titles, wins) in enumerate(rows, 1):
+        name = discord.utils.escape_markdown(resolved.get(str(player), f"User {player}"))  # ชื่อ
+        lines.append(f"{i}. {name} — {titles} title(s), {wins} match win(s)")  # บรรทัด
+    await ctx.send("\n".join(lines), allowed_mentions=allowed_mentions_none)  # แจ้ง
+
+
+@tournament.command(name="cancel")
+@commands.has_permissions(manage_guild=True)
+async def tournament_cancel(ctx):  # ยกเลิกทัวร์ (admin only)
+    t = tournaments.pop(ctx.channel.id, None)  # ปลดทัวร์ออกจากห้อง
+    if t is None:
+        await ctx.send("ℹ️ No tournament in this channel.", allowed_mentions=allowed_mentions_none)  # แจ้ง
+        return  # จบ
+    t.status = "cancelled"  # สถานะ
+    for match in t.current_round():
+        deadline_scheduler.cancel(match.timer)  # หยุด timer
+        for player in match.players:
+            match_routes.pop((match.channel_id, player), None)  # ข้อความไม่เข้าแมตช์แล้ว
+    await save_bracket(t)  # เซฟ
+    await ctx.send("🛑 Tournament cancelled.", allowed_mentions=allowed_mentions_none)  # แจ้ง
+
+
+# ---------------------------
+# Slash commands (interaction responses: error ไม่กิน rate limit ของห้อง)
+# ---------------------------
+
+@bot.tree.command(name="join", description="Join this channel's word chain game")
+async def slash_join(interaction: discord.Interaction):  # /join
+    await interaction.response.defer(ephemeral=True, thinking=True)  # ตอบภายใน 3 วินาที แม้คิวของห้องยาว (ตรวจคำ / สรุป roster)
+    await actors.get(interaction.channel_id).ask(join_from_interaction, interaction)  # roster เปลี่ยนใน actor ของห้อง
+
+
+async def join_from_interaction(interaction: discord.Interaction):  # ทำงานของ /join (รันใน actor, response ถูก defer แล้ว)
+    state = get_game(interaction.channel_id)  # state ห้อง
+    error = await add_player(state, interaction.user)  # เพิ่มผู้เล่น
+    if error is not None:  # เข้าไม่ได้ -> บอกเฉพาะคนกด
+        await interaction.followup.send(error or "⏳ Already joining...", ephemeral=True)  # แทนข้อความ "thinking"
+        return  # จบ
+    if queue_roster_notice(interaction.channel, state, interaction.user.display_name, joined=True):  # ห้องคนเยอะ -> ประกาศรวมทีหลัง
+        await interaction.followup.send("➕ You joined! Joins are announced together in this channel.", ephemeral=True)  # ตอบเฉพาะคนกด
+    else:
+        await interaction.channel.send(
+            f"➕ {discord.utils.escape_markdown(interaction.user.display_name)} joined this channel's game!",
+            allowed_mentions=allowed_mentions_none,
+        )  # ประกาศในห้อง (response ที่ defer ไว้เป็นแบบเห็นคนเดียว)
+        try:
+            await interaction.delete_original_response()  # ลบ "thinking" (ประกาศอยู่ในห้องแล้ว)
+        except discord.HTTPException:
+            pass  # หมดอายุ/ลบแล้ว
+    await prompt_first_player(interaction.channel, state)  # เริ่มเทิร์นถ้าเป็นคนแรก
+
+
+@bot.tree.command(name="play", description="Submit your word for this turn")
+@app_commands.describe(word="The word to play")
+async def slash_play(interaction: discord.Interaction, word: str):  # /play <word>
+    with tracer.start_trace("interaction.play", channel_id=interaction.channel_id):  # root span (head sampling)
+        state = get_game(interaction.channel_id)  # state ห้อง
+        if not state.active:  # เกมไม่ active
+            await interaction.response.send_message("ℹ️ No active game in this channel. Use !start_game", ephemeral=True)  # ephemeral
+            return  # จบ
+        uid, ai_name = current_player_info(state)  # คนที่ถึงตา
+        if uid != interaction.user.id:  # ไม่ใช่ตา (ไม่ต้องมี cooldown เพราะไม่ส่งเข้าห้อง)
+            name = discord.utils.escape_markdown(peek_current_name(state))  # ชื่อคนที่ถึงตา
+            await interaction.response.send_message(f"🚫 Not your turn. It's {name}'s turn!", ephemeral=True)  # ephemeral
+            return  # จบ
+
+        await interaction.response.defer(ephemeral=True, thinking=True)  # ตรวจคำอาจเกิน 3 วินาที (โหลด dictionary / spellchecker)
+
+        replied = False  # ตอบ "thinking" ไปแล้วหรือยัง
+
+        async def reply(text: str):  # error ส่งเฉพาะคนเล่น
+            nonlocal replied
+            replied = True
+            await interaction.followup.send(text, ephemeral=True)  # แก้ข้อความ "thinking" ครั้งแรก
+
+        accepted = await actors.get(interaction.channel_id).ask(
+            submit_player_word, interaction.channel, state, interaction.user.id, word, reply,
+        )  # ตามลำดับในห้อง (ผลลัพธ์ประกาศในห้องตามปกติ)
+        if not accepted and not replied:  # เกมจบระหว่างรอคิว (ทางข้อความในห้องไม่ตอบ แต่ "thinking" ต้องมีคำตอบ)
+            await reply("ℹ️ No active game in this channel. Use !start_game" if not state.active else "🚫 Your word was not played.")
+        if accepted:
+            try:
+                await interaction.delete_original_response()  # ลบ "thinking" (ผลอยู่ในห้องแล้ว)
+            except discord.HTTPException:
+                pass  # หมดอายุ/ลบแล้ว
+
+
+@bot.tree.command(name="hint", description="Get word suggestions (only you can see them)")
+async def slash_hint(interaction: discord.Interaction):  # /hint
+    await interaction.response.defer(ephemeral=True, thinking=True)  # Datamuse อาจช้า
+    await interaction.followup.send(await build_hint(get_game(interaction.channel_id)), ephemeral=True)  # คำใบ้เห็นคนเดียว
+
+
+@bot.tree.error
+async def on_app_command_error(interaction: discord.Interaction, error: app_commands.AppCommandError):  # error ของ slash command
+    print(f"Slash command error: {error}")  # log
+    try:
+        if interaction.response.is_done():  # defer ไปแล้ว
+            await interaction.followup.send("❌ Something went wrong.", ephemeral=True)  # แจ้ง
+        else:
+            await interaction.response.send_message("❌ Something went wrong.", ephemeral=True)  # แจ้ง
+    except discord.HTTPException:
+        pass  # interaction หมดอายุ
+
+
+async def sync_app_commands():  # ลงทะเบียน slash command กับ Discord (ครั้งเดียวต่อ process)
+    if not config.app_commands_sync:  # ปิดไว้ (sync เองหรือไม่ใช้ slash)
+        return  # จบ
+    try:
+        synced = await bot.tree.sync()  # global sync
+        print(f"Synced {len(synced)} slash commands")  # log
+    except discord.HTTPException as e:
+        print(f"Slash command sync error: {e}")  # log (prefix command ยังใช้ได้)
+
+
+startup.add_group(("app_commands", sync_app_commands))  # sync หลังบอทพร้อมแล้ว (ไม่ block การโหลดอื่น)
+
+
 # ---------------------------
 # Graceful shutdown (proper)
 # ---------------------------
 
+_bot_close = bot.close  # close เดิมของ discord.py
+
+
+async def close_with_checkpoint():  # เซฟ checkpoint รอบสุดท้ายก่อนปิด
+    if config.checkpoint_interval > 0:  # เปิด checkpoint
+        try:
+            await checkpoint_games()  # flush ที่ค้าง
+        except Exception as e:
+            print(f"Final checkpoint error: {e}")  # log
+    try:
+        await score_sink.flush()  # เขียนคะแนนรวมที่ค้าง
+        await flush_leaderboards()  # flush คะแนน partition ที่ค้าง
+        await history_store.flush()  # flush history ที่ค้าง
+        await names.flush()  # ชื่อที่ยังไม่ได้เขียน
+        if traffic_recorder is not None:
+            await traffic_recorder.flush()  # ข้อความที่อัดไว้ยังไม่ได้เขียน
+    except Exception as e:
+        print(f"Final flush error: {e}")  # log
+    await asyncio.to_thread(names.close)  # ปิด SQLite ของชื่อ
+    await spectator_server.stop()  # ปิด connection ของผู้ชม
+    deadline_scheduler.stop()  # หยุด timer รวม (ทัวร์ที่ค้างจะถูก mark interrupted ตอนเริ่มครั้งหน้า)
+    await asyncio.to_thread(bracket_store.close)  # ปิด SQLite
+    await _bot_close()  # ปิดจริง
+
+
+bot.close = close_with_checkpoint  # ใช้ตอน SIGTERM / ctrl+c ด้วย
+
+
 @bot.event
 async def on_close():  # ปิดบอท -> ปิด session
     global http_session  # ใช้ global
@@ -1034,4 +2453,22 @@ async def on_close():  # ปิดบอท -> ปิด session
 # Run
 # ---------------------------
 
-bot.run(TOKEN)  # รันบอท
\ No newline at end of file
+def install_event_loop(choice: str) -> str:  # เลือก event loop ที่เร็วที่สุดที่มี (ต้องเรียกก่อน bot.run)
+    if choice == "asyncio":  # บังคับ loop มาตรฐาน
+        return "asyncio"
+    try:
+        import uvloop  # optional: pip install uvloop (ไม่มีบน Windows)
+    except ImportError:
+        if choice == "uvloop":  # ขอไว้แต่ไม่ได้ติดตั้ง
+            print("Warning: event_loop is uvloop but uvloop is not installed, using asyncio")
+        return "asyncio"
+    asyncio.set_event_loop_policy(uvloop.EventLoopPolicy())  # loop ต่อจากนี้เป็น uvloop
+    return "uvloop"
+
+
+if __name__ == "__main__":  # รันเมื่อเป็นสคริปต์หลักเท่านั้น (import ได้โดยไม่ต่อ Discord)
+    if not TOKEN:
+        raise ValueError("DISCORD_TOKEN is not set in .env file. Please provide a valid Discord bot token.")
+    print(f"Runtime profile: {config.runtime_profile}, event loop: {install_event_loop(config.event_loop)}")  # log
+    startup.mark_imported()  # เวลาโหลด module แยกจากเวลา login/connect
+    bot.run(TOKEN)  # รันบอท (asyncio.run สร้าง loop จาก policy ที่ตั้งไว้)
\ No newline at end of file
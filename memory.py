@@ -0,0 +1,216 @@
+"""
+Memory introspection for Word Chain Game Discord Bot
+
+``MemoryInspector`` estimates how many bytes each registered structure
+holds (games, used-word sets, caches, dictionaries, ...) by walking it from a
+worker thread. Large containers are sampled: the first ``sample`` items are
+measured and the total is extrapolated from them, so a report costs about
+the same with ten games or ten thousand. An object reachable from several
+structures is counted once, under the first structure registered that
+reaches it. Optional tracemalloc tracing diffs the current allocations
+against a baseline to show which lines keep allocating.
+"""
+
+import os
+import sys
+import json
+import time
+import types
+import asyncio
+import tracemalloc
+from collections import deque
+from itertools import islice
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+LEAVES = (str, bytes, bytearray, int, float, complex, bool, type(None), range)  # no references worth following
+OPAQUE = (  # measured shallow, never walked into
+    type, types.ModuleType, types.FunctionType, types.MethodType, types.BuiltinFunctionType,
+    types.CodeType, types.FrameType, asyncio.AbstractEventLoop, asyncio.Future,
+)
+
+
+class _Walk:
+    """One sampled deep-size estimate; ``seen`` is shared across a report"""
+
+    def __init__(self, seen: set, sample: int, max_depth: int, max_objects: int, stop: Tuple[type, ...]):
+        self.seen = seen
+        self.added: List[int] = []  # ids this walk put in ``seen`` (undone if the walk is retried)
+        self.sample = sample
+        self.max_depth = max_depth
+        self.budget = max_objects
+        self.stop = OPAQUE + stop
+        self.truncated = False
+
+    def size(self, obj: Any, depth: int = 0) -> float:
+        if id(obj) in self.seen:
+            return 0.0
+        self.seen.add(id(obj))
+        self.added.append(id(obj))
+        size = float(sys.getsizeof(obj, 0))
+        if isinstance(obj, LEAVES) or isinstance(obj, self.stop):
+            return size
+        if depth >= self.max_depth or self.budget <= 0:
+            self.truncated = True
+            return size
+        self.budget -= 1
+
+        if isinstance(obj, dict):
+            count, taken, measured = len(obj), 0, 0.0
+            for key, value in islice(obj.items(), self.sample):
+                taken += 1
+                measured += self.size(key, depth + 1) + self.size(value, depth + 1)
+        elif isinstance(obj, (list, tuple, set, frozenset, deque)):
+            count, taken, measured = len(obj), 0, 0.0
+            for item in islice(obj, self.sample):
+                taken += 1
+                measured += self.size(item, depth + 1)
+        else:
+            fields = list(getattr(obj, "__dict__", {}).values())
+            for cls in type(obj).__mro__:
+                for slot in getattr(cls, "__slots__", ()):
+                    if slot in ("__dict__", "__weakref__"):
+                        continue
+                    value = getattr(obj, slot, None)
+                    if value is not None:
+                        fields.append(value)
+            if hasattr(obj, "__dict__"):
+                size += sys.getsizeof(obj.__dict__, 0)
+            return size + sum(self.size(value, depth + 1) for value in fields)
+        if taken and count > taken:
+            measured *= count / taken  # extrapolate from the sample
+        return size + measured
+
+
+def rss_bytes() -> Optional[int]:
+    """Resident set size of this process (peak RSS where /proc is missing)"""
+    try:
+        with open("/proc/self/statm", "r") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, AttributeError):
+        pass
+    try:
+        import resource
+    except ImportError:  # Windows
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak if sys.platform == "darwin" else peak * 1024
+
+
+class MemoryInspector:
+    """Per-structure footprint estimates plus tracemalloc diffs against a baseline"""
+
+    def __init__(self, sample: int = 50, max_depth: int = 12, max_objects: int = 200_000,
+                 stop: Tuple[type, ...] = (), trace_frames: int = 1):
+        self.sample = sample
+        self.max_depth = max_depth
+        self.max_objects = max_objects
+        self.stop = stop  # types to count shallow (client caches, sessions, ...)
+        self.trace_frames = trace_frames
+        self.structures: List[Tuple[str, Callable[[], Any]]] = []
+        self.counters: Dict[str, Callable[[], Any]] = {}
+        self._baseline: Optional[tracemalloc.Snapshot] = None
+        self.last: Optional[Dict[str, Any]] = None
+
+    def register(self, name: str, getter: Callable[[], Any]):
+        """Measure ``getter()`` under ``name`` (earlier registrations claim shared objects)"""
+        self.structures.append((name, getter))
+
+    def count(self, name: str, getter: Callable[[], Any]):
+        """Report ``getter()`` as is (counts, small dicts)"""
+        self.counters[name] = getter
+
+    def _measure_one(self, seen: set, obj: Any) -> Tuple[float, bool]:
+        for _ in range(3):  # the loop may resize a container mid-walk; just walk again
+            walk = _Walk(seen, self.sample, self.max_depth, self.max_objects, self.stop)
+            try:
+                return walk.size(obj), walk.truncated
+            except RuntimeError:
+                seen.difference_update(walk.added)
+        raise RuntimeError("structure kept changing while being measured")
+
+    def measure(self) -> Dict[str, Any]:
+        """Build a report (blocking, run off-loop)"""
+        started = time.perf_counter()
+        seen: set = set()
+        keep = []  # getters may build temporary lists; keep them alive so their ids are not reused mid-report
+        rows = []
+        for name, getter in self.structures:
+            row: Dict[str, Any] = {"name": name}
+            try:
+                obj = getter()
+                keep.append(obj)
+                row["items"] = len(obj) if hasattr(obj, "__len__") else None
+                row["bytes"], row["truncated"] = self._measure_one(seen, obj)
+            except Exception as e:
+                row["error"] = str(e)
+            rows.append(row)
+        report: Dict[str, Any] = {
+            "ts": time.time(),
+            "rss": rss_bytes(),
+            "structures": sorted(rows, key=lambda r: r.get("bytes", 0), reverse=True),
+            "counts": {},
+        }
+        for name, getter in self.counters.items():
+            try:
+                report["counts"][name] = getter()
+            except Exception as e:
+                report["counts"][name] = f"error: {e}"
+        if self._baseline is not None:
+            report["allocations"] = self.allocation_diff()
+        report["elapsed_ms"] = (time.perf_counter() - started) * 1000
+        self.last = report
+        return report
+
+    @property
+    def tracing(self) -> bool:
+        return self._baseline is not None
+
+    def start_tracing(self):
+        """Start tracemalloc and take the baseline (blocking, run off-loop)"""
+        if not tracemalloc.is_tracing():
+            tracemalloc.start(self.trace_frames)
+        self._baseline = tracemalloc.take_snapshot()
+
+    def stop_tracing(self):
+        self._baseline = None
+        if tracemalloc.is_tracing():
+            tracemalloc.stop()
+
+    def allocation_diff(self, limit: int = 10) -> List[Dict[str, Any]]:
+        """Lines whose allocations grew the most since the baseline (blocking)"""
+        if self._baseline is None:
+            return []
+        ignore = [  # the inspector's own bookkeeping is not a leak
+            tracemalloc.Filter(False, tracemalloc.__file__),
+            tracemalloc.Filter(False, __file__),
+            tracemalloc.Filter(False, "<frozen importlib._bootstrap*>"),
+        ]
+        snapshot = tracemalloc.take_snapshot().filter_traces(ignore)
+        stats = snapshot.compare_to(self._baseline.filter_traces(ignore), "lineno")
+        rows = []
+        for stat in stats[:limit]:
+            frame = stat.traceback[0]
+            where = os.path.join(*frame.filename.replace("\\", "/").split("/")[-2:])  # package/file.py is enough to find it
+            rows.append({"where": f"{where}:{frame.lineno}", "size_diff": stat.size_diff,
+                         "count_diff": stat.count_diff, "size": stat.size})
+        return rows
+
+    @staticmethod
+    def append_metrics(path: str, report: Dict[str, Any]):
+        """Append a report as one JSON line (blocking, run off-loop)"""
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        with open(path, "a", encoding="utf-8") as f:
+            f.write(json.dumps(report, default=str, separators=(",", ":")) + "\n")
+
+
+def format_bytes(n: Optional[float]) -> str:
+    if n is None:
+        return "?"
+    for unit in ("B", "KB", "MB"):
+        if abs(n) < 1024:
+            return f"{n:.0f}{unit}" if unit == "B" else f"{n:.1f}{unit}"
+        n /= 1024
+    return f"{n:.2f}GB"
+
+
+__all__ = ['rss_bytes', 'MemoryInspector', 'format_bytes']
@@ -0,0 +1,241 @@
+"""
+Display-name directory for Word Chain Game Discord Bot
+
+Leaderboards show names for score keys (user ids and ``ai_<name>`` keys).
+Names seen in games are kept in a bounded in-memory LRU and written to
+SQLite in the background, so they survive restarts without the process
+holding every name it has ever seen. When a render needs names that are
+neither cached nor stored, the missing keys are resolved in one batch through
+a pluggable resolver (Discord's REST API in production). Keys nobody could
+resolve are negatively cached for a while so they are not fetched again on
+every render; keys the resolver skipped or could not look up right now are
+simply tried again next time. Everything except the SQLite calls runs on the event loop, so
+no lock is needed around the cache.
+"""
+
+import os
+import time
+import asyncio
+import sqlite3
+import threading
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Dict, Iterable, List, Optional
+
+import discord
+
+NameResolver = Callable[[List[str]], Awaitable[Dict[str, Optional[str]]]]  # key -> name, None = no such user; keys left out were not tried
+
+
+class NameDirectory:
+    """Score key -> display name: LRU in front of SQLite, with batch resolution"""
+
+    def __init__(self, path: str, cache_size: int = 5000, negative_ttl: float = 3600.0):
+        self.path = path
+        self.cache_size = cache_size
+        self.negative_ttl = negative_ttl
+        self._cache: "OrderedDict[str, str]" = OrderedDict()
+        self._unknown: "OrderedDict[str, float]" = OrderedDict()  # key -> monotonic time the negative entry expires
+        self._dirty: Dict[str, str] = {}  # names not written to SQLite yet
+        self._lock = threading.Lock()
+        self._conn: Optional[sqlite3.Connection] = None
+        self.hits = 0
+        self.misses = 0
+        self.resolved = 0
+
+    def _connect(self) -> sqlite3.Connection:
+        if self._conn is None:
+            os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+            conn = sqlite3.connect(self.path, check_same_thread=False)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.execute("CREATE TABLE IF NOT EXISTS names (key TEXT PRIMARY KEY, name TEXT NOT NULL, updated REAL NOT NULL)")
+            self._conn = conn
+        return self._conn
+
+    def _put(self, key: str, name: str):
+        self._cache[key] = name
+        self._cache.move_to_end(key)
+        if len(self._cache) > self.cache_size:
+            self._cache.popitem(last=False)
+
+    def remember(self, key: str, name: str):
+        """Record a name seen in a game (no I/O; written by the next ``flush``)"""
+        if self._cache.get(key) != name:
+            self._dirty[key] = name
+        self._put(key, name)
+        self._unknown.pop(key, None)
+
+    def get(self, key: str) -> Optional[str]:
+        """Cached name, without touching SQLite or the resolver"""
+        name = self._cache.get(key)
+        if name is not None:
+            self._cache.move_to_end(key)
+        return name
+
+    def _negative(self, key: str, now: float) -> bool:
+        expires = self._unknown.get(key)
+        if expires is None:
+            return False
+        if now >= expires:
+            del self._unknown[key]
+            return False
+        return True
+
+    def fetch(self, keys: List[str]) -> Dict[str, str]:
+        """Stored names for ``keys`` (blocking, run off-loop)"""
+        found: Dict[str, str] = {}
+        with self._lock:
+            conn = self._connect()
+            for i in range(0, len(keys), 500):  # stay under SQLite's variable limit
+                chunk = keys[i:i + 500]
+                marks = ",".join("?" * len(chunk))
+                found.update(conn.execute(f"SELECT key, name FROM names WHERE key IN ({marks})", chunk).fetchall())
+        return found
+
+    def write(self, rows: Dict[str, str]):
+        """Upsert names in one transaction (blocking, run off-loop)"""
+        now = time.time()
+        with self._lock:
+            conn = self._connect()
+            with conn:
+                conn.executemany(
+                    "INSERT INTO names (key, name, updated) VALUES (?, ?, ?)"
+                    " ON CONFLICT(key) DO UPDATE SET name = excluded.name, updated = excluded.updated",
+                    [(key, name, now) for key, name in rows.items()],
+                )
+
+    async def flush(self):
+        """Write names remembered since the last flush"""
+        rows, self._dirty = self._dirty, {}
+        if not rows:
+            return
+        try:
+            await asyncio.to_thread(self.write, rows)
+        except Exception:
+            for key, name in rows.items():  # keep them for the next attempt
+                self._dirty.setdefault(key, name)
+            raise
+
+    async def resolve(self, keys: Iterable[str], resolver: Optional[NameResolver] = None) -> Dict[str, str]:
+        """Names for ``keys``: LRU, then one SQLite batch, then one resolver batch
+
+        Keys that could not be resolved are left out of the result. Keys the
+        resolver reported as unknown (None) are not retried until
+        ``negative_ttl`` has passed; keys it left out are retried next time.
+        """
+        now = time.monotonic()
+        result: Dict[str, str] = {}
+        missing: List[str] = []
+        for key in dict.fromkeys(keys):
+            name = self.get(key)
+            if name is not None:
+                self.hits += 1
+                result[key] = name
+            elif not self._negative(key, now):
+                missing.append(key)
+        if not missing:
+            return result
+        self.misses += len(missing)
+
+        stored = await asyncio.to_thread(self.fetch, missing)
+        for key, name in stored.items():
+            self._put(key, name)
+            result[key] = name
+        missing = [key for key in missing if key not in stored]
+        if not missing or resolver is None:
+            return result
+
+        try:
+            fetched = await resolver(missing)
+        except Exception as e:
+            print(f"Name resolver error: {e}")
+            return result  # not negatively cached: the resolver may work next time
+        expires = time.monotonic() + self.negative_ttl
+        for key in missing:
+            name = fetched.get(key)
+            if name:
+                self.resolved += 1
+                self.remember(key, name)
+                result[key] = name
+            elif key in fetched:  # definitely unknown (skipped or failed lookups are left out)
+                self._unknown[key] = expires
+                if len(self._unknown) > self.cache_size:
+                    self._unknown.popitem(last=False)
+        return result
+
+    def close(self):
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+
+    def stats(self) -> Dict[str, Any]:
+        lookups = self.hits + self.misses
+        return {
+            "cached": len(self._cache),
+            "unknown": len(self._unknown),
+            "pending_writes": len(self._dirty),
+            "hit_ratio": self.hits / lookups if lookups else 0.0,
+            "resolved": self.resolved,
+        }
+
+
+class DiscordNameResolver:
+    """Resolves user-id keys from the client's user cache, then ``fetch_user`` (REST)
+
+    At most ``max_fetches`` users are fetched per batch, ``concurrency`` at a
+    time, so one render cannot burn through the REST rate limit. AI keys are
+    never resolved here; their names only come from games. Only AI keys and
+    users Discord reports as not found are returned as unknown (None); users
+    over the fetch cap or whose fetch failed for another reason are left out
+    so they are retried.
+    """
+
+    def __init__(self, client: Any, max_fetches: int = 25, concurrency: int = 5):
+        self.client = client
+        self.max_fetches = max_fetches
+        self.concurrency = concurrency
+
+    async def __call__(self, keys: List[str]) -> Dict[str, Optional[str]]:
+        found: Dict[str, Optional[str]] = {}
+        to_fetch: List[int] = []
+        for key in keys:
+            if not key.isdigit():
+                found[key] = None  # AI key
+                continue
+            user = self.client.get_user(int(key))
+            if user is not None:
+                found[key] = user.display_name
+            elif len(to_fetch) < self.max_fetches:
+                to_fetch.append(int(key))
+        if to_fetch:
+            semaphore = asyncio.Semaphore(self.concurrency)
+
+            async def fetch(user_id: int):
+                async with semaphore:
+                    try:
+                        user = await self.client.fetch_user(user_id)
+                    except discord.NotFound:  # unknown or deleted account
+                        found[str(user_id)] = None
+                        return
+                    except Exception:  # rate limit, server error, ...: try again next render
+                        return
+                    found[str(user_id)] = user.display_name
+
+            await asyncio.gather(*(fetch(user_id) for user_id in to_fetch))
+        return found
+
+
+class StaticNameResolver:
+    """Resolver backed by a fixed mapping (local runs and tests without Discord)"""
+
+    def __init__(self, names: Optional[Dict[str, str]] = None):
+        self.names = dict(names or {})
+        self.calls: List[List[str]] = []
+
+    async def __call__(self, keys: List[str]) -> Dict[str, Optional[str]]:
+        self.calls.append(list(keys))
+        return {key: self.names.get(key) for key in keys}
+
+
+__all__ = ['NameResolver', 'NameDirectory', 'DiscordNameResolver', 'StaticNameResolver']
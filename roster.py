@@ -0,0 +1,121 @@
+"""
+Turn order for Word Chain Game Discord Bot
+
+Players (user ids) and AI players (names) sit in one ring of linked members:
+two dicts map each member to its neighbours. Joining, leaving, membership
+checks and passing the turn are all O(1), however many people are in the
+channel, and a member leaving never shifts anyone else's position.
+"""
+
+from typing import Dict, Iterable, Iterator, List, Optional, Union
+
+Member = Union[int, str]  # user id, or AI name
+
+
+class Roster:
+    """Ring of members in join order; ``current`` is whose turn it is, ``head`` joined first"""
+
+    __slots__ = ("_next", "_prev", "current", "head", "humans", "ais", "version")
+
+    def __init__(self, members: Iterable[Member] = ()):
+        self._next: Dict[Member, Member] = {}
+        self._prev: Dict[Member, Member] = {}
+        self.current: Optional[Member] = None
+        self.head: Optional[Member] = None
+        self.humans = 0
+        self.ais = 0
+        self.version = 0  # bumped on every membership change (checkpoint fingerprints)
+        for member in members:
+            self.add(member)
+
+    def __len__(self) -> int:
+        return len(self._next)
+
+    def __contains__(self, member: Member) -> bool:
+        return member in self._next
+
+    def __iter__(self) -> Iterator[Member]:
+        """Members in turn order, starting with the current one"""
+        member = self.current
+        for _ in range(len(self._next)):
+            yield member
+            member = self._next[member]
+
+    def _count(self, member: Member, delta: int):
+        if isinstance(member, str):
+            self.ais += delta
+        else:
+            self.humans += delta
+
+    def add(self, member: Member) -> bool:
+        """Join at the end of the join order (just before ``head``); False if already in"""
+        if member in self._next:
+            return False
+        if self.head is None:
+            self._next[member] = self._prev[member] = member
+            self.current = self.head = member
+        else:
+            before = self._prev[self.head]
+            self._next[before] = member
+            self._prev[member] = before
+            self._next[member] = self.head
+            self._prev[self.head] = member
+        self._count(member, 1)
+        self.version += 1
+        return True
+
+    def remove(self, member: Member) -> bool:
+        """Leave the ring; True when it was ``member``'s turn (the turn passes to the next one)"""
+        if member not in self._next:
+            return False
+        after = self._next.pop(member)
+        before = self._prev.pop(member)
+        self._count(member, -1)
+        self.version += 1
+        was_current = member == self.current
+        if after == member:  # last one out
+            self.current = self.head = None
+            return was_current
+        self._next[before] = after
+        self._prev[after] = before
+        if was_current:
+            self.current = after
+        if member == self.head:
+            self.head = after
+        return was_current
+
+    def advance(self) -> Optional[Member]:
+        """Pass the turn to the next member"""
+        if self.current is not None:
+            self.current = self._next[self.current]
+        return self.current
+
+    def rewind(self) -> Optional[Member]:
+        """Give the turn back to the member who joined first (as when a game starts)"""
+        self.current = self.head
+        return self.current
+
+    def clear(self):
+        self._next.clear()
+        self._prev.clear()
+        self.current = self.head = None
+        self.humans = self.ais = 0
+        self.version += 1
+
+    def to_list(self) -> List[Member]:
+        """Members in join order, starting with ``head`` (for checkpoints)"""
+        member, members = self.head, []
+        for _ in range(len(self._next)):
+            members.append(member)
+            member = self._next[member]
+        return members
+
+    @classmethod
+    def from_list(cls, members: Iterable[Member], current: Optional[Member] = None) -> "Roster":
+        roster = cls(members)
+        if current in roster:
+            roster.current = current
+        return roster
+
+
+__all__ = ['Member', 'Roster']
@@ -0,0 +1,86 @@
+"""
+Shared deadline scheduler for Word Chain Game Discord Bot
+
+Timers that only need to call a function later (tournament match turns,
+batched roster notices, ...) are entries in one heap served by a single task
+instead of one sleeping task each. Cancelling marks an entry; it is dropped
+when it reaches the top of the heap.
+"""
+
+import time
+import heapq
+import asyncio
+import itertools
+from typing import Any, Callable, List, Optional
+
+
+class DeadlineScheduler:
+    """One task firing callbacks at monotonic deadlines from a heap"""
+
+    def __init__(self):
+        self._heap: List[list] = []  # [when, seq, callback, args, cancelled]
+        self._seq = itertools.count()
+        self._wake: Optional[asyncio.Event] = None
+        self._task: Optional[asyncio.Task] = None
+        self.fired = 0
+        self.max_lag = 0.0
+
+    def start(self):
+        if self._task is None:
+            self._wake = asyncio.Event()
+            self._task = asyncio.create_task(self._run(), name="deadline-scheduler")
+
+    def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            self._task = None
+
+    def call_at(self, when: float, callback: Callable[..., Any], *args) -> list:
+        """Run ``callback(*args)`` on the loop at ``time.monotonic() >= when``"""
+        entry = [when, next(self._seq), callback, args, False]
+        heapq.heappush(self._heap, entry)
+        if self._heap[0] is entry and self._wake is not None:
+            self._wake.set()  # new earliest deadline
+        return entry
+
+    def call_later(self, delay: float, callback: Callable[..., Any], *args) -> list:
+        return self.call_at(time.monotonic() + delay, callback, *args)
+
+    @staticmethod
+    def cancel(entry: Optional[list]):
+        """Cancel a pending entry (dropped lazily when it reaches the top of the heap)"""
+        if entry is not None:
+            entry[4] = True
+
+    def pending(self) -> int:
+        return sum(1 for entry in self._heap if not entry[4])
+
+    async def _run(self):
+        while True:
+            while self._heap and self._heap[0][4]:
+                heapq.heappop(self._heap)
+            self._wake.clear()
+            if not self._heap:
+                await self._wake.wait()
+                continue
+            delay = self._heap[0][0] - time.monotonic()
+            if delay > 0:
+                try:
+                    await asyncio.wait_for(self._wake.wait(), delay)
+                except asyncio.TimeoutError:
+                    pass
+                continue
+            now = time.monotonic()
+            while self._heap and self._heap[0][0] <= now:  # fire everything due in one pass
+                when, _, callback, args, cancelled = heapq.heappop(self._heap)
+                if cancelled:
+                    continue
+                self.fired += 1
+                self.max_lag = max(self.max_lag, now - when)
+                try:
+                    callback(*args)
+                except Exception as e:
+                    print(f"Deadline scheduler callback error: {e}")
+
+
+__all__ = ['DeadlineScheduler']
@@ -0,0 +1,212 @@
+#!/usr/bin/env python3
+"""
+Word Chain Game Score Analytics
+Loads score and game-history data into columnar NumPy arrays and reports
+dead-end rates, word lengths, bonus distributions and player activity
+"""
+
+import os
+import sys
+import json
+import array
+import argparse
+from typing import Dict
+
+from config import GameConfig
+from history import HistoryStore, TURN_FIELDS
+from languages import get_language
+from chain_rules import RuleBook
+
+try:
+    import numpy as np
+except ImportError:  # operator-only dependency
+    np = None
+
+# Column name -> array typecode (one element per turn)
+COLUMN_TYPES = {
+    "req": "h", "length": "B", "points": "h", "long_bonus": "h", "streak_bonus": "h",
+    "combo_bonus": "h", "difficulty_bonus": "h", "player": "l", "skip": "B", "day": "l",
+}
+
+
+def build_columns(store: HistoryStore) -> Dict[str, "np.ndarray"]:
+    """Stream history into typed columns, one element per turn
+
+    ``req`` is the code of the letter (or key, under other chain rules) the
+    turn had to start with (-1 for the opening word); letters and players are
+    interned into small integer codes.
+    """
+    rules = RuleBook()  # themes chain like classic, so they need not be loaded
+    cols = {name: array.array(typecode) for name, typecode in COLUMN_TYPES.items()}
+    letters: Dict[str, int] = {}
+    players: Dict[str, int] = {}
+    for game in store.iter_games():
+        turns = game.get("turns")
+        if not turns:
+            continue
+        if len(turns[0]) < len(TURN_FIELDS):  # recorded before difficulty_bonus
+            turns = [turn + [0] * (len(TURN_FIELDS) - len(turn)) for turn in turns]
+        ts, player, words, points, long_bonus, streak_bonus, combo_bonus, difficulty_bonus = zip(*turns)
+        language = get_language(game.get("language", "en"))
+        rule = rules.get(game.get("rule", "classic"), language) or rules.get("classic", language)
+        last_letter = lambda word: rule.last(language, word)
+        required, req = -1, []
+        for word in words:
+            req.append(required)
+            if word:
+                required = letters.setdefault(last_letter(word), len(letters))
+        cols["req"].extend(req)
+        cols["length"].extend(min(len(w), 255) if w else 0 for w in words)
+        cols["points"].extend(points)
+        cols["long_bonus"].extend(long_bonus)
+        cols["streak_bonus"].extend(streak_bonus)
+        cols["combo_bonus"].extend(combo_bonus)
+        cols["difficulty_bonus"].extend(difficulty_bonus)
+        cols["player"].extend(players.setdefault(p, len(players)) for p in player)
+        cols["skip"].extend(0 if w else 1 for w in words)
+        cols["day"].extend(int(t // 86400) for t in ts)
+    result = {name: np.frombuffer(col, dtype=col.typecode) if len(col) else np.zeros(0, dtype=col.typecode)
+              for name, col in cols.items()}
+    result["letters"] = np.array(sorted(letters, key=letters.get) or [""], dtype=str)
+    result["players"] = np.array(sorted(players, key=players.get) or [""], dtype=str)
+    return result
+
+
+def source_signature(store: HistoryStore) -> "np.ndarray":
+    """History directory plus name, size and mtime of every segment the columns were built from"""
+    rows = [os.path.abspath(store.directory)]
+    for path in store.segments():
+        st = os.stat(path)
+        rows.append(f"{os.path.basename(path)}\t{st.st_size}\t{st.st_mtime_ns}")
+    return np.array(rows, dtype=str)
+
+
+def load_columns(store: HistoryStore, cache: str) -> Dict[str, "np.ndarray"]:
+    """Columns from the .npz cache when it was built from the same segments, else rebuild it"""
+    source = source_signature(store)
+    if cache and os.path.exists(cache):
+        with np.load(cache) as data:
+            if (set(COLUMN_TYPES) | {"source"}) <= set(data.files) and np.array_equal(data["source"], source):
+                return {name: data[name] for name in data.files if name != "source"}
+    cols = build_columns(store)
+    if cache:
+        os.makedirs(os.path.dirname(cache) or ".", exist_ok=True)
+        np.savez(cache, source=source, **cols)
+    return cols
+
+
+def analyze(cols: Dict[str, "np.ndarray"], scores: Dict[str, int], top: int) -> Dict[str, object]:
+    """Vectorized aggregates over the turn columns"""
+    req, skip = cols["req"], cols["skip"].astype(bool)
+    played = ~skip
+    letters = cols["letters"]
+    n_letters = len(letters)
+
+    chained = req >= 0
+    attempts = np.bincount(req[chained], minlength=n_letters)
+    dead_ends = np.bincount(req[chained & skip], minlength=n_letters)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        dead_rate = np.where(attempts > 0, dead_ends / attempts, 0.0)
+    order = np.argsort(-dead_rate)
+    dead_end_rates = [
+        {"letter": str(letters[i]), "turns": int(attempts[i]), "dead_ends": int(dead_ends[i]), "rate": round(float(dead_rate[i]), 4)}
+        for i in order if attempts[i] > 0
+    ]
+
+    lengths = cols["length"][played]
+    length_hist = np.bincount(lengths) if lengths.size else np.zeros(0, dtype=int)
+
+    total_points = int(cols["points"][played].sum())
+    bonuses = {}
+    for name in ("long_bonus", "streak_bonus", "combo_bonus", "difficulty_bonus"):
+        values = cols[name][played]
+        awarded = values > 0
+        bonuses[name] = {
+            "turns_awarded": int(awarded.sum()),
+            "award_rate": round(float(awarded.mean()), 4) if values.size else 0.0,
+            "points": int(values.sum()),
+            "share_of_points": round(float(values.sum()) / total_points, 4) if total_points else 0.0,
+        }
+
+    player_turns = np.bincount(cols["player"], minlength=len(cols["players"]))
+    player_points = np.bincount(cols["player"], weights=cols["points"], minlength=len(cols["players"]))
+    busiest = np.argsort(-player_turns)[:top]
+    days = cols["day"]
+    per_day = np.bincount(days - days.min()) if days.size else np.zeros(0, dtype=int)
+
+    score_values = np.fromiter((v for v in scores.values() if isinstance(v, int)), dtype=np.int64)
+    return {
+        "turns": int(req.size),
+        "words": int(played.sum()),
+        "skips": int(skip.sum()),
+        "dead_end_rates": dead_end_rates,
+        "avg_word_length": round(float(lengths.mean()), 3) if lengths.size else 0.0,
+        "word_length_histogram": {int(i): int(c) for i, c in enumerate(length_hist) if c},
+        "bonuses": bonuses,
+        "players": int((player_turns > 0).sum()),
+        "most_active": [
+            {"player": str(cols["players"][i]), "turns": int(player_turns[i]), "points": int(player_points[i])}
+            for i in busiest if player_turns[i] > 0
+        ],
+        "turns_per_day": {"mean": round(float(per_day.mean()), 2) if per_day.size else 0.0,
+                          "max": int(per_day.max()) if per_day.size else 0},
+        "score_percentiles": {str(p): float(np.percentile(score_values, p)) for p in (50, 90, 99)} if score_values.size else {},
+    }
+
+
+def print_report(report: Dict[str, object]):
+    print("Word Chain Game - Score Analytics")
+    print("=" * 50)
+    print(f"Turns: {report['turns']} | Words: {report['words']} | Skips: {report['skips']} | Players: {report['players']}")
+    print(f"Average word length: {report['avg_word_length']}")
+
+    print("\nDead-end rate by required letter:")
+    for row in report["dead_end_rates"]:
+        print(f"  {row['letter']}: {row['rate'] * 100:5.1f}%  ({row['dead_ends']}/{row['turns']})")
+
+    print("\nBonus distribution:")
+    for name, row in report["bonuses"].items():
+        print(f"  {name}: awarded on {row['award_rate'] * 100:.1f}% of words, "
+              f"{row['points']} pts ({row['share_of_points'] * 100:.1f}% of all points)")
+
+    print("\nMost active players:")
+    for row in report["most_active"]:
+        print(f"  {row['player']}: {row['turns']} turns, {row['points']} pts")
+
+    print(f"\nTurns per day: mean {report['turns_per_day']['mean']}, max {report['turns_per_day']['max']}")
+    if report["score_percentiles"]:
+        print("Total score percentiles: " + ", ".join(f"p{p} {v:g}" for p, v in report["score_percentiles"].items()))
+
+
+def main():
+    if np is None:
+        print("score-analytics.py needs NumPy: pip install numpy", file=sys.stderr)
+        sys.exit(1)
+    config = GameConfig()
+
+    parser = argparse.ArgumentParser(description="Analyze Word Chain scores and game history")
+    parser.add_argument("--history-dir", default=config.history_dir, help="history directory (default: %(default)s)")
+    parser.add_argument("--scores", default=config.scores_file, help="scores file (default: %(default)s)")
+    parser.add_argument("--cache", help="columnar cache file, '' to disable (default: history-columns.npz next to the history directory)")
+    parser.add_argument("--top", type=int, default=10, help="number of players to list")
+    parser.add_argument("--json", action="store_true", help="print the report as JSON")
+    args = parser.parse_args()
+    if args.cache is None:
+        args.cache = os.path.join(os.path.dirname(os.path.normpath(args.history_dir)) or ".", "history-columns.npz")
+
+    try:
+        with open(args.scores, "r", encoding="utf-8") as f:
+            scores = json.load(f)
+    except (FileNotFoundError, json.JSONDecodeError):
+        scores = {}
+
+    cols = load_columns(HistoryStore(args.history_dir), args.cache)
+    report = analyze(cols, scores if isinstance(scores, dict) else {}, args.top)
+    if args.json:
+        print(json.dumps(report, indent=2, ensure_ascii=False))
+    else:
+        print_report(report)
+
+
+if __name__ == "__main__":
+    main()
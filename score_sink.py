@@ -0,0 +1,91 @@
+"""
+Score totals for Word Chain Game Discord Bot
+
+Scoring only touches an in-memory dict, so awarding points never waits on a
+lock or on disk. A background task writes the totals to the scores JSON file
+(atomically, from a worker thread) whenever they have changed.
+"""
+
+import os
+import json
+import asyncio
+from typing import Dict, Optional
+
+
+class ScoreSink:
+    """In-memory ``{key: total}`` flushed to a JSON file in the background"""
+
+    def __init__(self, path: str, flush_interval: float = 2.0):
+        self.path = path
+        self.flush_interval = flush_interval
+        self.scores: Dict[str, int] = {}
+        self._version = 0  # bumped on every change
+        self._saved = 0  # version last written
+        self._flush_lock: Optional[asyncio.Lock] = None
+        self._task: Optional[asyncio.Task] = None
+
+    def load(self):
+        """Read totals from ``path`` (blocking, run off-loop at startup)"""
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+            self.scores = data if isinstance(data, dict) else {}
+        except FileNotFoundError:
+            self.scores = {}
+        except json.JSONDecodeError:
+            print(f"Warning: {self.path} is not valid JSON, starting with empty scores")
+            self.scores = {}
+        self._version = self._saved = 0
+
+    def add(self, key: str, points: int) -> int:
+        """Add ``points`` to ``key`` and return the new total (no I/O)"""
+        total = self.scores.get(key, 0) + points
+        self.scores[key] = total
+        self._version += 1
+        return total
+
+    def get(self, key: str) -> int:
+        return self.scores.get(key, 0)
+
+    def reset(self):
+        self.scores = {}
+        self._version += 1
+
+    @staticmethod
+    def _write(path: str, data: Dict[str, int]):
+        tmp_file = path + ".tmp"
+        with open(tmp_file, "w", encoding="utf-8") as f:
+            json.dump(data, f, indent=4, ensure_ascii=False)
+        os.replace(tmp_file, path)
+
+    async def flush(self):
+        """Write the totals if they changed since the last write"""
+        if self._flush_lock is None:
+            self._flush_lock = asyncio.Lock()
+        async with self._flush_lock:  # only ever held here, never nested
+            version = self._version
+            if version == self._saved:
+                return
+            data = dict(self.scores)  # copy on the loop; the thread never sees a dict being mutated
+            await asyncio.to_thread(self._write, self.path, data)
+            self._saved = version
+
+    async def _run(self):
+        while True:
+            await asyncio.sleep(self.flush_interval)
+            try:
+                await self.flush()
+            except Exception as e:
+                print(f"Score flush error: {e}")
+
+    def start(self):
+        if self._task is None:
+            self._task = asyncio.create_task(self._run(), name="score-sink")
+
+    def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            self._task = None
+
+
+__all__ = ['ScoreSink']
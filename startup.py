@@ -0,0 +1,92 @@
+"""
+Run-once startup pipeline for Word Chain Game Discord Bot
+"""
+
+import time
+import asyncio
+import inspect
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+Stage = Tuple[str, Callable[[], Any]]
+
+
+class StartupPipeline:
+    """Run startup stages once per process and time each of them
+
+    Stages are added in groups: groups run one after another, stages inside a
+    group run concurrently. Plain functions are run in a worker thread so file
+    and parsing work never blocks the event loop; coroutine functions are
+    awaited on the loop. A stage that raises is logged and recorded in
+    ``failed``; the other stages and later groups still run, so one bad data
+    file cannot keep background tasks from starting. Calling ``run()`` again
+    (e.g. from a reconnect's ``on_ready``) waits for the first run instead of
+    repeating it.
+    """
+
+    def __init__(self, process_start: Optional[float] = None):
+        self.process_start = process_start
+        self.groups: List[List[Stage]] = []
+        self.timings: Dict[str, float] = {}
+        self.failed: Dict[str, str] = {}  # stage -> error
+        self.imported: Optional[float] = None  # set by mark_imported() just before connecting
+        self._task: Optional[asyncio.Task] = None
+
+    def add_group(self, *stages: Stage) -> 'StartupPipeline':
+        """Add stages that may run concurrently with each other"""
+        self.groups.append(list(stages))
+        return self
+
+    def mark_imported(self):
+        """Record the end of module loading (call right before ``bot.run``)"""
+        self.imported = time.perf_counter()
+
+    @property
+    def done(self) -> bool:
+        return self._task is not None and self._task.done()
+
+    async def run(self) -> Dict[str, float]:
+        """Run the pipeline (first call) or wait for it (later calls)"""
+        if self._task is None:
+            self._task = asyncio.create_task(self._run(), name="startup")
+        return await asyncio.shield(self._task)
+
+    async def _timed(self, name: str, func: Callable[[], Any]):
+        started = time.perf_counter()
+        try:
+            if inspect.iscoroutinefunction(func):
+                await func()
+            else:
+                await asyncio.to_thread(func)
+        except Exception as e:
+            self.failed[name] = f"{type(e).__name__}: {e}"
+            print(f"Startup stage {name} failed: {self.failed[name]}")
+        finally:
+            self.timings[name] = time.perf_counter() - started
+
+    async def _run(self) -> Dict[str, float]:
+        started = time.perf_counter()
+        if self.process_start is not None and self.imported is not None:
+            self.timings["imports"] = self.imported - self.process_start
+            self.timings["connect"] = started - self.imported  # login + gateway until on_ready
+        elif self.process_start is not None:
+            self.timings["before_ready"] = started - self.process_start  # imports and connecting together
+        for group in self.groups:
+            await asyncio.gather(*(self._timed(name, func) for name, func in group))
+        self.timings["startup"] = time.perf_counter() - started
+        if self.process_start is not None:
+            self.timings["total"] = time.perf_counter() - self.process_start
+        return self.timings
+
+    def report(self) -> str:
+        """One-line startup-time breakdown"""
+        parts = [f"{name} {seconds * 1000:.0f}ms" for name, seconds in self.timings.items()
+                 if name not in ("startup", "total")]
+        head = f"Startup {self.timings.get('startup', 0.0) * 1000:.0f}ms"
+        if "total" in self.timings:
+            head += f" (process {self.timings['total'] * 1000:.0f}ms)"
+        if self.failed:
+            parts.append("failed: " + ", ".join(self.failed))
+        return f"{head}: " + ", ".join(parts)
+
+
+__all__ = ['StartupPipeline']
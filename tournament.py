@@ -0,0 +1,208 @@
+"""
+Tournament mode for Word Chain Game Discord Bot
+
+Single-elimination brackets of short head-to-head matches. Every match timer
+is an entry in the bot's shared ``scheduler.DeadlineScheduler`` (a heap served
+by a single task), so hundreds of concurrent matches cost one heap entry each
+instead of one countdown task each. Finished matches and brackets are written to SQLite.
+"""
+
+import os
+import json
+import time
+import random
+import sqlite3
+import threading
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional, Set, Tuple
+
+
+@dataclass(eq=False)
+class Match:
+    """One head-to-head match; ``players`` has one entry for a bye"""
+
+    id: str
+    tournament_id: str
+    round: int
+    slot: int
+    players: List[int]
+    channel_id: Optional[int] = None
+    turn: int = 0  # index into players of whose turn it is
+    turn_token: int = 0
+    words: List[str] = field(default_factory=list)
+    used: Set[str] = field(default_factory=set)
+    points: Dict[int, int] = field(default_factory=dict)
+    winner: Optional[int] = None
+    reason: str = ""
+    started_at: float = 0.0
+    ended_at: float = 0.0
+    timer: Optional[list] = None
+
+    @property
+    def finished(self) -> bool:
+        return self.winner is not None
+
+    def current_player(self) -> int:
+        return self.players[self.turn % len(self.players)]
+
+    def opponent(self, player: int) -> int:
+        return next((p for p in self.players if p != player), player)
+
+    def leader(self) -> Optional[int]:
+        """Player with strictly more points, or None on a tie"""
+        if len(self.players) < 2:
+            return self.players[0]
+        a, b = (self.points.get(p, 0) for p in self.players)
+        if a == b:
+            return None
+        return self.players[0] if a > b else self.players[1]
+
+    def finish(self, winner: int, reason: str):
+        self.winner = winner
+        self.reason = reason
+        self.ended_at = time.time()
+
+    def to_row(self) -> Tuple:
+        return (self.id, self.tournament_id, self.round, self.slot, json.dumps(self.players), self.winner,
+                self.reason, len(self.words), json.dumps({str(p): n for p, n in self.points.items()}),
+                self.started_at, self.ended_at)
+
+
+@dataclass(eq=False)
+class Tournament:
+    """Single-elimination bracket; a round starts when the previous one is complete"""
+
+    id: str
+    guild_id: Optional[int]
+    channel_id: int
+    host_id: int
+    language: str
+    status: str = "open"  # open -> running -> finished | cancelled
+    players: List[int] = field(default_factory=list)
+    names: Dict[int, str] = field(default_factory=dict)
+    rounds: List[List[Match]] = field(default_factory=list)
+    champion: Optional[int] = None
+    created_at: float = field(default_factory=time.time)
+
+    def _pair(self, entrants: List[int]) -> List[Match]:
+        round_no = len(self.rounds) + 1
+        matches = []
+        for slot, i in enumerate(range(0, len(entrants), 2)):
+            players = entrants[i:i + 2]
+            match = Match(f"{self.id}-r{round_no}m{slot + 1}", self.id, round_no, slot + 1, players)
+            if len(players) == 1:  # odd entrant out advances
+                match.finish(players[0], "bye")
+            matches.append(match)
+        self.rounds.append(matches)
+        return matches
+
+    def start(self) -> List[Match]:
+        """Seed the first round (random order)"""
+        entrants = list(self.players)
+        random.shuffle(entrants)
+        self.status = "running"
+        return self._pair(entrants)
+
+    def current_round(self) -> List[Match]:
+        return self.rounds[-1] if self.rounds else []
+
+    def advance(self) -> List[Match]:
+        """Next round's matches once the current one is complete ([] if not complete or over)"""
+        current = self.current_round()
+        if not current or not all(m.finished for m in current):
+            return []
+        winners = [m.winner for m in current]
+        if len(winners) == 1:
+            self.champion = winners[0]
+            self.status = "finished"
+            return []
+        return self._pair(winners)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "id": self.id, "guild": self.guild_id, "channel": self.channel_id, "host": self.host_id,
+            "language": self.language, "status": self.status, "players": self.players,
+            "names": {str(p): n for p, n in self.names.items()}, "champion": self.champion,
+            "created": self.created_at,
+            "rounds": [[{"id": m.id, "players": m.players, "winner": m.winner, "reason": m.reason}
+                        for m in rnd] for rnd in self.rounds],
+        }
+
+
+class BracketStore:
+    """SQLite record of tournaments and every finished match"""
+
+    def __init__(self, path: str):
+        self.path = path
+        self._lock = threading.Lock()
+        self._conn: Optional[sqlite3.Connection] = None
+
+    def _connect(self) -> sqlite3.Connection:
+        if self._conn is None:
+            os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+            conn = sqlite3.connect(self.path, check_same_thread=False)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS tournaments ("
+                " id TEXT PRIMARY KEY, guild_id INTEGER, channel_id INTEGER,"
+                " status TEXT NOT NULL, champion INTEGER, updated REAL NOT NULL, data TEXT NOT NULL)"
+            )
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS matches ("
+                " id TEXT PRIMARY KEY, tournament_id TEXT NOT NULL, round INTEGER, slot INTEGER,"
+                " players TEXT, winner INTEGER, reason TEXT, words INTEGER, points TEXT,"
+                " started REAL, ended REAL)"
+            )
+            conn.execute("CREATE INDEX IF NOT EXISTS matches_tournament ON matches (tournament_id)")
+            self._conn = conn
+        return self._conn
+
+    def write(self, tournament: Tournament, matches: List[Match] = ()):
+        """Upsert the bracket and any newly finished matches in one transaction"""
+        with self._lock:
+            conn = self._connect()
+            with conn:
+                conn.execute(
+                    "INSERT OR REPLACE INTO tournaments (id, guild_id, channel_id, status, champion, updated, data)"
+                    " VALUES (?, ?, ?, ?, ?, ?, ?)",
+                    (tournament.id, tournament.guild_id, tournament.channel_id, tournament.status,
+                     tournament.champion, time.time(), json.dumps(tournament.to_dict(), ensure_ascii=False)),
+                )
+                conn.executemany(
+                    "INSERT OR REPLACE INTO matches (id, tournament_id, round, slot, players, winner, reason,"
+                    " words, points, started, ended) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                    [m.to_row() for m in matches],
+                )
+
+    def mark_interrupted(self) -> int:
+        """Tournaments left open or running by a previous process can't resume their matches"""
+        with self._lock:
+            conn = self._connect()
+            with conn:
+                cur = conn.execute("UPDATE tournaments SET status = 'interrupted' WHERE status IN ('open', 'running')")
+            return cur.rowcount
+
+    def standings(self, guild_id: Optional[int], limit: int = 10) -> List[Tuple[int, int, int]]:
+        """(player, titles, match wins) for a guild, best first"""
+        with self._lock:
+            conn = self._connect()
+            titles = dict(conn.execute(
+                "SELECT champion, COUNT(*) FROM tournaments WHERE guild_id IS ? AND champion IS NOT NULL"
+                " GROUP BY champion", (guild_id,)).fetchall())
+            wins = dict(conn.execute(
+                "SELECT m.winner, COUNT(*) FROM matches m JOIN tournaments t ON t.id = m.tournament_id"
+                " WHERE t.guild_id IS ? AND m.winner IS NOT NULL AND m.reason != 'bye' GROUP BY m.winner",
+                (guild_id,)).fetchall())
+        players = set(titles) | set(wins)
+        ranked = sorted(players, key=lambda p: (-titles.get(p, 0), -wins.get(p, 0)))
+        return [(p, titles.get(p, 0), wins.get(p, 0)) for p in ranked[:limit]]
+
+    def close(self):
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+
+
+__all__ = ['Match', 'Tournament', 'BracketStore']
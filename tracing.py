@@ -0,0 +1,236 @@
+"""
+Lightweight span tracing for Word Chain Game Discord Bot
+
+Traces are head-sampled: the decision is made once when a trace starts, and
+unsampled traces cost a single context variable lookup per span. Finished
+spans are handed to an exporter that writes them from a background thread.
+"""
+
+import os
+import json
+import time
+import queue
+import random
+import threading
+import contextvars
+import urllib.request
+from typing import Any, Dict, List, Optional
+
+_current_span: contextvars.ContextVar = contextvars.ContextVar("current_span", default=None)
+
+
+class _NoopSpan:
+    """Span returned when the current trace is not sampled"""
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        return False
+
+    def set_attribute(self, key: str, value: Any):
+        pass
+
+
+NOOP_SPAN = _NoopSpan()
+
+
+class Span:
+    """A timed operation within a trace"""
+
+    __slots__ = ("tracer", "name", "trace_id", "span_id", "parent_id",
+                 "start_ns", "end_ns", "attributes", "error", "_token")
+
+    def __init__(self, tracer: 'Tracer', name: str, trace_id: str, parent_id: Optional[str],
+                 attributes: Dict[str, Any]):
+        self.tracer = tracer
+        self.name = name
+        self.trace_id = trace_id
+        self.span_id = "%016x" % random.getrandbits(64)
+        self.parent_id = parent_id
+        self.attributes = attributes
+        self.start_ns = 0
+        self.end_ns = 0
+        self.error: Optional[str] = None
+        self._token = None
+
+    def __enter__(self):
+        self.start_ns = time.time_ns()
+        self._token = _current_span.set(self)
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.end_ns = time.time_ns()
+        _current_span.reset(self._token)
+        if exc_type is not None:
+            self.error = exc_type.__name__
+        self.tracer.exporter.export(self)
+        return False
+
+    def set_attribute(self, key: str, value: Any):
+        """Attach a tag to the span"""
+        self.attributes[key] = value
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Flat JSON form used by the JSONL exporter"""
+        return {
+            "trace_id": self.trace_id,
+            "span_id": self.span_id,
+            "parent_id": self.parent_id,
+            "name": self.name,
+            "start_ns": self.start_ns,
+            "duration_ms": round((self.end_ns - self.start_ns) / 1e6, 3),
+            "attributes": self.attributes,
+            "error": self.error,
+        }
+
+
+class BatchExporter:
+    """Base exporter: queue spans on the loop, write batches from a daemon thread"""
+
+    def __init__(self, batch_size: int = 256, flush_interval: float = 2.0):
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self._queue: queue.SimpleQueue = queue.SimpleQueue()
+        self._thread = threading.Thread(target=self._worker, name=type(self).__name__, daemon=True)
+        self._thread.start()
+
+    def export(self, span: Span):
+        """Hand a finished span to the writer thread (non-blocking)"""
+        self._queue.put(span)
+
+    def _worker(self):
+        batch: List[Span] = []
+        deadline = time.monotonic() + self.flush_interval
+        while True:
+            timeout = max(0.0, deadline - time.monotonic())
+            try:
+                batch.append(self._queue.get(timeout=timeout))
+            except queue.Empty:
+                pass
+            if batch and (len(batch) >= self.batch_size or time.monotonic() >= deadline):
+                try:
+                    self.write_batch(batch)
+                except Exception as e:
+                    print(f"Trace export error: {e}")
+                batch = []
+            if time.monotonic() >= deadline:
+                deadline = time.monotonic() + self.flush_interval
+
+    def write_batch(self, spans: List[Span]):
+        raise NotImplementedError
+
+
+class JsonlExporter(BatchExporter):
+    """Append spans to a local JSONL file, one span per line"""
+
+    def __init__(self, path: str, **kwargs):
+        self.path = path
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        super().__init__(**kwargs)
+
+    def write_batch(self, spans: List[Span]):
+        with open(self.path, "a", encoding="utf-8") as f:
+            for span in spans:
+                f.write(json.dumps(span.to_dict(), ensure_ascii=False) + "\n")
+
+
+class OtlpHttpExporter(BatchExporter):
+    """POST spans as OTLP/JSON to a collector (or any stand-in accepting /v1/traces)"""
+
+    def __init__(self, endpoint: str, service_name: str = "word-chain-bot", **kwargs):
+        self.endpoint = endpoint.rstrip("/")
+        if not self.endpoint.endswith("/v1/traces"):
+            self.endpoint += "/v1/traces"
+        self.service_name = service_name
+        super().__init__(**kwargs)
+
+    @staticmethod
+    def _attr(key: str, value: Any) -> Dict[str, Any]:
+        if isinstance(value, bool):
+            return {"key": key, "value": {"boolValue": value}}
+        if isinstance(value, int):
+            return {"key": key, "value": {"intValue": str(value)}}
+        if isinstance(value, float):
+            return {"key": key, "value": {"doubleValue": value}}
+        return {"key": key, "value": {"stringValue": str(value)}}
+
+    def write_batch(self, spans: List[Span]):
+        otlp_spans = []
+        for span in spans:
+            item = {
+                "traceId": span.trace_id,
+                "spanId": span.span_id,
+                "name": span.name,
+                "kind": 1,
+                "startTimeUnixNano": str(span.start_ns),
+                "endTimeUnixNano": str(span.end_ns),
+                "attributes": [self._attr(k, v) for k, v in span.attributes.items()],
+                "status": {"code": 2, "message": span.error} if span.error else {"code": 1},
+            }
+            if span.parent_id:
+                item["parentSpanId"] = span.parent_id
+            otlp_spans.append(item)
+        body = {
+            "resourceSpans": [{
+                "resource": {"attributes": [self._attr("service.name", self.service_name)]},
+                "scopeSpans": [{"scope": {"name": "word-chain-bot"}, "spans": otlp_spans}],
+            }]
+        }
+        request = urllib.request.Request(
+            self.endpoint,
+            data=json.dumps(body).encode("utf-8"),
+            headers={"Content-Type": "application/json"},
+            method="POST",
+        )
+        with urllib.request.urlopen(request, timeout=5) as resp:
+            resp.read()
+
+
+class Tracer:
+    """Creates head-sampled traces and child spans"""
+
+    def __init__(self, sample_rate: float = 0.0, exporter: Optional[BatchExporter] = None):
+        self.sample_rate = sample_rate if exporter is not None else 0.0
+        self.exporter = exporter
+
+    @property
+    def enabled(self) -> bool:
+        return self.sample_rate > 0
+
+    def start_trace(self, name: str, **attributes):
+        """Start a root span, or a no-op span if this trace is not sampled"""
+        if self.sample_rate <= 0 or random.random() >= self.sample_rate:
+            return NOOP_SPAN
+        return Span(self, name, "%032x" % random.getrandbits(128), None, attributes)
+
+    def span(self, name: str, **attributes):
+        """Start a child of the current span; no-op outside a sampled trace"""
+        parent = _current_span.get()
+        if parent is None:
+            return NOOP_SPAN
+        return Span(self, name, parent.trace_id, parent.span_id, attributes)
+
+    @staticmethod
+    def current():
+        """The active span, or the no-op span"""
+        return _current_span.get() or NOOP_SPAN
+
+    @staticmethod
+    def detach():
+        """Drop the inherited trace context (for long-lived tasks spawned inside a trace)"""
+        _current_span.set(None)
+
+
+def create_tracer(sample_rate: float, trace_file: str = "", otlp_endpoint: str = "") -> Tracer:
+    """Build a tracer from settings; tracing stays off unless an exporter is configured"""
+    if sample_rate <= 0:
+        return Tracer()
+    if otlp_endpoint:
+        return Tracer(sample_rate, OtlpHttpExporter(otlp_endpoint))
+    if trace_file:
+        return Tracer(sample_rate, JsonlExporter(trace_file))
+    return Tracer()
+
+
+__all__ = ['Tracer', 'Span', 'JsonlExporter', 'OtlpHttpExporter', 'create_tracer']
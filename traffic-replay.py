@@ -0,0 +1,257 @@
+#!/usr/bin/env python3
+"""
+Word Chain Game Traffic Replay
+Plays a capture recorded with ``traffic_capture_file`` back through the bot's
+on_message and command handlers against a fake Discord transport, reports
+per-message latency and throughput, and compares the reports of two builds
+"""
+
+import os
+import sys
+import json
+import time
+import random
+import asyncio
+import argparse
+import datetime
+import tempfile
+import itertools
+from collections import Counter
+from types import SimpleNamespace
+from typing import Any, Dict, List, Optional
+
+import discord
+
+from traffic import CapturedMessage, read_capture, summarize_latencies, compare_reports
+
+ID_BASE = 10 ** 17  # alias -> an id shaped like a Discord snowflake
+BOT_ID = ID_BASE  # alias 0 is never handed out by a capture
+BOT_USER = {"id": str(BOT_ID), "username": "replay-bot", "discriminator": "0", "avatar": None, "bot": True}
+ADMIN_ROLE = ID_BASE - 1  # given to authors captured with manage_guild
+MEMBER_PERMISSIONS = discord.Permissions(
+    view_channel=True, send_messages=True, read_message_history=True, embed_links=True, add_reactions=True,
+    create_public_threads=True, send_messages_in_threads=True,
+)
+
+
+class FakeTransport:
+    """Stands in for Discord's REST API: counts every request, answers sends and edits with a message"""
+
+    def __init__(self, latency: float = 0.0):
+        self.latency = latency  # simulated round trip per request
+        self.calls: Counter = Counter()
+        self._ids = itertools.count(ID_BASE * 2)
+
+    def message(self, channel_id: int, message_id: int, author: Dict[str, Any], content: str,
+                guild_id: Optional[int] = None, admin: bool = False) -> Dict[str, Any]:
+        data = {
+            "id": str(message_id), "channel_id": str(channel_id), "type": 0, "content": content,
+            "author": author, "attachments": [], "embeds": [], "mentions": [], "mention_roles": [],
+            "pinned": False, "tts": False, "timestamp": datetime.datetime.now(datetime.timezone.utc).isoformat(),
+            "edited_timestamp": None,
+        }
+        if guild_id is not None:
+            data["guild_id"] = str(guild_id)
+            data["member"] = {"roles": [str(ADMIN_ROLE)] if admin else [], "joined_at": None,
+                              "deaf": False, "mute": False, "flags": 0}
+        return data
+
+    async def request(self, route: Any, *, files: Any = None, form: Any = None, **kwargs: Any) -> Any:
+        self.calls[f"{route.method} {route.path}"] += 1
+        if self.latency:
+            await asyncio.sleep(self.latency)
+        if route.path.startswith("/channels/{channel_id}/messages"):
+            payload = kwargs.get("json") or {}
+            message_id = route.url.rsplit("/", 1)[-1] if route.method == "PATCH" else next(self._ids)
+            return self.message(route.channel_id, int(message_id), BOT_USER, payload.get("content") or "")
+        return {} if route.method == "GET" else None
+
+
+class OfflineModel:
+    """Stands in for the OpenRouter client: every reply is empty, so AI players take the dictionary fallback"""
+
+    def __init__(self):
+        self.chat = self.completions = self
+        self.requests = 0
+
+    def create(self, **kwargs: Any) -> Any:
+        self.requests += 1
+        return SimpleNamespace(choices=[SimpleNamespace(message=SimpleNamespace(content=""))])
+
+
+class Replayer:
+    """Builds guilds/channels/users for a capture's aliases and feeds its messages to ``main``"""
+
+    def __init__(self, main: Any, transport: FakeTransport):
+        self.main = main
+        self.bot = main.bot
+        self.state = self.bot._connection
+        self.transport = transport
+        self.channels: Dict[int, Any] = {}
+        self.samples: Dict[str, List[float]] = {}
+        self.lag: List[float] = []  # how late each message was dispatched (1x replay)
+        self.errors = 0
+        self._ids = itertools.count(ID_BASE * 3)
+        self.bot.http.request = transport.request  # every REST call goes through the fake
+        self.state.user = discord.ClientUser(state=self.state, data=BOT_USER)  # as if logged in
+        main.openai_client = OfflineModel()  # never call the real model
+
+    def _guild(self, alias: int) -> Any:
+        guild_id = ID_BASE + alias
+        guild = self.state._get_guild(guild_id)
+        if guild is None:
+            role = {"position": 0, "color": 0, "hoist": False, "managed": False, "mentionable": False}
+            guild = discord.Guild(data={
+                "id": str(guild_id), "name": f"guild-{alias}", "owner_id": str(BOT_ID),
+                "roles": [
+                    {**role, "id": str(guild_id), "name": "@everyone", "permissions": str(MEMBER_PERMISSIONS.value)},
+                    {**role, "id": str(ADMIN_ROLE), "name": "admin", "permissions": str(discord.Permissions.all().value)},
+                ],
+                "channels": [], "members": [], "features": [], "emojis": [], "stickers": [],
+            }, state=self.state)
+            self.state._add_guild(guild)
+        return guild
+
+    def channel(self, record: CapturedMessage) -> Any:
+        channel = self.channels.get(record.channel)
+        if channel is None:
+            channel_id = ID_BASE + record.channel
+            if record.guild:
+                guild = self._guild(record.guild)
+                channel = discord.TextChannel(state=self.state, guild=guild, data={
+                    "id": str(channel_id), "type": 0, "name": f"channel-{record.channel}", "position": 0,
+                    "permission_overwrites": [], "guild_id": str(guild.id),
+                })
+                guild._add_channel(channel)
+            else:
+                channel = discord.DMChannel(me=self.bot.user, state=self.state, data={
+                    "id": str(channel_id), "type": 1, "recipients": [],
+                })
+            self.channels[record.channel] = channel
+        return channel
+
+    def message(self, record: CapturedMessage) -> Any:
+        channel = self.channel(record)
+        author = {"id": str(ID_BASE + record.user), "username": f"user-{record.user}", "discriminator": "0",
+                  "avatar": None, "global_name": None, "bot": record.is_bot}
+        data = self.transport.message(channel.id, next(self._ids), author, record.content,
+                                      channel.guild.id if record.guild else None, record.is_admin)
+        return discord.Message(state=self.state, channel=channel, data=data)
+
+    def kind(self, content: str) -> str:
+        prefix = self.main.config.command_prefix
+        if content.startswith(prefix):
+            return "cmd:" + (content[len(prefix):].split(maxsplit=1) or [""])[0].lower()
+        return "message"
+
+    async def dispatch(self, record: CapturedMessage):
+        message = self.message(record)
+        started = time.perf_counter()
+        try:
+            await self.main.on_message(message)
+        except Exception as e:
+            self.errors += 1
+            print(f"Replay error on {self.kind(record.content)}: {e}", file=sys.stderr)
+        self.samples.setdefault(self.kind(record.content), []).append(time.perf_counter() - started)
+
+    async def run(self, records: List[CapturedMessage], speed: float) -> Dict[str, Any]:
+        started = time.perf_counter()
+        if speed <= 0:  # as fast as possible, one message at a time: deterministic order
+            for record in records:
+                await self.dispatch(record)
+        else:  # at capture pace, each message on its own task like gateway events
+            tasks = []
+            for record in records:
+                due = started + record.offset / speed
+                delay = due - time.perf_counter()
+                if delay > 0:
+                    await asyncio.sleep(delay)
+                self.lag.append(max(0.0, time.perf_counter() - due))
+                tasks.append(asyncio.create_task(self.dispatch(record)))
+            await asyncio.gather(*tasks)
+        report = summarize_latencies(self.samples, time.perf_counter() - started)
+        report["speed"] = speed
+        report["errors"] = self.errors
+        report["discord_calls"] = dict(self.transport.calls.most_common())
+        if self.lag:
+            report["max_dispatch_lag_ms"] = max(self.lag) * 1000
+        return report
+
+
+def isolate(data_dir: str):
+    """Point every data file at ``data_dir`` and switch off outside services before ``main`` is imported"""
+    for name, value in {
+        "SCORES_FILE": "scores.json", "NAMES_FILE": "names.sqlite3", "CHECKPOINT_FILE": "checkpoint.sqlite3",
+        "PARTITIONS_FILE": "score_partitions.sqlite3", "HISTORY_DIR": "history", "TOURNAMENT_FILE": "tournaments.sqlite3",
+        "TRACE_FILE": "traces.jsonl", "PROFILE_DIR": "profiles",
+    }.items():
+        os.environ[name] = os.path.join(data_dir, value)
+    os.environ["TRAFFIC_CAPTURE_FILE"] = ""  # never record the replay itself
+    os.environ["OPENROUTER_API_KEY"] = "replay"  # AI players stay enabled; OfflineModel answers them
+    os.environ["SPECTATOR_ENABLED"] = "false"
+    os.environ["CONFIG_WATCH"] = "false"
+    os.environ["APP_COMMANDS_SYNC"] = "false"  # no application to sync slash commands to
+
+
+async def replay(args: argparse.Namespace) -> Dict[str, Any]:
+    records = list(read_capture(args.capture))
+    if args.limit:
+        records = records[:args.limit]
+    with tempfile.TemporaryDirectory(prefix="wordchain-replay-") as data_dir:
+        isolate(data_dir)
+        random.seed(args.seed)
+        import main  # after isolate(): main reads config and opens its stores at import
+        replayer = Replayer(main, FakeTransport(args.http_latency / 1000))
+        try:
+            await main.bot._async_setup_hook()  # what login() would do: bind the client to this loop
+            await main.startup.run()
+            report = await replayer.run(records, args.speed)
+        finally:
+            await main.bot.close()
+    report["label"] = args.label or os.path.basename(os.path.dirname(os.path.abspath(__file__)))
+    report["capture"] = os.path.basename(args.capture)
+    return report
+
+
+def print_report(report: Dict[str, Any]):
+    print(f"{report['label']}: {report['messages']} messages in {report['elapsed']:.2f}s "
+          f"({report['throughput']:.1f}/s, speed {report['speed'] or 'max'}, {report['errors']} errors)")
+    for kind, stats in report["kinds"].items():
+        print(f"  {kind:16} n={stats['count']:<6} p50 {stats['p50_ms']:.2f}ms  p90 {stats['p90_ms']:.2f}ms  "
+              f"p99 {stats['p99_ms']:.2f}ms  max {stats['max_ms']:.2f}ms")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Replay captured Word Chain traffic and compare builds")
+    sub = parser.add_subparsers(dest="command", required=True)
+    run = sub.add_parser("run", help="replay a capture against this build")
+    run.add_argument("capture", help="capture file written via traffic_capture_file")
+    run.add_argument("--speed", type=float, default=1.0, help="1 = capture pace, 2 = twice as fast, 0 = as fast as possible")
+    run.add_argument("--http-latency", type=float, default=0.0, help="simulated Discord round trip in ms (default: %(default)s)")
+    run.add_argument("--limit", type=int, default=0, help="replay only the first N messages")
+    run.add_argument("--seed", type=int, default=0, help="random seed (default: %(default)s)")
+    run.add_argument("--label", help="name of this build in the report (default: its directory)")
+    run.add_argument("--output", "-o", help="write the JSON report here")
+    compare = sub.add_parser("compare", help="compare two JSON reports")
+    compare.add_argument("base")
+    compare.add_argument("new")
+    args = parser.parse_args()
+
+    if args.command == "compare":
+        with open(args.base, "r", encoding="utf-8") as f:
+            base = json.load(f)
+        with open(args.new, "r", encoding="utf-8") as f:
+            new = json.load(f)
+        print(f"base: {base.get('label')}  new: {new.get('label')}")
+        print("\n".join(compare_reports(base, new)))
+        return
+
+    report = asyncio.run(replay(args))
+    print_report(report)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
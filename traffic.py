@@ -0,0 +1,205 @@
+"""
+Traffic capture for Word Chain Game Discord Bot
+
+When ``traffic_capture_file`` is set, every inbound message (words and
+commands alike) is appended to a compact binary log as it arrives. Guild,
+channel and user ids are replaced by small per-capture aliases, mentions in
+the text included, so a capture can be shared without exposing anyone.
+Recording only appends to an in-memory buffer; a background task writes it
+out from a worker thread. ``traffic-replay.py`` plays a capture back through
+the bot's handlers and compares the latency and throughput of two builds.
+
+Log format (little-endian): ``MAGIC`` + version byte, then one record per
+message: ``RECORD`` header (ms since capture start, guild, channel, user,
+flags, text length) followed by the UTF-8 text.
+"""
+
+import re
+import time
+import struct
+import asyncio
+from typing import Any, Dict, Iterator, List, NamedTuple, Optional
+
+MAGIC = b"WCTR"
+VERSION = 1
+RECORD = struct.Struct("<IIIIBH")  # offset_ms, guild, channel, user, flags, length
+FLAG_BOT = 1  # author is a bot
+FLAG_ADMIN = 2  # author may manage the server (admin-only commands pass)
+MENTION = re.compile(r"<(@!?|@&|#)(\d+)>")
+
+
+class CapturedMessage(NamedTuple):
+    offset: float  # seconds since the capture started
+    guild: int  # alias, 0 = DM
+    channel: int  # alias
+    user: int  # alias
+    flags: int
+    content: str
+
+    @property
+    def is_bot(self) -> bool:
+        return bool(self.flags & FLAG_BOT)
+
+    @property
+    def is_admin(self) -> bool:
+        return bool(self.flags & FLAG_ADMIN)
+
+
+class Aliases:
+    """Real id -> small sequential alias (kept only in memory)"""
+
+    def __init__(self):
+        self._ids: Dict[int, int] = {}
+
+    def __call__(self, real_id: Optional[int]) -> int:
+        if not real_id:
+            return 0
+        alias = self._ids.get(real_id)
+        if alias is None:
+            alias = self._ids[real_id] = len(self._ids) + 1
+        return alias
+
+
+class TrafficRecorder:
+    """Appends inbound messages to a binary capture, written in the background"""
+
+    def __init__(self, path: str, max_bytes: int = 64 * 1024 * 1024, flush_interval: float = 2.0):
+        self.path = path
+        self.max_bytes = max_bytes
+        self.flush_interval = flush_interval
+        self.aliases = Aliases()  # one namespace: an id keeps its alias whether seen as user, channel or mention
+        self.recorded = 0
+        self.full = False
+        self._buffer = bytearray(MAGIC + bytes([VERSION]))
+        self._size = len(self._buffer)  # bytes captured so far (written + buffered)
+        self._started = time.monotonic()
+        self._fresh = True  # first write truncates an old capture
+        self._task: Optional[asyncio.Task] = None
+
+    def _scrub(self, content: str) -> str:
+        return MENTION.sub(lambda m: f"<{m.group(1)}{self.aliases(int(m.group(2)))}>", content)
+
+    def record(self, message: Any):
+        """Capture one ``discord.Message`` (no I/O)"""
+        if self.full:
+            return
+        author = message.author
+        guild = getattr(message, "guild", None)
+        flags = FLAG_BOT if getattr(author, "bot", False) else 0
+        permissions = getattr(author, "guild_permissions", None)
+        if permissions is not None and permissions.manage_guild:
+            flags |= FLAG_ADMIN
+        text = self._scrub(message.content).encode("utf-8")[:0xFFFF]
+        offset = int((time.monotonic() - self._started) * 1000)
+        record = RECORD.pack(
+            min(offset, 0xFFFFFFFF), self.aliases(guild.id if guild else None),
+            self.aliases(message.channel.id), self.aliases(author.id), flags, len(text),
+        ) + text
+        if self._size + len(record) > self.max_bytes:
+            self.full = True
+            print(f"Traffic capture reached {self.max_bytes} bytes; recording stopped")
+            return
+        self._buffer += record
+        self._size += len(record)
+        self.recorded += 1
+
+    @staticmethod
+    def _write(path: str, data: bytes, truncate: bool):
+        with open(path, "wb" if truncate else "ab") as f:
+            f.write(data)
+
+    async def flush(self):
+        """Write what was captured since the last flush"""
+        if not self._buffer:
+            return
+        data, self._buffer = bytes(self._buffer), bytearray()
+        await asyncio.to_thread(self._write, self.path, data, self._fresh)
+        self._fresh = False
+
+    async def _run(self):
+        while True:
+            await asyncio.sleep(self.flush_interval)
+            try:
+                await self.flush()
+            except Exception as e:
+                print(f"Traffic capture flush error: {e}")
+
+    def start(self):
+        if self._task is None:
+            self._task = asyncio.create_task(self._run(), name="traffic-capture")
+
+    def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            self._task = None
+
+
+def read_capture(path: str) -> Iterator[CapturedMessage]:
+    """Messages of a capture in order (a record cut off by a crash ends the log)"""
+    with open(path, "rb") as f:
+        data = f.read()
+    if data[:len(MAGIC)] != MAGIC:
+        raise ValueError(f"{path} is not a traffic capture")
+    if data[len(MAGIC)] != VERSION:
+        raise ValueError(f"{path} has unsupported capture version {data[len(MAGIC)]}")
+    pos = len(MAGIC) + 1
+    while pos + RECORD.size <= len(data):
+        offset_ms, guild, channel, user, flags, length = RECORD.unpack_from(data, pos)
+        pos += RECORD.size
+        if pos + length > len(data):
+            break
+        yield CapturedMessage(offset_ms / 1000.0, guild, channel, user, flags,
+                              data[pos:pos + length].decode("utf-8", errors="replace"))
+        pos += length
+
+
+def percentile(sorted_values: List[float], p: float) -> float:
+    if not sorted_values:
+        return 0.0
+    index = min(len(sorted_values) - 1, max(0, round(p / 100 * (len(sorted_values) - 1))))
+    return sorted_values[index]
+
+
+def summarize_latencies(samples: Dict[str, List[float]], elapsed: float) -> Dict[str, Any]:
+    """Replay report: count / throughput / latency percentiles (ms) per message kind"""
+    report: Dict[str, Any] = {"elapsed": elapsed, "kinds": {}}
+    total = 0
+    for kind, values in sorted(samples.items()):
+        values = sorted(values)
+        total += len(values)
+        report["kinds"][kind] = {
+            "count": len(values),
+            "mean_ms": sum(values) / len(values) * 1000 if values else 0.0,
+            **{f"p{p}_ms": percentile(values, p) * 1000 for p in (50, 90, 99)},
+            "max_ms": values[-1] * 1000 if values else 0.0,
+        }
+    report["messages"] = total
+    report["throughput"] = total / elapsed if elapsed > 0 else 0.0  # messages per second
+    return report
+
+
+def compare_reports(base: Dict[str, Any], new: Dict[str, Any]) -> List[str]:
+    """Lines comparing two replay reports side by side, with the change from ``base`` to ``new``"""
+    def change(a: float, b: float) -> str:
+        return f"{(b - a) / a * 100:+.1f}%" if a else "n/a"
+
+    rows = [("throughput/s", base["throughput"], new["throughput"])]
+    missing = []
+    for kind in sorted(set(base["kinds"]) | set(new["kinds"])):
+        a, b = base["kinds"].get(kind), new["kinds"].get(kind)
+        if a is None or b is None:
+            missing.append(f"{kind}: only in {'new' if a is None else 'base'}")
+            continue
+        rows += [(f"{kind} {stat[:-3]} ms", a[stat], b[stat]) for stat in ("p50_ms", "p90_ms", "p99_ms", "max_ms")]
+    width = max(len(name) for name, _, _ in rows)
+    lines = [f"{'':{width}} {'base':>10} {'new':>10} {'change':>8}"]
+    lines += [f"{name:{width}} {a:>10.2f} {b:>10.2f} {change(a, b):>8}" for name, a, b in rows]
+    if base.get("speed") != new.get("speed"):
+        missing.append(f"warning: replayed at different speeds ({base.get('speed')} vs {new.get('speed')})")
+    return lines + missing
+
+
+__all__ = [
+    'MAGIC', 'VERSION', 'RECORD', 'FLAG_BOT', 'FLAG_ADMIN', 'CapturedMessage', 'Aliases',
+    'TrafficRecorder', 'read_capture', 'percentile', 'summarize_latencies', 'compare_reports',
+]
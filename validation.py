@@ -0,0 +1,206 @@
+"""
+Word validation pipeline for Word Chain Game Discord Bot
+
+A word is checked against an ordered list of sources until one accepts it,
+for the channel's language and guild.
+Results, positive and negative, are kept in a bounded LRU so repeated guesses
+never rerun the slower sources. Sources that still need to load data (the
+spellchecker dictionary, a guild's wordlist) are consulted from a worker
+thread so the event loop never waits on disk.
+"""
+
+import os
+import time
+import asyncio
+import threading
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Iterable, List, Optional, Set, Tuple
+
+from languages import get_language
+
+
+class WordSource:
+    """Base class: ``lookup`` answers whether ``word`` is valid in ``language`` for ``guild_id``"""
+
+    name = "source"
+
+    def __init__(self):
+        self.calls = 0
+        self.hits = 0
+        self.seconds = 0.0
+
+    def ready(self, guild_id: Optional[int], language: str) -> bool:
+        """False while a lookup would still block on loading data"""
+        return True
+
+    def enabled(self, language: str) -> bool:
+        return True
+
+    def lookup(self, word: str, guild_id: Optional[int], language: str) -> bool:
+        raise NotImplementedError
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "source": self.name,
+            "calls": self.calls,
+            "hits": self.hits,
+            "hit_ratio": self.hits / self.calls if self.calls else 0.0,
+            "avg_ms": self.seconds * 1000 / self.calls if self.calls else 0.0,
+        }
+
+
+class DictionarySource(WordSource):
+    """The language's dictionary from a ``languages.DictionaryRegistry`` (loaded on first use)"""
+
+    name = "local"
+
+    def __init__(self, registry: Any):
+        super().__init__()
+        self.registry = registry
+
+    def ready(self, guild_id: Optional[int], language: str) -> bool:
+        return self.registry.peek(language) is not None
+
+    def enabled(self, language: str) -> bool:
+        return self.registry.available(language)
+
+    def lookup(self, word: str, guild_id: Optional[int], language: str) -> bool:
+        graph = self.registry.peek(language) or self.registry.load(language)
+        return word in graph
+
+
+class GuildWordlistSource(WordSource):
+    """Extra words per guild from ``<directory>/<guild_id>.txt`` in any language (loaded on first use)
+
+    Entries are normalized with the channel language's rules, like submissions,
+    so one file is kept per (guild, language) in use.
+    """
+
+    name = "guild"
+
+    def __init__(self, directory: str):
+        super().__init__()
+        self.directory = directory
+        self._lists: Dict[Tuple[int, str], Set[str]] = {}  # (guild, language) -> normalized words
+        self._lock = threading.Lock()
+        self._enabled = os.path.isdir(directory)  # checked once; the pipeline is rebuilt on reload
+
+    def ready(self, guild_id: Optional[int], language: str) -> bool:
+        return guild_id is None or (guild_id, language) in self._lists
+
+    def enabled(self, language: str) -> bool:
+        return self._enabled
+
+    def _load(self, guild_id: int, language: str) -> Set[str]:
+        path = os.path.join(self.directory, f"{guild_id}.txt")
+        normalize = get_language(language).normalize  # NFC + casefold, same as submissions
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                words = {word for word in map(normalize, f) if word}
+        except FileNotFoundError:
+            words = set()
+        with self._lock:
+            return self._lists.setdefault((guild_id, language), words)
+
+    def lookup(self, word: str, guild_id: Optional[int], language: str) -> bool:
+        if guild_id is None:
+            return False
+        words = self._lists.get((guild_id, language))
+        if words is None:
+            words = self._load(guild_id, language)
+        return word in words
+
+
+class SpellcheckerSource(WordSource):
+    """pyspellchecker word-frequency lists (optional dependency, one per language, loaded lazily)"""
+
+    name = "spellchecker"
+
+    def __init__(self, when: Optional[Callable[[str], bool]] = None):
+        super().__init__()
+        self.when = when
+        self._spell: Dict[str, Any] = {}  # language -> SpellChecker, or None if unsupported
+        self._missing = False
+        self._lock = threading.Lock()
+
+    def ready(self, guild_id: Optional[int], language: str) -> bool:
+        return language in self._spell or self._missing
+
+    def enabled(self, language: str) -> bool:
+        return (not self._missing and self._spell.get(language, True) is not None
+                and (self.when is None or self.when(language)))
+
+    def _load(self, language: str):
+        with self._lock:
+            if language not in self._spell and not self._missing:
+                try:
+                    from spellchecker import SpellChecker
+                    self._spell[language] = SpellChecker(language=language)
+                except ImportError:
+                    print("Warning: pyspellchecker is not installed, spellchecker source disabled")
+                    self._missing = True
+                except ValueError:  # no frequency list for this language
+                    self._spell[language] = None
+        return self._spell.get(language)
+
+    def lookup(self, word: str, guild_id: Optional[int], language: str) -> bool:
+        spell = self._spell.get(language) or self._load(language)
+        return spell is not None and word in spell
+
+
+class ValidationPipeline:
+    """Ordered sources in front of a bounded LRU of results"""
+
+    def __init__(self, sources: Iterable[WordSource], cache_size: int = 10000):
+        self.sources: List[WordSource] = list(sources)
+        self.cache_size = cache_size
+        self._cache: "OrderedDict[Tuple[str, Optional[int], str], Optional[str]]" = OrderedDict()
+        self.cache_hits = 0
+        self.cache_misses = 0
+
+    async def check(self, word: str, guild_id: Optional[int] = None, language: str = "en") -> Optional[str]:
+        """Name of the first source that accepts ``word``, or None if none do"""
+        key = (language, guild_id, word)
+        if key in self._cache:
+            self._cache.move_to_end(key)
+            self.cache_hits += 1
+            return self._cache[key]
+        self.cache_misses += 1
+
+        accepted = None
+        for source in self.sources:
+            if not source.enabled(language):
+                continue
+            start = time.perf_counter()
+            if source.ready(guild_id, language):
+                found = source.lookup(word, guild_id, language)
+            else:
+                found = await asyncio.to_thread(source.lookup, word, guild_id, language)
+            source.seconds += time.perf_counter() - start
+            source.calls += 1
+            if found:
+                source.hits += 1
+                accepted = source.name
+                break
+
+        self._cache[key] = accepted
+        if len(self._cache) > self.cache_size:
+            self._cache.popitem(last=False)
+        return accepted
+
+    def clear_cache(self):
+        self._cache.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        lookups = self.cache_hits + self.cache_misses
+        return {
+            "cache_size": len(self._cache),
+            "cache_hit_ratio": self.cache_hits / lookups if lookups else 0.0,
+            "sources": [source.stats() for source in self.sources],
+        }
+
+
+__all__ = [
+    'WordSource', 'DictionarySource', 'GuildWordlistSource', 'SpellcheckerSource',
+    'ValidationPipeline',
+]